@@ -1202,8 +1202,8 @@ class ProcedureAnalyzer:
                     if not successors:
                         levels[node] = 0  # Nível base
                     else:
-                        max_dep_level = max([levels.get(s, 0) for s in successors
-                                            if s in self.procedures], default=-1)
+                        max_dep_level = max((levels.get(s, 0) for s in successors
+                                            if s in self.procedures), default=-1)
                         levels[node] = max_dep_level + 1
 
             # Atualiza procedures com níveis
@@ -1287,9 +1287,17 @@ class ProcedureAnalyzer:
                         'timestamp': m.timestamp.isoformat(),
                         'use_toon': m.use_toon
                     }
-                    for m in self.llm.token_tracker.get_all_metrics()
+                    for m in self.llm.token_tracker.iter_metrics()
                 ]
 
+            # Estatísticas em uma única passada
+            total_complexity = 0
+            max_dependency_level = 0
+            for p in self.procedures.values():
+                total_complexity += p.complexity_score
+                if p.dependencies_level > max_dependency_level:
+                    max_dependency_level = p.dependencies_level
+
             results = {
                 'procedures': {
                     name: {
@@ -1302,8 +1310,8 @@ class ProcedureAnalyzer:
                 'hierarchy': self.get_procedure_hierarchy(),
                 'statistics': {
                     'total_procedures': len(self.procedures),
-                    'avg_complexity': sum(p.complexity_score for p in self.procedures.values()) / len(self.procedures) if self.procedures else 0,
-                    'max_dependency_level': max(p.dependencies_level for p in self.procedures.values()) if self.procedures else 0
+                    'avg_complexity': total_complexity / len(self.procedures),
+                    'max_dependency_level': max_dependency_level
                 }
             }
 
@@ -2,9 +2,13 @@
 Data models for code analysis
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Dict, Set, Any, Optional
 
+# slots on dataclasses requires Python 3.10+; older versions keep __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 @dataclass
 class FieldUsage:
@@ -17,7 +21,7 @@ class FieldUsage:
     contexts: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TraceStep:
     """A single step in a field trace path"""
     procedure: str
@@ -26,7 +30,7 @@ class TraceStep:
     depth: int = 0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TracePath:
     """Complete trace path for a field"""
     path: List[TraceStep]
@@ -88,6 +88,11 @@ class DefaultConfig:
     EMBEDDING_MODEL = _default_model  # Modelo de embedding (local ou HuggingFace)
     LOCAL_EMBEDDING_MODEL_PATH = str(_LOCAL_MODEL_PATH) if _LOCAL_MODEL_PATH.exists() else None
     VECTOR_STORE_PATH = './cache/vector_store'  # Caminho do vector store
+    INDEX_TYPE = 'flat'  # Índice FAISS em memória: flat (exato), sq8 (int8) ou hnsw (aproximado)
+    HNSW_EF_SEARCH = 64  # Candidatos por busca no HNSW (maior = mais recall, mais latência)
+    EMBED_DTYPE = 'fp16'  # Precisão do modelo de embedding em GPU: fp16, bf16 ou fp32 (CPU usa fp32)
+    SEMANTIC_CACHE_TAU = 0.97  # Similaridade mínima para reutilizar resultado de query parafraseada
+    SEMANTIC_CACHE_TTL = 7 * 24 * 3600  # Validade do cache semântico em segundos (0 desabilita)
 
 
 class Config:
@@ -141,7 +146,12 @@ class Config:
             if Config._initialized:
                 return
 
-            # Inicializa configurações carregando variáveis de ambiente
+            # Carregamento completo sob o lock: threads concorrentes esperam
+            # a primeira terminar em vez de carregar/validar em paralelo
+            self._load()
+
+    def _load(self) -> None:
+        """Inicializa configurações carregando variáveis de ambiente"""
         # Carrega .env ou environment.env se disponível
         if DOTENV_AVAILABLE:
             base_path = Path(__file__).parent.parent.parent
@@ -286,6 +296,11 @@ class Config:
         self.embedding_backend = os.getenv('CODEGRAPHAI_EMBEDDING_BACKEND', DefaultConfig.EMBEDDING_BACKEND)
         self.embedding_model = os.getenv('CODEGRAPHAI_EMBEDDING_MODEL', DefaultConfig.EMBEDDING_MODEL)
         self.vector_store_path = os.getenv('CODEGRAPHAI_VECTOR_STORE_PATH', DefaultConfig.VECTOR_STORE_PATH)
+        self.index_type = os.getenv('CODEGRAPHAI_INDEX_TYPE', DefaultConfig.INDEX_TYPE).lower()
+        self.hnsw_ef_search = self._getenv_int('CODEGRAPHAI_HNSW_EF_SEARCH', DefaultConfig.HNSW_EF_SEARCH)
+        self.embed_dtype = os.getenv('CODEGRAPHAI_EMBED_DTYPE', DefaultConfig.EMBED_DTYPE).lower()
+        self.semantic_cache_tau = self._getenv_float('CODEGRAPHAI_SEM_CACHE_TAU', DefaultConfig.SEMANTIC_CACHE_TAU)
+        self.semantic_cache_ttl = self._getenv_int('CODEGRAPHAI_SEM_CACHE_TTL', DefaultConfig.SEMANTIC_CACHE_TTL)
 
         # Criar mapeamento de providers para validação
         if self.llm_mode == 'api':
@@ -453,6 +468,26 @@ class Config:
         if self.llm_repetition_penalty < 0:
             raise ValueError("LLM repetition_penalty deve ser positivo")
 
+        # Validar tipo de índice vetorial
+        valid_index_types = ['flat', 'sq8', 'hnsw']
+        if self.index_type not in valid_index_types:
+            raise ValueError(f"Index type deve ser um de: {valid_index_types}")
+
+        if self.hnsw_ef_search <= 0:
+            raise ValueError("HNSW efSearch deve ser positivo")
+
+        # Validar precisão do modelo de embedding
+        valid_embed_dtypes = ['fp16', 'bf16', 'fp32']
+        if self.embed_dtype not in valid_embed_dtypes:
+            raise ValueError(f"Embed dtype deve ser um de: {valid_embed_dtypes}")
+
+        # Validar cache semântico das tools vetoriais
+        if self.semantic_cache_tau <= 0 or self.semantic_cache_tau > 1:
+            raise ValueError("Semantic cache tau deve estar entre 0 (exclusivo) e 1")
+
+        if self.semantic_cache_ttl < 0:
+            raise ValueError("Semantic cache TTL não pode ser negativo")
+
         # Validar modo LLM
         valid_modes = ['local', 'api']
         if self.llm_mode not in valid_modes:
@@ -2,6 +2,7 @@
 Modelos de dados e exceções para CodeGraphAI
 """
 
+import sys
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import List, Dict, Set, Optional
@@ -193,9 +194,13 @@ class TokenUsage:
     total_tokens: int = 0
 
 
-@dataclass
+# slots em dataclasses requer Python 3.10+; em versões anteriores mantém __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class LLMRequestMetrics:
-    """Métricas de uma requisição LLM"""
+    """Métricas de uma requisição LLM (armazenadas em volume pelo TokenTracker)"""
     request_id: str
     operation: str  # "analyze_business_logic", "extract_dependencies", "calculate_complexity", "analyze_table_purpose"
     tokens_in: int
@@ -0,0 +1,85 @@
+"""
+Serialização JSON para os caminhos quentes (respostas de tools e do LLM).
+
+Usa orjson quando instalado e faz fallback para o json da stdlib, mantendo
+a mesma saída: UTF-8 sem escape (ensure_ascii=False), compacta por padrão e
+indentada apenas quando solicitado ou com CODEGRAPHAI_PRETTY_JSON ativo.
+"""
+
+import dataclasses
+import json
+import os
+from functools import partial
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# JSON indentado apenas para depuração; saída compacta economiza tokens enviados ao LLM
+PRETTY_JSON = os.getenv('CODEGRAPHAI_PRETTY_JSON', '').lower() in ('true', '1', 'yes', 'on')
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_default(obj: Any, fallback: Optional[Callable[[Any], Any]] = None) -> Any:
+    """Converte dataclasses para dict no fallback stdlib (orjson já suporta)"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if fallback is not None:
+        return fallback(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(
+    obj: Any,
+    pretty: Optional[bool] = None,
+    default: Optional[Callable[[Any], Any]] = None
+) -> str:
+    """
+    Serializa objeto para string JSON.
+
+    Args:
+        obj: Objeto serializável em JSON (dataclasses incluídas)
+        pretty: Indentar com 2 espaços (None usa CODEGRAPHAI_PRETTY_JSON)
+        default: Conversão para tipos não suportados (ex: str para Decimal)
+
+    Returns:
+        String JSON
+
+    Raises:
+        TypeError: Se objeto não for serializável
+    """
+    if pretty is None:
+        pretty = PRETTY_JSON
+
+    if ORJSON_AVAILABLE:
+        option = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if pretty else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=default, option=option).decode('utf-8')
+
+    hook = _json_default if default is None else partial(_json_default, fallback=default)
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=hook)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=hook)
+
+
+def loads(data: str) -> Any:
+    """
+    Desserializa string JSON.
+
+    Args:
+        data: String JSON
+
+    Returns:
+        Objeto Python equivalente
+
+    Raises:
+        json.JSONDecodeError: Se string não for JSON válido
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -3,7 +3,7 @@ Knowledge Graph module for CodeGraphAI
 Provides persistent graph-based storage and querying of code relationships
 """
 
-from app.graph.knowledge_graph import CodeKnowledgeGraph
+from app.graph.knowledge_graph import CodeKnowledgeGraph, FieldUsageRow
 
-__all__ = ['CodeKnowledgeGraph']
+__all__ = ['CodeKnowledgeGraph', 'FieldUsageRow']
 
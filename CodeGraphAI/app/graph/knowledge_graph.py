@@ -3,9 +3,11 @@ Knowledge Graph for Code Analysis
 Persistent graph structure for storing and querying code relationships
 """
 
+import difflib
 import json
 import logging
-from typing import Dict, List, Set, Optional, Any
+import sys
+from typing import Dict, List, Set, Optional, Any, Tuple, TypedDict
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
@@ -15,6 +17,13 @@ import networkx as nx
 logger = logging.getLogger(__name__)
 
 
+class FieldUsageRow(TypedDict):
+    """Projected usage of a field in one procedure (lists always present)"""
+    procedure: str
+    operations: List[str]
+    transformations: List[str]
+
+
 class CodeKnowledgeGraph:
     """
     Knowledge graph for storing and querying code relationships
@@ -38,6 +47,11 @@ class CodeKnowledgeGraph:
             "updated_at": None,
             "version": "1.0.0"
         }
+        # Memo of get_procedure_context/get_table_info, keyed by (node_type, name).
+        # Invalidated by every mutation done through this class.
+        self._lookup_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        # Bumped by every mutation; callers key derived caches on it
+        self.revision = 0
         self._load_from_cache()
 
     def add_procedure(self, proc_info: Dict[str, Any]) -> None:
@@ -52,7 +66,8 @@ class CodeKnowledgeGraph:
         """
         name = proc_info["name"]
         schema = proc_info.get("schema", "unknown")
-        full_name = f"{schema}.{name}"
+        # Node ids are interned: lookups and edge endpoints share one str instance
+        full_name = sys.intern(f"{schema}.{name}")
 
         # Add node
         self.graph.add_node(
@@ -72,7 +87,7 @@ class CodeKnowledgeGraph:
         for called_proc in proc_info.get("called_procedures", []):
             self.graph.add_edge(
                 full_name,
-                called_proc,
+                sys.intern(called_proc),
                 edge_type="calls",
                 relationship="procedure_call"
             )
@@ -81,11 +96,13 @@ class CodeKnowledgeGraph:
         for table in proc_info.get("called_tables", []):
             self.graph.add_edge(
                 full_name,
-                table,
+                sys.intern(table),
                 edge_type="accesses",
                 relationship="table_access"
             )
 
+        self._lookup_cache.clear()
+        self.revision += 1
         self.metadata["updated_at"] = datetime.now().isoformat()
         logger.debug(f"Added procedure to graph: {full_name}")
 
@@ -100,7 +117,7 @@ class CodeKnowledgeGraph:
         """
         name = table_info["name"]
         schema = table_info.get("schema", "unknown")
-        full_name = f"{schema}.{name}"
+        full_name = sys.intern(f"{schema}.{name}")
 
         # Add node
         self.graph.add_node(
@@ -123,13 +140,15 @@ class CodeKnowledgeGraph:
             if referenced_table:
                 self.graph.add_edge(
                     full_name,
-                    referenced_table,
+                    sys.intern(referenced_table),
                     edge_type="references",
                     relationship="foreign_key",
                     columns=fk.get("columns", []),
                     referenced_columns=fk.get("referenced_columns", [])
                 )
 
+        self._lookup_cache.clear()
+        self.revision += 1
         self.metadata["updated_at"] = datetime.now().isoformat()
         logger.debug(f"Added table to graph: {full_name}")
 
@@ -144,7 +163,7 @@ class CodeKnowledgeGraph:
         """
         field_name = field_info["field_name"]
         table_name = field_info.get("table_name", "unknown")
-        full_name = f"{table_name}.{field_name}"
+        full_name = sys.intern(f"{table_name}.{field_name}")
 
         # Add node
         self.graph.add_node(
@@ -163,21 +182,32 @@ class CodeKnowledgeGraph:
         if table_name and table_name != "unknown":
             self.graph.add_edge(
                 full_name,
-                table_name,
+                sys.intern(table_name),
                 edge_type="belongs_to",
                 relationship="field_of_table"
             )
 
+        self._lookup_cache.clear()
+        self.revision += 1
+
     def get_procedure_context(self, proc_name: str) -> Optional[Dict[str, Any]]:
         """
-        Get complete context of a procedure
+        Get complete context of a procedure (memoized until next mutation)
 
         Args:
             proc_name: Procedure name (with or without schema)
 
         Returns:
-            Dict with procedure context or None if not found
+            Dict with procedure context or None if not found.
+            The dict is shared between calls and must not be modified.
         """
+        key = ("procedure", proc_name)
+        if key not in self._lookup_cache:
+            self._lookup_cache[key] = self._build_procedure_context(proc_name)
+        return self._lookup_cache[key]
+
+    def _build_procedure_context(self, proc_name: str) -> Optional[Dict[str, Any]]:
+        """Build procedure context from graph (see get_procedure_context)"""
         # Find node (try with and without schema)
         node = self._find_node(proc_name, "procedure")
         if not node:
@@ -208,16 +238,100 @@ class CodeKnowledgeGraph:
             "source_code": node_data.get("source_code", "")
         }
 
+    def has_procedure(self, proc_name: str) -> bool:
+        """
+        Check if procedure exists in graph without building its context
+
+        Args:
+            proc_name: Procedure name (with or without schema)
+
+        Returns:
+            True if procedure node exists
+        """
+        return self._find_node(proc_name, "procedure") is not None
+
+    def has_table(self, table_name: str) -> bool:
+        """
+        Check if table exists in graph without building its info
+
+        Args:
+            table_name: Table name (with or without schema)
+
+        Returns:
+            True if table node exists
+        """
+        return self._find_node(table_name, "table") is not None
+
+    def find_entity(self, name: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Resolve a name to a procedure or table with a single node scan
+
+        Args:
+            name: Procedure or table name (with or without schema)
+
+        Returns:
+            Tuple (node_type, context/info) or None if not found
+        """
+        node = None
+        if name in self.graph and self.graph.nodes[name].get("node_type") in ("procedure", "table"):
+            node = name
+        else:
+            for candidate, data in self.graph.nodes(data=True):
+                if data.get("node_type") not in ("procedure", "table"):
+                    continue
+                if candidate.endswith(f".{name}") or data.get("name") == name:
+                    node = candidate
+                    break
+
+        if node is None:
+            return None
+
+        if self.graph.nodes[node]["node_type"] == "procedure":
+            return "procedure", self.get_procedure_context(node)
+        return "table", self.get_table_info(node)
+
+    def get_similar_names(self, name: str, node_type: str, limit: int = 3) -> List[str]:
+        """
+        Suggest existing node names close to a name that was not found
+
+        Args:
+            name: Name looked up (with or without schema)
+            node_type: Type of node (procedure, table, field)
+            limit: Maximum number of suggestions
+
+        Returns:
+            Full node names ordered by similarity
+        """
+        candidates = [
+            node for node, data in self.graph.nodes(data=True)
+            if data.get("node_type") == node_type
+        ]
+        # Compare bare names, so "PROC_1" suggests "SCHEMA.PROC1"
+        by_bare_name = {node.rsplit(".", 1)[-1]: node for node in candidates}
+        matches = difflib.get_close_matches(
+            name.rsplit(".", 1)[-1], list(by_bare_name), n=limit
+        )
+        return [by_bare_name[match] for match in matches]
+
     def get_table_info(self, table_name: str) -> Optional[Dict[str, Any]]:
         """
-        Get table information
+        Get table information (memoized until next mutation)
 
         Args:
             table_name: Table name (with or without schema)
 
         Returns:
-            Dict with table info or None if not found
+            Dict with table info (including columns_by_name index) or None
+            if not found. The dict is shared between calls and must not be
+            modified.
         """
+        key = ("table", table_name)
+        if key not in self._lookup_cache:
+            self._lookup_cache[key] = self._build_table_info(table_name)
+        return self._lookup_cache[key]
+
+    def _build_table_info(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Build table info from graph (see get_table_info)"""
         node = self._find_node(table_name, "table")
         if not node:
             return None
@@ -232,11 +346,18 @@ class CodeKnowledgeGraph:
                 relationships[rel_type] = []
             relationships[rel_type].append(target)
 
+        columns = node_data.get("columns", [])
+        # Column index for O(1) lookup by name; first occurrence wins on duplicates
+        columns_by_name = {}
+        for col in columns:
+            columns_by_name.setdefault(col.get("name"), col)
+
         return {
             "name": node_data.get("name"),
             "schema": node_data.get("schema"),
             "full_name": node,
-            "columns": node_data.get("columns", []),
+            "columns": columns,
+            "columns_by_name": columns_by_name,
             "foreign_keys": node_data.get("foreign_keys", []),
             "indexes": node_data.get("indexes", []),
             "business_purpose": node_data.get("business_purpose", ""),
@@ -302,6 +423,132 @@ class CodeKnowledgeGraph:
 
         return dict(relationships)
 
+    def get_field_bundle(
+        self,
+        field_name: str,
+        procedure_name: Optional[str] = None,
+        table_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get usage, relationships and column definition of a field in one pass
+
+        Equivalent to query_field_usage + get_field_usage +
+        get_field_relationships + get_table_info, but walks the nodes once.
+
+        Args:
+            field_name: Field name
+            procedure_name: Optional procedure to scope detailed usage
+            table_name: Optional table where the field is defined
+
+        Returns:
+            Dict with detailed_usage (list of FieldUsageRow), usage (read_by,
+            written_by, procedures), relationships and column (or None).
+            All keys are always present.
+        """
+        return self.get_field_bundles([field_name], procedure_name, table_name)[field_name]
+
+    def get_field_bundles(
+        self,
+        field_names: List[str],
+        procedure_name: Optional[str] = None,
+        table_name: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get field bundles (see get_field_bundle) for several fields in one pass
+
+        Args:
+            field_names: Field names
+            procedure_name: Optional procedure to scope detailed usage
+            table_name: Optional table where the fields are defined
+
+        Returns:
+            Dict mapping each field name to its bundle
+        """
+        bundles: Dict[str, Dict[str, Any]] = {}
+        for field_name in field_names:
+            bundles[field_name] = {
+                "detailed_usage": [],
+                "usage": {
+                    "read_by": [],
+                    "written_by": [],
+                    "procedures": []
+                },
+                "relationships": defaultdict(list),
+                "column": None
+            }
+
+        for node, data in self.graph.nodes(data=True):
+            node_type = data.get("node_type")
+
+            if node_type == "procedure":
+                fields_used = data.get("fields_used", {})
+                if fields_used:
+                    in_scope = not procedure_name or node.endswith(procedure_name)
+                    self._collect_procedure_usage(node, fields_used, bundles, in_scope)
+
+            elif node_type == "field" and data.get("field_name") in bundles:
+                self._collect_field_relationships(node, bundles[data["field_name"]]["relationships"])
+
+        table_info = self.get_table_info(table_name) if table_name else None
+        if table_info:
+            columns_by_name = table_info["columns_by_name"]
+            for field_name, bundle in bundles.items():
+                bundle["column"] = columns_by_name.get(field_name)
+
+        for bundle in bundles.values():
+            bundle["relationships"] = dict(bundle["relationships"])
+
+        return bundles
+
+    @staticmethod
+    def _collect_procedure_usage(
+        node: str,
+        fields_used: Dict[str, Any],
+        bundles: Dict[str, Dict[str, Any]],
+        in_scope: bool
+    ) -> None:
+        """
+        Add one procedure's usage of the requested fields to their bundles
+
+        Args:
+            node: Procedure node ID
+            fields_used: Procedure's fields_used attribute
+            bundles: Bundles being built by get_field_bundles
+            in_scope: Whether the procedure matches the procedure_name filter
+        """
+        for field_name, bundle in bundles.items():
+            if field_name not in fields_used:
+                continue
+
+            proc_usage = fields_used[field_name]
+            usage = bundle["usage"]
+            usage["procedures"].append(node)
+            operations = proc_usage.get("operations", [])
+            if "read" in operations:
+                usage["read_by"].append(node)
+            if "write" in operations:
+                usage["written_by"].append(node)
+
+            if in_scope:
+                row: FieldUsageRow = {
+                    "procedure": node,
+                    "operations": operations,
+                    "transformations": proc_usage.get("transformations", [])
+                }
+                bundle["detailed_usage"].append(row)
+
+    def _collect_field_relationships(self, node: str, relationships: Dict[str, List[str]]) -> None:
+        """
+        Add a field node's outgoing relationships, grouped by type
+
+        Args:
+            node: Field node ID
+            relationships: Relationship lists of the field's bundle (defaultdict)
+        """
+        for _, target, edge_data in self.graph.out_edges(node, data=True):
+            rel_type = edge_data.get("relationship", "unknown")
+            relationships[rel_type].append(target)
+
     def get_callers(self, proc_name: str) -> Set[str]:
         """
         Get procedures that call the given procedure
@@ -428,12 +675,12 @@ class CodeKnowledgeGraph:
 
             # Rebuild graph
             for node_data in data.get("nodes", []):
-                node_id = node_data.pop("id")
+                node_id = sys.intern(node_data.pop("id"))
                 self.graph.add_node(node_id, **node_data)
 
             for edge_data in data.get("edges", []):
-                source = edge_data.pop("source")
-                target = edge_data.pop("target")
+                source = sys.intern(edge_data.pop("source"))
+                target = sys.intern(edge_data.pop("target"))
                 key = edge_data.pop("key", None)
                 self.graph.add_edge(source, target, key=key, **edge_data)
 
@@ -447,6 +694,8 @@ class CodeKnowledgeGraph:
     def clear(self) -> None:
         """Clear all data from graph"""
         self.graph.clear()
+        self._lookup_cache.clear()
+        self.revision += 1
         self.metadata["updated_at"] = datetime.now().isoformat()
         logger.info("Knowledge graph cleared")
 
@@ -3,35 +3,125 @@ Vector Knowledge Graph for Semantic Search
 Production-ready RAG implementation with hybrid search capabilities
 """
 
+import importlib.util
 import json
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from collections import defaultdict
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+import numpy as np
 
 try:
-    import chromadb
-    from chromadb.config import Settings
-    CHROMADB_AVAILABLE = True
+    import faiss
+    FAISS_AVAILABLE = True
 except ImportError:
-    CHROMADB_AVAILABLE = False
+    FAISS_AVAILABLE = False
 
 from tqdm import tqdm
 
 from app.graph.knowledge_graph import CodeKnowledgeGraph
 from app.llm.embedding_utils import resolve_embedding_model_path
-from app.llm.quantized_model_loader import QuantizedModelLoader
+
+# Disponibilidade verificada sem importar os módulos: sentence-transformers
+# (torch/transformers) e chromadb levam segundos para importar e só são
+# carregados ao construir o VectorKnowledgeGraph
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+CHROMADB_AVAILABLE = importlib.util.find_spec("chromadb") is not None
 
 logger = logging.getLogger(__name__)
 
 
+# Precisão dos pesos do modelo de embedding em GPU (em CPU sempre fp32)
+_EMBEDDING_DTYPES = {"fp16": "float16", "bf16": "bfloat16", "fp32": "float32"}
+
+# Tipos de índice FAISS: "flat" (float32 exato), "sq8" (int8, 4x menos memória)
+# ou "hnsw" (grafo HNSW, busca aproximada sublinear para corpora grandes)
+_INDEX_TYPES = ("flat", "sq8", "hnsw")
+
+# Parâmetros de construção do HNSW (vizinhos por nó e amplitude da construção)
+_HNSW_M = 32
+_HNSW_EF_CONSTRUCTION = 200
+
+# Embeddings de queries recentes (agentes repetem e refinam as mesmas perguntas)
+_QUERY_CACHE_SIZE = 1024
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Normaliza linhas para norma L2 unitária (vetores nulos ficam inalterados)
+
+    Args:
+        matrix: Matriz (n, d) de embeddings
+
+    Returns:
+        Nova matriz float32 contígua com linhas normalizadas
+    """
+    matrix = np.array(matrix, dtype=np.float32, order="C")
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def _create_faiss_index(matrix: np.ndarray, index_type: str, hnsw_ef_search: int = 64) -> Any:
+    """
+    Cria índice FAISS de produto interno com os vetores normalizados
+
+    Args:
+        matrix: Matriz (n, d) normalizada
+        index_type: "flat", "sq8" ou "hnsw"
+        hnsw_ef_search: Candidatos explorados por busca no HNSW (recall x latência)
+
+    Returns:
+        Índice FAISS populado
+    """
+    dimension = matrix.shape[1]
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = _HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = hnsw_ef_search
+    elif index_type == "sq8":
+        # Quantização escalar int8 por dimensão: menos bytes lidos por comparação
+        index = faiss.IndexScalarQuantizer(
+            dimension, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(matrix)
+    else:
+        index = faiss.IndexFlatIP(dimension)
+    index.add(matrix)
+    return index
+
+
+def _top_k_inner_product(index: Any, query_vectors: np.ndarray, k: int):
+    """
+    Retorna os k maiores produtos internos de um índice com cada query
+
+    Args:
+        index: Índice FAISS ou matriz NumPy normalizada
+        query_vectors: Queries normalizadas com shape (B, d)
+        k: Número de resultados por query
+
+    Returns:
+        Tupla (similaridades, linhas) com shape (B, k), em ordem decrescente
+    """
+    if FAISS_AVAILABLE:
+        return index.search(query_vectors, k)
+
+    # Um único GEMM para todas as queries
+    similarities = query_vectors @ index.T
+    if k < similarities.shape[1]:
+        # Seleção parcial O(n) antes de ordenar apenas os k vencedores
+        rows = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    else:
+        rows = np.tile(np.arange(similarities.shape[1]), (len(similarities), 1))
+    top = np.take_along_axis(similarities, rows, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+
 @dataclass
 class SearchResult:
     """Resultado de busca semântica"""
@@ -66,7 +156,8 @@ class VectorKnowledgeGraph:
 
     Implementa RAG pipeline completo:
     - Embeddings usando sentence-transformers
-    - Vector store usando ChromaDB
+    - Vector store usando ChromaDB (persistência)
+    - Índices em memória por tipo de nó (FAISS quando instalado, senão NumPy)
     - Hybrid search (vetorial + estrutural)
     - Batch processing para performance
     """
@@ -78,7 +169,10 @@ class VectorKnowledgeGraph:
         embedding_model: Optional[str] = None,
         vector_store_path: Optional[Path] = None,
         batch_size: int = 32,
-        device: Optional[str] = None
+        device: Optional[str] = None,
+        embedding_dtype: str = "fp16",
+        index_type: str = "flat",
+        hnsw_ef_search: int = 64
     ):
         """
         Inicializa Vector Knowledge Graph
@@ -90,6 +184,9 @@ class VectorKnowledgeGraph:
             vector_store_path: Caminho para vector store (default: ./cache/vector_store)
             batch_size: Tamanho do batch para processamento de embeddings
             device: Dispositivo para embeddings ("cpu" ou "cuda")
+            embedding_dtype: Precisão dos pesos em GPU ("fp16", "bf16" ou "fp32")
+            index_type: Índice FAISS em memória ("flat" exato, "sq8" quantizado ou "hnsw")
+            hnsw_ef_search: efSearch do HNSW (maior = mais recall, mais latência)
 
         Raises:
             ImportError: Se dependências não estiverem instaladas
@@ -99,6 +196,14 @@ class VectorKnowledgeGraph:
         self.embedding_backend = embedding_backend
         self.batch_size = batch_size
 
+        # Cache por instância: some junto com o grafo ao ser substituído
+        self._cached_query_embedding = lru_cache(maxsize=_QUERY_CACHE_SIZE)(self._embed_query)
+
+        if index_type not in _INDEX_TYPES:
+            raise ValueError(f"Tipo de índice não suportado: {index_type}")
+        self.index_type = index_type
+        self.hnsw_ef_search = hnsw_ef_search
+
         # Determinar device
         if device is None:
             try:
@@ -109,6 +214,15 @@ class VectorKnowledgeGraph:
         else:
             self.device = device
 
+        # Meia precisão apenas em GPU: em CPU fp16/bf16 é mais lento que fp32
+        if embedding_dtype not in _EMBEDDING_DTYPES:
+            raise ValueError(f"Precisão de embedding não suportada: {embedding_dtype}")
+        self.embedding_dtype = embedding_dtype if self.device == "cuda" else "fp32"
+        torch_dtype = None
+        if self.embedding_dtype != "fp32":
+            import torch
+            torch_dtype = getattr(torch, _EMBEDDING_DTYPES[self.embedding_dtype])
+
         # Configurar caminho do vector store
         if vector_store_path is None:
             cache_dir = Path(self.kg.cache_path).parent
@@ -132,97 +246,159 @@ class VectorKnowledgeGraph:
                 embedding_model=embedding_model,
                 project_root=project_root
             )
+            self.embedder = self._load_embedder(model_path, is_local, is_quantized, torch_dtype)
+        else:
+            raise ValueError(f"Backend não suportado: {embedding_backend}")
+
+        # Inicializar vector store
+        if not CHROMADB_AVAILABLE:
+            raise ImportError(
+                "chromadb não está instalado. "
+                "Instale com: pip install chromadb>=0.4.0"
+            )
 
-            # Carregar modelo quantizado ou normal
-            if is_local and is_quantized:
-                # Usar carregador especializado para modelos quantizados
-                logger.info(f"Carregando modelo quantizado local: {model_path} (device: {self.device})")
-                try:
-                    self.embedder = QuantizedModelLoader(
-                        model_path=model_path,
-                        device=self.device,
-                        trust_remote_code=False
-                    )
-                    logger.info("Modelo quantizado carregado com sucesso")
-                except (ValueError, NotImplementedError, OSError) as e:
-                    # Erro específico de quantização - fazer fallback para modelo base
-                    error_msg = str(e)
-                    if any(keyword in error_msg for keyword in [
-                        "requer suporte específico",
-                        "aten::_empty_affine_quantized",
-                        "QuantizedMeta",
-                        "Unable to load weights"
-                    ]):
-                        logger.error(
-                            f"Modelo quantizado não pode ser carregado: {e}. "
-                            "Fazendo fallback para modelo base do HuggingFace..."
-                        )
-                        # Fallback para modelo base
-                        model_path = "intfloat/multilingual-e5-small"
-                        is_local = False
-                        is_quantized = False
-                    else:
-                        # Outro erro - tentar como modelo normal
-                        logger.warning(
-                            f"Erro ao carregar modelo quantizado: {e}. "
-                            "Tentando carregar como modelo normal..."
-                        )
-                        is_quantized = False
-                except Exception as e:
-                    logger.warning(
-                        f"Erro inesperado ao carregar modelo quantizado: {e}. "
+        self._initialize_vector_store()
+
+    def _load_embedder(
+        self,
+        model_path: str,
+        is_local: bool,
+        is_quantized: bool,
+        torch_dtype: Optional[Any]
+    ) -> Any:
+        """
+        Carrega o modelo de embedding (ONNX, quantizado ou SentenceTransformer)
+
+        Args:
+            model_path: Caminho local ou nome do modelo no HuggingFace
+            is_local: Se o modelo está em disco
+            is_quantized: Se o modelo local é quantizado
+            torch_dtype: dtype dos pesos em GPU (None = fp32)
+
+        Returns:
+            Modelo com interface encode/get_sentence_embedding_dimension
+
+        Raises:
+            ValueError: Se o modelo local não puder ser carregado
+            ConnectionError: Se o download do HuggingFace falhar
+        """
+        # Imports pesados (torch/transformers) apenas ao carregar o modelo
+        from app.llm.onnx_model_loader import ONNXRUNTIME_AVAILABLE, OnnxModelLoader, find_onnx_model
+        from app.llm.quantized_model_loader import QuantizedModelLoader
+
+        # Em CPU, preferir a exportação ONNX do modelo local (ONNX Runtime é
+        # mais rápido que PyTorch eager); GPU continua no caminho PyTorch
+        if is_local and self.device == "cpu" and ONNXRUNTIME_AVAILABLE and find_onnx_model(model_path):
+            logger.info(f"Carregando modelo ONNX local: {model_path} (device: cpu)")
+            try:
+                return OnnxModelLoader(model_path=model_path)
+            except Exception as e:
+                logger.warning(
+                    f"Erro ao carregar modelo ONNX: {e}. "
+                    "Carregando modelo PyTorch..."
+                )
+
+        if is_local and is_quantized:
+            # Usar carregador especializado para modelos quantizados
+            logger.info(f"Carregando modelo quantizado local: {model_path} (device: {self.device})")
+            try:
+                embedder = QuantizedModelLoader(
+                    model_path=model_path,
+                    device=self.device,
+                    trust_remote_code=False,
+                    dtype=torch_dtype
+                )
+                logger.info("Modelo quantizado carregado com sucesso")
+                return embedder
+            except (ValueError, NotImplementedError, OSError) as e:
+                # Erro específico de quantização - fazer fallback para modelo base
+                error_msg = str(e)
+                if any(keyword in error_msg for keyword in [
+                    "requer suporte específico",
+                    "aten::_empty_affine_quantized",
+                    "QuantizedMeta",
+                    "Unable to load weights"
+                ]):
+                    logger.error(
+                        f"Modelo quantizado não pode ser carregado: {e}. "
                         "Fazendo fallback para modelo base do HuggingFace..."
                     )
-                    # Fallback para modelo base em caso de erro inesperado também
+                    # Fallback para modelo base
                     model_path = "intfloat/multilingual-e5-small"
                     is_local = False
-                    is_quantized = False
-
-            if not (is_local and is_quantized):
-                # Carregamento normal (não quantizado ou HuggingFace)
-                cache_folder = None
-                if is_local:
-                    cache_folder = str(Path(model_path).parent)
-                    logger.info(f"Carregando modelo local: {model_path} (device: {self.device})")
                 else:
-                    logger.info(f"Carregando modelo HuggingFace: {model_path} (device: {self.device})")
+                    # Outro erro - tentar como modelo normal
                     logger.warning(
-                        "Modelo será baixado do HuggingFace. "
-                        "Para uso offline, clone o modelo em ./models/elastic/multilingual-e5-small-optimized"
+                        f"Erro ao carregar modelo quantizado: {e}. "
+                        "Tentando carregar como modelo normal..."
                     )
+            except Exception as e:
+                logger.warning(
+                    f"Erro inesperado ao carregar modelo quantizado: {e}. "
+                    "Fazendo fallback para modelo base do HuggingFace..."
+                )
+                # Fallback para modelo base em caso de erro inesperado também
+                model_path = "intfloat/multilingual-e5-small"
+                is_local = False
 
-                try:
-                    self.embedder = SentenceTransformer(
-                        model_path,
-                        device=self.device,
-                        cache_folder=cache_folder if cache_folder else None
-                    )
-                    logger.info(f"Modelo de embedding carregado com sucesso (local: {is_local})")
-                except Exception as e:
-                    if is_local:
-                        raise ValueError(
-                            f"Erro ao carregar modelo local em {model_path}: {e}. "
-                            "Verifique se o modelo está completo e válido."
-                        ) from e
-                    else:
-                        raise ConnectionError(
-                            f"Erro ao baixar modelo do HuggingFace: {e}. "
-                            "Verifique conexão ou use modelo local."
-                        ) from e
-        else:
-            raise ValueError(f"Backend não suportado: {embedding_backend}")
+        return self._load_sentence_transformer(model_path, is_local, torch_dtype)
 
-        # Inicializar vector store
-        if not CHROMADB_AVAILABLE:
-            raise ImportError(
-                "chromadb não está instalado. "
-                "Instale com: pip install chromadb>=0.4.0"
+    def _load_sentence_transformer(self, model_path: str, is_local: bool, torch_dtype: Optional[Any]) -> Any:
+        """
+        Carrega modelo não quantizado via SentenceTransformer (local ou HuggingFace)
+
+        Args:
+            model_path: Caminho local ou nome do modelo no HuggingFace
+            is_local: Se o modelo está em disco
+            torch_dtype: dtype dos pesos em GPU (None = fp32)
+
+        Returns:
+            Instância de SentenceTransformer
+
+        Raises:
+            ValueError: Se o modelo local não puder ser carregado
+            ConnectionError: Se o download do HuggingFace falhar
+        """
+        from sentence_transformers import SentenceTransformer
+
+        cache_folder = None
+        if is_local:
+            cache_folder = str(Path(model_path).parent)
+            logger.info(f"Carregando modelo local: {model_path} (device: {self.device})")
+        else:
+            logger.info(f"Carregando modelo HuggingFace: {model_path} (device: {self.device})")
+            logger.warning(
+                "Modelo será baixado do HuggingFace. "
+                "Para uso offline, clone o modelo em ./models/elastic/multilingual-e5-small-optimized"
             )
 
-        self._initialize_vector_store()
+        try:
+            embedder = SentenceTransformer(
+                model_path,
+                device=self.device,
+                cache_folder=cache_folder if cache_folder else None
+            )
+            if torch_dtype is not None:
+                embedder.to(torch_dtype)
+            logger.info(f"Modelo de embedding carregado com sucesso (local: {is_local})")
+            return embedder
+        except Exception as e:
+            if is_local:
+                raise ValueError(
+                    f"Erro ao carregar modelo local em {model_path}: {e}. "
+                    "Verifique se o modelo está completo e válido."
+                ) from e
+            else:
+                raise ConnectionError(
+                    f"Erro ao baixar modelo do HuggingFace: {e}. "
+                    "Verifique conexão ou use modelo local."
+                ) from e
 
     def _initialize_vector_store(self) -> None:
         """Inicializa ou carrega vector store do ChromaDB"""
+        import chromadb
+        from chromadb.config import Settings
+
         try:
             # Criar cliente ChromaDB com persistência
             self.chroma_client = chromadb.PersistentClient(
@@ -261,10 +437,164 @@ class VectorKnowledgeGraph:
                     else:
                         logger.info("Vector store está atualizado")
 
+            self._build_search_indices()
+
         except Exception as e:
             logger.error(f"Erro ao inicializar vector store: {e}")
             raise
 
+    def _build_search_indices(self) -> None:
+        """
+        Carrega embeddings do ChromaDB em índices em memória (um por tipo de nó)
+
+        Vetores são normalizados (L2) uma única vez: produto interno = similaridade
+        de cosseno, e cada busca vira um único produto matriz-vetor sobre o tipo
+        pedido. Usa FAISS (IndexFlatIP, IndexScalarQuantizer int8 ou
+        IndexHNSWFlat, conforme index_type) quando instalado; sem faiss, a própria matriz normalizada
+        (NumPy) serve de índice.
+        """
+        self._indices: Dict[str, Any] = {}
+        self._index_ids: Dict[str, List[str]] = {}
+        self._index_metadatas: Dict[str, List[Dict[str, Any]]] = {}
+
+        data = self.collection.get(include=["embeddings", "metadatas"])
+        ids = data.get("ids") or []
+        if not ids:
+            return
+
+        embeddings = np.asarray(data["embeddings"], dtype=np.float32)
+        metadatas = data.get("metadatas") or [{}] * len(ids)
+
+        rows_by_type: Dict[str, List[int]] = defaultdict(list)
+        for row, metadata in enumerate(metadatas):
+            rows_by_type[(metadata or {}).get("type", "unknown")].append(row)
+
+        for node_type, rows in rows_by_type.items():
+            matrix = _normalize_rows(embeddings[rows])
+            if FAISS_AVAILABLE:
+                index = _create_faiss_index(matrix, self.index_type, self.hnsw_ef_search)
+            else:
+                index = matrix
+            self._indices[node_type] = index
+            self._index_ids[node_type] = [ids[row] for row in rows]
+            self._index_metadatas[node_type] = [metadatas[row] or {} for row in rows]
+
+        backend = f"FAISS ({self.index_type})" if FAISS_AVAILABLE else "NumPy"
+        counts = ', '.join(f'{t}={len(node_ids)}' for t, node_ids in self._index_ids.items())
+        logger.info(f"Índices {backend} carregados: {counts}")
+
+    def _search_indices(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int,
+        node_type: Optional[str],
+        similarity_threshold: float
+    ) -> List[List[SearchResult]]:
+        """
+        Busca top_k nos índices em memória (similaridade de cosseno)
+
+        Args:
+            query_embeddings: Embeddings das queries com shape (B, d)
+            top_k: Número de resultados por query
+            node_type: Tipo de nó (None busca em todos os índices)
+            similarity_threshold: Similaridade mínima
+
+        Returns:
+            Uma lista de SearchResult por query, ordenada por similaridade
+        """
+        query_vectors = _normalize_rows(query_embeddings)
+
+        node_types = [node_type] if node_type else list(self._indices)
+        batch_results: List[List[SearchResult]] = [[] for _ in range(len(query_vectors))]
+        for current_type in node_types:
+            index = self._indices.get(current_type)
+            if index is None:
+                continue
+            ids = self._index_ids[current_type]
+            metadatas = self._index_metadatas[current_type]
+            similarities, rows = _top_k_inner_product(index, query_vectors, min(top_k, len(ids)))
+            for search_results, query_similarities, query_rows in zip(batch_results, similarities, rows):
+                for similarity, row in zip(query_similarities, query_rows):
+                    if row < 0 or similarity < similarity_threshold:
+                        continue
+                    node_id = ids[row]
+                    search_results.append(SearchResult(
+                        node_id=node_id,
+                        similarity=float(similarity),
+                        metadata=metadatas[row],
+                        context=self.kg.graph.nodes.get(node_id, {})
+                    ))
+
+        # Com vários tipos, mesclar resultados de cada índice
+        for search_results in batch_results:
+            search_results.sort(key=lambda x: x.similarity, reverse=True)
+            del search_results[top_k:]
+        return batch_results
+
+    def _search_collection(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int,
+        node_type: Optional[str],
+        similarity_threshold: float
+    ) -> List[List[SearchResult]]:
+        """
+        Busca top_k diretamente no ChromaDB (sem índices em memória)
+
+        Args:
+            query_embeddings: Embeddings das queries com shape (B, d)
+            top_k: Número de resultados por query
+            node_type: Tipo de nó (None busca em todos)
+            similarity_threshold: Similaridade mínima
+
+        Returns:
+            Uma lista de SearchResult por query, ordenada por similaridade
+        """
+        # Construir filtros
+        where = {}
+        if node_type:
+            where["type"] = node_type
+
+        # Buscar no vector store (todas as queries em uma chamada)
+        results = self.collection.query(
+            query_embeddings=query_embeddings.tolist(),
+            n_results=top_k * 2,  # Buscar mais para filtrar depois
+            where=where if where else None
+        )
+
+        # Processar resultados
+        batch_results = []
+        for query_row, ids in enumerate(results['ids'] or []):
+            search_results = []
+            for i, node_id in enumerate(ids):
+                metadata = results['metadatas'][query_row][i]
+                distance = results['distances'][query_row][i] if 'distances' in results else None
+
+                # Converter distância para similaridade (ChromaDB usa distância)
+                similarity = 1.0 - distance if distance is not None else 1.0
+
+                # Filtrar por threshold
+                if similarity < similarity_threshold:
+                    continue
+
+                # Buscar contexto completo do grafo
+                node_data = self.kg.graph.nodes.get(node_id, {})
+
+                search_results.append(SearchResult(
+                    node_id=node_id,
+                    similarity=similarity,
+                    metadata=metadata,
+                    context=node_data
+                ))
+
+            # Ordenar por similaridade (maior primeiro) e limitar a top_k
+            search_results.sort(key=lambda x: x.similarity, reverse=True)
+            batch_results.append(search_results[:top_k])
+
+        # Queries sem nenhum resultado no vector store
+        batch_results.extend([] for _ in range(len(query_embeddings) - len(batch_results)))
+        return batch_results
+
     def _create_document(self, node_id: str, node_data: Dict[str, Any]) -> NodeDocument:
         """
         Cria documento textual rico para embedding
@@ -421,6 +751,67 @@ class VectorKnowledgeGraph:
         else:
             raise ValueError(f"Backend não suportado: {self.embedding_backend}")
 
+    def encode_query(self, text: str) -> np.ndarray:
+        """
+        Gera embedding de uma query, reutilizando resultados recentes
+
+        Args:
+            text: Texto da query
+
+        Returns:
+            Vetor float32 1-D somente leitura
+        """
+        return self._cached_query_embedding(text)
+
+    def _embed_query(self, text: str) -> np.ndarray:
+        """
+        Gera embedding de uma query (sem cache)
+
+        Args:
+            text: Texto da query
+
+        Returns:
+            Vetor float32 1-D somente leitura (compartilhado entre chamadas)
+        """
+        embedding = np.asarray(self.encode(text), dtype=np.float32).reshape(-1)
+        embedding.setflags(write=False)
+        return embedding
+
+    def warmup(self) -> None:
+        """
+        Pré-aquece modelo e índices em memória antes das primeiras buscas
+
+        Executa um forward pass do modelo (inicialização preguiçosa de kernels
+        e alocadores) e uma busca por índice (traz os vetores para a memória),
+        tirando esse custo da latência das primeiras tools chamadas.
+        """
+        try:
+            self.encode("warmup")
+            for index in self._indices.values():
+                dimension = index.d if FAISS_AVAILABLE else index.shape[1]
+                _top_k_inner_product(index, np.zeros((1, dimension), dtype=np.float32), 1)
+            logger.info("Vector knowledge graph pré-aquecido")
+        except Exception as e:
+            logger.warning(f"Erro ao pré-aquecer vector knowledge graph: {e}")
+
+    def encode_queries(self, texts: List[str]) -> np.ndarray:
+        """
+        Gera embeddings de várias queries em um único batch do modelo
+
+        Args:
+            texts: Textos das queries
+
+        Returns:
+            Matriz float32 (len(texts), d)
+        """
+        embeddings = self.embedder.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+
     def semantic_search(
         self,
         query: str,
@@ -441,63 +832,59 @@ class VectorKnowledgeGraph:
             Lista de SearchResult ordenada por similaridade
         """
         try:
-            # Gerar embedding da query
-            query_embedding = self.encode(query)
-
-            # Construir filtros
-            where = {}
-            if node_type:
-                where["type"] = node_type
-
-            # Buscar no vector store
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k * 2,  # Buscar mais para filtrar depois
-                where=where if where else None
-            )
+            # Gerar embedding da query (cache compartilhado entre as tools)
+            query_embeddings = self.encode_query(query).reshape(1, -1)
 
-            # Processar resultados
-            search_results = []
-            if results['ids'] and len(results['ids'][0]) > 0:
-                for i in range(len(results['ids'][0])):
-                    node_id = results['ids'][0][i]
-                    metadata = results['metadatas'][0][i]
-                    distance = results['distances'][0][i] if 'distances' in results else None
+            if self._indices:
+                return self._search_indices(query_embeddings, top_k, node_type, similarity_threshold)[0]
+            return self._search_collection(query_embeddings, top_k, node_type, similarity_threshold)[0]
 
-                    # Converter distância para similaridade (ChromaDB usa distância)
-                    similarity = 1.0 - distance if distance is not None else 1.0
+        except Exception as e:
+            logger.error(f"Erro na busca semântica: {e}")
+            return []
 
-                    # Filtrar por threshold
-                    if similarity < similarity_threshold:
-                        continue
+    def semantic_search_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        node_type: Optional[str] = None,
+        similarity_threshold: float = 0.0
+    ) -> List[List[SearchResult]]:
+        """
+        Busca semântica de várias queries de uma vez
 
-                    # Buscar contexto completo do grafo
-                    node_data = self.kg.graph.nodes.get(node_id, {})
+        Codifica todas as queries em um único batch do modelo e busca todas
+        em uma chamada por índice (GEMM em vez de uma GEMV por query).
 
-                    search_results.append(SearchResult(
-                        node_id=node_id,
-                        similarity=similarity,
-                        metadata=metadata,
-                        context=node_data
-                    ))
+        Args:
+            queries: Queries em linguagem natural
+            top_k: Número de resultados por query
+            node_type: Filtrar por tipo ("table" ou "procedure")
+            similarity_threshold: Threshold mínimo de similaridade (0.0 a 1.0)
 
-                # Ordenar por similaridade (maior primeiro)
-                search_results.sort(key=lambda x: x.similarity, reverse=True)
+        Returns:
+            Uma lista de SearchResult por query, na mesma ordem de queries
+        """
+        if not queries:
+            return []
 
-                # Limitar a top_k
-                search_results = search_results[:top_k]
+        try:
+            query_embeddings = self.encode_queries(queries)
 
-            return search_results
+            if self._indices:
+                return self._search_indices(query_embeddings, top_k, node_type, similarity_threshold)
+            return self._search_collection(query_embeddings, top_k, node_type, similarity_threshold)
 
         except Exception as e:
-            logger.error(f"Erro na busca semântica: {e}")
-            return []
+            logger.error(f"Erro na busca semântica em batch: {e}")
+            return [[] for _ in queries]
 
     def hybrid_search(
         self,
         query: str,
         top_k: int = 5,
-        node_type: Optional[str] = None
+        node_type: Optional[str] = None,
+        relationships_per_type_limit: Optional[int] = 10
     ) -> List[SearchResult]:
         """
         Busca híbrida: combina busca vetorial + estrutural
@@ -506,6 +893,8 @@ class VectorKnowledgeGraph:
             query: Query em linguagem natural
             top_k: Número de resultados a retornar
             node_type: Filtrar por tipo
+            relationships_per_type_limit: Máximo de nós relacionados por tipo de
+                relacionamento (None = todos)
 
         Returns:
             Lista de SearchResult com contexto expandido do grafo
@@ -531,18 +920,16 @@ class VectorKnowledgeGraph:
             relationships = {}
 
             # Outgoing edges
-            for _, target, edge_data in self.kg.graph.out_edges(node_id, data=True):
-                rel_type = edge_data.get("edge_type", "unknown")
-                if rel_type not in relationships:
-                    relationships[rel_type] = []
-                relationships[rel_type].append(target)
+            for _, target, rel_type in self.kg.graph.out_edges(node_id, data="edge_type", default="unknown"):
+                targets = relationships.setdefault(rel_type, [])
+                if relationships_per_type_limit is None or len(targets) < relationships_per_type_limit:
+                    targets.append(target)
 
             # Incoming edges
-            for source, _, edge_data in self.kg.graph.in_edges(node_id, data=True):
-                rel_type = edge_data.get("edge_type", "unknown")
-                if rel_type not in relationships:
-                    relationships[rel_type] = []
-                relationships[rel_type].append(source)
+            for source, _, rel_type in self.kg.graph.in_edges(node_id, data="edge_type", default="unknown"):
+                sources = relationships.setdefault(rel_type, [])
+                if relationships_per_type_limit is None or len(sources) < relationships_per_type_limit:
+                    sources.append(source)
 
             # Atualizar contexto com relacionamentos
             expanded_context = result.context.copy()
@@ -571,6 +958,8 @@ class VectorKnowledgeGraph:
                 "indexed_nodes": count,
                 "embedding_backend": self.embedding_backend,
                 "device": self.device,
+                "embedding_dtype": self.embedding_dtype,
+                "index_type": self.index_type if FAISS_AVAILABLE else "numpy",
                 "batch_size": self.batch_size
             }
         except Exception as e:
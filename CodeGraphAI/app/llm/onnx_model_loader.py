@@ -0,0 +1,247 @@
+"""
+Carregador de modelos de embedding exportados para ONNX.
+
+Em CPU, o ONNX Runtime com otimizações de grafo (e pesos int8) codifica
+queries várias vezes mais rápido que o PyTorch em modo eager, sem depender
+de torch no processo.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    from transformers import AutoTokenizer
+    TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    TRANSFORMERS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Arquivos ONNX procurados no diretório do modelo (quantizado int8 primeiro)
+ONNX_WEIGHTS_NAMES = ("model_quantized.onnx", "model.onnx")
+
+
+def find_onnx_model(model_path: Union[str, Path]) -> Optional[Path]:
+    """
+    Localiza o arquivo ONNX exportado no diretório do modelo.
+
+    Args:
+        model_path: Diretório do modelo local
+
+    Returns:
+        Caminho do arquivo ONNX ou None se não houver exportação
+    """
+    model_dir = Path(model_path)
+    for filename in ONNX_WEIGHTS_NAMES:
+        candidate = model_dir / filename
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+class OnnxModelLoader:
+    """
+    Carregador de modelos de embedding em ONNX Runtime (CPU).
+
+    Implementa interface compatível com SentenceTransformer/QuantizedModelLoader
+    (encode + get_sentence_embedding_dimension) para uso transparente.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        *,
+        file_name: Optional[str] = None,
+        preloaded_session: Optional[Any] = None,
+        preloaded_tokenizer: Optional[Any] = None
+    ):
+        """
+        Inicializa carregador ONNX.
+
+        Args:
+            model_path: Diretório do modelo (arquivo ONNX + tokenizer)
+            file_name: Arquivo ONNX a carregar (None usa ONNX_WEIGHTS_NAMES)
+            preloaded_session: InferenceSession já criada (evita leitura do disco)
+            preloaded_tokenizer: Tokenizer já carregado em memória
+
+        Raises:
+            ImportError: Se onnxruntime ou transformers não estiverem instalados
+            ValueError: Se o diretório não contiver modelo ONNX
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError(
+                "onnxruntime não está instalado. "
+                "Instale com: pip install onnxruntime>=1.16.0"
+            )
+        if not TRANSFORMERS_AVAILABLE:
+            raise ImportError(
+                "transformers não está instalado. "
+                "Instale com: pip install transformers>=4.29.0"
+            )
+
+        self.model_path = Path(model_path)
+
+        if preloaded_session is not None:
+            self.session = preloaded_session
+        else:
+            if file_name is not None:
+                onnx_file = self.model_path / file_name
+            else:
+                onnx_file = find_onnx_model(self.model_path)
+            if onnx_file is None or not onnx_file.is_file():
+                raise ValueError(f"Modelo ONNX não encontrado em: {model_path}")
+            self.session = self._create_session(onnx_file)
+
+        if preloaded_tokenizer is not None:
+            self.tokenizer = preloaded_tokenizer
+        else:
+            self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_path), use_fast=True)
+
+        # Entradas aceitas pelo grafo exportado (nem todo modelo usa token_type_ids)
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.embedding_dimension = self.session.get_outputs()[0].shape[-1]
+
+        logger.info(f"Modelo ONNX carregado com sucesso (dimensão: {self.embedding_dimension})")
+
+    @staticmethod
+    def _create_session(onnx_file: Path) -> Any:
+        """
+        Cria InferenceSession em CPU com todas as otimizações de grafo.
+
+        Args:
+            onnx_file: Arquivo .onnx
+
+        Returns:
+            Sessão do ONNX Runtime
+        """
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = int(
+            os.environ.get("OMP_NUM_THREADS") or ((os.cpu_count() or 2) // 2 or 1)
+        )
+        options.inter_op_num_threads = 1
+
+        logger.info(f"Carregando modelo ONNX de: {onnx_file}")
+        return ort.InferenceSession(
+            str(onnx_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False
+    ) -> np.ndarray:
+        """
+        Cria embeddings de textos.
+
+        Compatível com interface do SentenceTransformer (sempre retorna numpy).
+
+        Args:
+            sentences: Texto único ou lista de textos
+            batch_size: Tamanho do batch para processamento
+            show_progress_bar: Mostrar barra de progresso
+            convert_to_numpy: Mantido por compatibilidade (saída já é numpy)
+            normalize_embeddings: Normalizar embeddings (L2 norm)
+
+        Returns:
+            Array float32 de embeddings (n_samples, embedding_dim)
+        """
+        if isinstance(sentences, str):
+            sentences = [sentences]
+
+        if not sentences:
+            return np.array([])
+
+        iterator = range(0, len(sentences), batch_size)
+        if show_progress_bar:
+            try:
+                from tqdm import tqdm
+                iterator = tqdm(iterator, desc="Encoding")
+            except ImportError:
+                pass
+
+        output: Optional[np.ndarray] = None
+        for i in iterator:
+            batch = sentences[i:i + batch_size]
+            encoded = self._tokenize(batch)
+
+            last_hidden_state = self.session.run(None, encoded)[0]
+            embeddings = self._mean_pooling(last_hidden_state, encoded["attention_mask"])
+
+            if output is None:
+                output = np.empty((len(sentences), embeddings.shape[1]), dtype=np.float32)
+            output[i:i + len(batch)] = embeddings
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(output, axis=1, keepdims=True)
+            output /= np.clip(norms, 1e-12, None)
+
+        return output
+
+    def _tokenize(self, batch: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Tokeniza um batch de textos nas entradas esperadas pelo grafo ONNX.
+
+        Args:
+            batch: Lista de textos
+
+        Returns:
+            Arrays int64 de entrada (input_ids, attention_mask, ...)
+        """
+        encoded = self.tokenizer(
+            batch,
+            padding=True,
+            truncation=True,
+            max_length=512,  # Default para modelos BERT-like
+            return_tensors="np"
+        )
+        return {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in encoded.items()
+            if name in self.input_names
+        }
+
+    @staticmethod
+    def _mean_pooling(last_hidden_state: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """
+        Mean pooling para obter embeddings de sentença.
+
+        Args:
+            last_hidden_state: Saída do modelo (batch, seq_len, hidden)
+            attention_mask: Máscara de atenção (batch, seq_len)
+
+        Returns:
+            Embeddings de sentença (batch_size, hidden_size)
+        """
+        mask = attention_mask[..., np.newaxis].astype(np.float32)
+        summed = (last_hidden_state * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        return summed / counts
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """
+        Retorna dimensão dos embeddings.
+
+        Returns:
+            Dimensão dos embeddings
+        """
+        return self.embedding_dimension
+
+    def __repr__(self) -> str:
+        """Representação string do carregador."""
+        return f"OnnxModelLoader(model_path={self.model_path})"
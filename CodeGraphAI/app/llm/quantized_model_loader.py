@@ -5,11 +5,13 @@ Carrega modelos quantizados que não podem ser carregados diretamente pelo
 sentence-transformers devido a tensores quantizados que requerem weights_only=False.
 """
 
+import os
 from pathlib import Path
-from typing import List, Union, Optional
+from typing import Any, Dict, List, Union, Optional
 import logging
 import torch
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 try:
@@ -20,6 +22,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Pesos pré-quantizados em safetensors (mmap, sem pickle)
+SAFETENSORS_WEIGHTS_NAME = "model.safetensors"
+
 
 @contextmanager
 def allow_quantized_loading():
@@ -72,11 +77,19 @@ class QuantizedModelLoader:
     Implementa interface compatível com SentenceTransformer para uso transparente.
     """
 
+    # Configuração de threads do PyTorch é global ao processo: aplicar uma única vez
+    _cpu_threads_configured = False
+
     def __init__(
         self,
         model_path: str,
         device: str = "cpu",
-        trust_remote_code: bool = False
+        trust_remote_code: bool = False,
+        *,
+        dtype: Optional[torch.dtype] = None,
+        preloaded_model: Optional[Any] = None,
+        preloaded_tokenizer: Optional[Any] = None,
+        preloaded_config: Optional[Any] = None
     ):
         """
         Inicializa carregador de modelo quantizado.
@@ -85,6 +98,10 @@ class QuantizedModelLoader:
             model_path: Caminho do modelo quantizado (diretório local)
             device: Dispositivo ("cpu" ou "cuda")
             trust_remote_code: Se deve confiar em código remoto (não recomendado)
+            dtype: Precisão dos pesos no device (ex: torch.float16 em GPU; None mantém)
+            preloaded_model: Modelo já carregado em memória (evita leitura do disco)
+            preloaded_tokenizer: Tokenizer já carregado em memória
+            preloaded_config: Config já carregado (usado para obter a dimensão)
 
         Raises:
             ImportError: Se transformers não estiver instalado
@@ -100,21 +117,77 @@ class QuantizedModelLoader:
         self.device = device
         self.trust_remote_code = trust_remote_code
 
-        if not self.model_path.exists():
+        # Com modelo e tokenizer pré-carregados o disco não é acessado
+        needs_disk = preloaded_model is None or preloaded_tokenizer is None
+        if needs_disk and not self.model_path.exists():
             raise ValueError(f"Modelo não encontrado: {model_path}")
 
-        logger.info(f"Carregando modelo quantizado de: {model_path}")
-        logger.warning(
-            "Usando weights_only=False para carregar tensores quantizados. "
-            "Apenas use com modelos locais confiáveis."
-        )
+        if preloaded_tokenizer is not None:
+            self.tokenizer = preloaded_tokenizer
+        else:
+            self.tokenizer = self._load_tokenizer()
+
+        if preloaded_model is not None:
+            logger.info("Usando modelo quantizado pré-carregado em memória")
+            self.model = preloaded_model
+        else:
+            self.model = self._load_model()
+
+        # Mover modelo para device (e converter pesos para meia precisão, se pedido)
+        if dtype is not None:
+            self.model.to(device=device, dtype=dtype)
+        else:
+            self.model.to(device)
+        self.model.eval()  # Modo avaliação
+
+        if device == "cpu":
+            self._configure_cpu_threads()
+
+        self.embedding_dimension = self._resolve_embedding_dimension(preloaded_config)
+
+        logger.info(f"Modelo quantizado carregado com sucesso (dimensão: {self.embedding_dimension})")
+
+    @classmethod
+    def _configure_cpu_threads(cls) -> None:
+        """
+        Limita threads intra-op e inter-op do PyTorch para inferência em CPU.
+
+        Usa OMP_NUM_THREADS quando definido; caso contrário, metade dos CPUs
+        lógicos (aproximação dos cores físicos). Evita oversubscription nas
+        GEMMs do forward. torch.set_num_threads vale para o processo inteiro,
+        não apenas para este carregador.
+        """
+        if cls._cpu_threads_configured:
+            return
+        cls._cpu_threads_configured = True
+
+        num_threads = int(os.environ.get("OMP_NUM_THREADS") or ((os.cpu_count() or 2) // 2 or 1))
+        torch.set_num_threads(num_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError as e:
+            # Só pode ser chamado antes de qualquer trabalho paralelo no processo
+            logger.debug(f"Não foi possível ajustar threads inter-op: {e}")
+
+        logger.info(f"Threads de inferência em CPU configuradas: {num_threads}")
 
-        # Carregar tokenizer
-        # Se tokenizer local não estiver disponível (LFS), usar do modelo base
+    def _load_tokenizer(self) -> Any:
+        """
+        Carrega tokenizer do diretório do modelo.
+
+        Se tokenizer local não estiver disponível (LFS), usa o do modelo base.
+
+        Returns:
+            Tokenizer carregado
+
+        Raises:
+            ValueError: Se tokenizer não puder ser carregado (local e base)
+        """
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(
+            return AutoTokenizer.from_pretrained(
                 str(self.model_path),
-                trust_remote_code=trust_remote_code
+                use_fast=True,
+                trust_remote_code=self.trust_remote_code
             )
         except Exception as e:
             logger.warning(
@@ -125,25 +198,54 @@ class QuantizedModelLoader:
             # multilingual-e5-small-optimized é baseado em multilingual-e5-small
             try:
                 base_model_name = "intfloat/multilingual-e5-small"
-                self.tokenizer = AutoTokenizer.from_pretrained(
+                tokenizer = AutoTokenizer.from_pretrained(
                     base_model_name,
-                    trust_remote_code=trust_remote_code
+                    use_fast=True,
+                    trust_remote_code=self.trust_remote_code
                 )
                 logger.info(f"Tokenizer do modelo base carregado: {base_model_name}")
+                return tokenizer
             except Exception as e2:
                 raise ValueError(
                     f"Erro ao carregar tokenizer (local e base): {e2}. "
                     "Verifique conexão ou baixe tokenizer localmente."
                 ) from e2
 
-        # Carregar modelo com suporte a quantização
+    def _load_model(self) -> Any:
+        """
+        Carrega modelo quantizado do disco.
+
+        Prefere pesos em safetensors quando disponíveis; o caminho com
+        pytorch_model.bin (pickle) fica apenas como fallback.
+
+        Returns:
+            Modelo carregado
+
+        Raises:
+            ValueError: Se modelo não puder ser carregado
+        """
+        logger.info(f"Carregando modelo quantizado de: {self.model_path}")
+
         # NOTA: Modelos quantizados da Elastic podem requerer bibliotecas específicas
         # ou versões específicas do PyTorch com suporte completo a quantização
         try:
+            # safetensors é carregado via mmap, sem pickle: não requer weights_only=False
+            if (self.model_path / SAFETENSORS_WEIGHTS_NAME).exists():
+                return AutoModel.from_pretrained(
+                    str(self.model_path),
+                    trust_remote_code=self.trust_remote_code,
+                    use_safetensors=True,
+                    torch_dtype=torch.float32
+                )
+
+            logger.warning(
+                "Usando weights_only=False para carregar tensores quantizados. "
+                "Apenas use com modelos locais confiáveis."
+            )
             with allow_quantized_loading():
-                self.model = AutoModel.from_pretrained(
+                return AutoModel.from_pretrained(
                     str(self.model_path),
-                    trust_remote_code=trust_remote_code,
+                    trust_remote_code=self.trust_remote_code,
                     torch_dtype=torch.float32  # Modelos quantizados podem usar float32
                 )
         except (NotImplementedError, OSError) as e:
@@ -168,25 +270,29 @@ class QuantizedModelLoader:
                 "Verifique se o modelo está completo e válido."
             ) from e
 
-        # Mover modelo para device
-        self.model.to(device)
-        self.model.eval()  # Modo avaliação
+    def _resolve_embedding_dimension(self, config: Optional[Any] = None) -> int:
+        """
+        Obtém dimensão de embedding do config (pré-carregado ou em disco).
+
+        Args:
+            config: Config pré-carregado (opcional)
+
+        Returns:
+            Dimensão dos embeddings
+        """
+        if config is not None and hasattr(config, 'hidden_size'):
+            return config.hidden_size
 
-        # Obter dimensão de embedding
         try:
             # Tentar obter do config
             from transformers import AutoConfig
-            config = AutoConfig.from_pretrained(str(self.model_path))
-            self.embedding_dimension = config.hidden_size
+            return AutoConfig.from_pretrained(str(self.model_path)).hidden_size
         except Exception:
             # Fallback: inferir da primeira camada
             if hasattr(self.model, 'embeddings'):
-                self.embedding_dimension = self.model.embeddings.word_embeddings.embedding_dim
-            else:
-                # Default para multilingual-e5-small
-                self.embedding_dimension = 384
-
-        logger.info(f"Modelo quantizado carregado com sucesso (dimensão: {self.embedding_dimension})")
+                return self.model.embeddings.word_embeddings.embedding_dim
+            # Default para multilingual-e5-small
+            return 384
 
     def encode(
         self,
@@ -218,7 +324,10 @@ class QuantizedModelLoader:
         if not sentences:
             return np.array([])
 
+        # Com convert_to_numpy, cada batch é copiado direto para um array pré-alocado
+        # (evita lista de tensores + torch.cat + .numpy())
         all_embeddings = []
+        output: Optional[np.ndarray] = None
 
         # Processar em batches
         iterator = range(0, len(sentences), batch_size)
@@ -229,18 +338,19 @@ class QuantizedModelLoader:
             except ImportError:
                 pass
 
-        with torch.no_grad():
+        # Tokenização do próximo batch roda em background durante o forward atual
+        # (tokenizers "fast" liberam o GIL)
+        with ThreadPoolExecutor(max_workers=1) as executor, torch.inference_mode():
+            pending = executor.submit(self._tokenize, sentences[:batch_size])
             for i in iterator:
                 batch = sentences[i:i + batch_size]
+                encoded = pending.result()
 
-                # Tokenizar
-                encoded = self.tokenizer(
-                    batch,
-                    padding=True,
-                    truncation=True,
-                    max_length=512,  # Default para modelos BERT-like
-                    return_tensors="pt"
-                )
+                next_start = i + batch_size
+                if next_start < len(sentences):
+                    pending = executor.submit(
+                        self._tokenize, sentences[next_start:next_start + batch_size]
+                    )
 
                 # Mover para device
                 encoded = {k: v.to(self.device) for k, v in encoded.items()}
@@ -258,15 +368,38 @@ class QuantizedModelLoader:
                 if normalize_embeddings:
                     embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
 
-                all_embeddings.append(embeddings.cpu())
+                if not convert_to_numpy:
+                    all_embeddings.append(embeddings.cpu())
+                    continue
 
-        # Concatenar todos os batches
-        result = torch.cat(all_embeddings, dim=0)
+                # Saída sempre em float32 (copy_ converte pesos fp16/bf16)
+                if output is None:
+                    output = np.empty((len(sentences), embeddings.shape[1]), dtype=np.float32)
+                torch.from_numpy(output[i:i + len(batch)]).copy_(embeddings)
 
-        # Converter para numpy se solicitado
         if convert_to_numpy:
-            return result.numpy()
-        return result
+            return output
+
+        # Concatenar todos os batches
+        return torch.cat(all_embeddings, dim=0)
+
+    def _tokenize(self, batch: List[str]) -> Dict[str, torch.Tensor]:
+        """
+        Tokeniza um batch de textos.
+
+        Args:
+            batch: Lista de textos
+
+        Returns:
+            Tensores de entrada do modelo (input_ids, attention_mask, ...)
+        """
+        return self.tokenizer(
+            batch,
+            padding=True,
+            truncation=True,
+            max_length=512,  # Default para modelos BERT-like
+            return_tensors="pt"
+        )
 
     def _mean_pooling(
         self,
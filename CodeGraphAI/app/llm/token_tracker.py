@@ -4,14 +4,20 @@ Gerencia e agrega métricas de uso de tokens em operações LLM
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+import sys
+from array import array
+from typing import List, Dict, Any, Iterator, Optional
 from collections import defaultdict
 from datetime import datetime
+from operator import attrgetter
 
 from app.core.models import TokenUsage, LLMRequestMetrics
 
 logger = logging.getLogger(__name__)
 
+# Extrai (tokens_in, tokens_out, tokens_total) em uma única chamada C
+_TOKEN_FIELDS = attrgetter('tokens_in', 'tokens_out', 'tokens_total')
+
 
 class TokenTracker:
     """Gerencia e agrega métricas de uso de tokens"""
@@ -20,6 +26,54 @@ class TokenTracker:
         """Inicializa o tracker de tokens"""
         self.metrics: List[LLMRequestMetrics] = []
         self._lock = None  # Para thread-safety futuro
+        self._init_aggregates()
+
+    def _init_aggregates(self) -> None:
+        """
+        Inicializa agregados incrementais
+
+        Mantidos em add_metrics para que as consultas de estatísticas não
+        precisem percorrer self.metrics. Os agregados por operação ficam em
+        colunas paralelas (array('q')) indexadas pelo id inteiro da operação.
+        """
+        self._totals = {'in': 0, 'out': 0, 'total': 0}
+        # Totais com/sem TOON: {'count', 'total'}
+        self._toon_totals = {'count': 0, 'total': 0}
+        self._notoon_totals = {'count': 0, 'total': 0}
+
+        # operação -> id inteiro (posição nas colunas abaixo)
+        self._operation_ids: Dict[str, int] = {}
+        self._operation_names: List[str] = []
+        self._op_count = array('q')
+        self._op_tokens_in = array('q')
+        self._op_tokens_out = array('q')
+        self._op_tokens_total = array('q')
+        self._op_toon_count = array('q')
+        self._op_toon_total = array('q')
+        self._op_notoon_count = array('q')
+        self._op_notoon_total = array('q')
+
+    def _operation_id(self, operation: str) -> int:
+        """
+        Retorna id inteiro da operação, registrando-a se for nova
+
+        Args:
+            operation: Nome da operação
+
+        Returns:
+            Índice da operação nas colunas de agregados
+        """
+        op_id = self._operation_ids.get(operation)
+        if op_id is None:
+            op_id = len(self._operation_names)
+            self._operation_ids[operation] = op_id
+            self._operation_names.append(operation)
+            for column in (
+                self._op_count, self._op_tokens_in, self._op_tokens_out, self._op_tokens_total,
+                self._op_toon_count, self._op_toon_total, self._op_notoon_count, self._op_notoon_total
+            ):
+                column.append(0)
+        return op_id
 
     def add_metrics(self, metrics: LLMRequestMetrics) -> None:
         """
@@ -28,11 +82,37 @@ class TokenTracker:
         Args:
             metrics: Métricas de uma requisição LLM
         """
+        # Poucas operações distintas: uma única instância de str por nome
+        metrics.operation = sys.intern(metrics.operation)
         self.metrics.append(metrics)
+
+        tokens_in, tokens_out, tokens_total = _TOKEN_FIELDS(metrics)
+
+        self._totals['in'] += tokens_in
+        self._totals['out'] += tokens_out
+        self._totals['total'] += tokens_total
+
+        op_id = self._operation_id(metrics.operation)
+        self._op_count[op_id] += 1
+        self._op_tokens_in[op_id] += tokens_in
+        self._op_tokens_out[op_id] += tokens_out
+        self._op_tokens_total[op_id] += tokens_total
+
+        if metrics.use_toon:
+            toon_totals = self._toon_totals
+            self._op_toon_count[op_id] += 1
+            self._op_toon_total[op_id] += tokens_total
+        else:
+            toon_totals = self._notoon_totals
+            self._op_notoon_count[op_id] += 1
+            self._op_notoon_total[op_id] += tokens_total
+        toon_totals['count'] += 1
+        toon_totals['total'] += tokens_total
+
         logger.debug(
             f"Métricas adicionadas: {metrics.operation} - "
-            f"{metrics.tokens_in} in, {metrics.tokens_out} out, "
-            f"{metrics.tokens_total} total"
+            f"{tokens_in} in, {tokens_out} out, "
+            f"{tokens_total} total"
         )
 
     def get_total_tokens(self) -> TokenUsage:
@@ -45,14 +125,10 @@ class TokenTracker:
         if not self.metrics:
             return TokenUsage()
 
-        total_prompt = sum(m.tokens_in for m in self.metrics)
-        total_completion = sum(m.tokens_out for m in self.metrics)
-        total_all = sum(m.tokens_total for m in self.metrics)
-
         return TokenUsage(
-            prompt_tokens=total_prompt,
-            completion_tokens=total_completion,
-            total_tokens=total_all
+            prompt_tokens=self._totals['in'],
+            completion_tokens=self._totals['out'],
+            total_tokens=self._totals['total']
         )
 
     def get_metrics_by_operation(self) -> Dict[str, List[LLMRequestMetrics]]:
@@ -63,7 +139,7 @@ class TokenTracker:
             Dict com operação como chave e lista de métricas como valor
         """
         grouped = defaultdict(list)
-        for metric in self.metrics:
+        for metric in self.iter_metrics():
             grouped[metric.operation].append(metric)
         return dict(grouped)
 
@@ -83,23 +159,22 @@ class TokenTracker:
             }
 
         total = self.get_total_tokens()
-        by_operation = self.get_metrics_by_operation()
 
         # Calcular totais por operação
         operation_totals = {}
-        for op, metrics_list in by_operation.items():
-            op_total = sum(m.tokens_total for m in metrics_list)
-            op_in = sum(m.tokens_in for m in metrics_list)
-            op_out = sum(m.tokens_out for m in metrics_list)
+        for op, count, op_in, op_out, op_total in zip(
+            self._operation_names, self._op_count,
+            self._op_tokens_in, self._op_tokens_out, self._op_tokens_total
+        ):
             operation_totals[op] = {
-                'count': len(metrics_list),
+                'count': count,
                 'tokens_in': op_in,
                 'tokens_out': op_out,
                 'tokens_total': op_total,
                 'average_per_request': {
-                    'tokens_in': op_in / len(metrics_list) if metrics_list else 0,
-                    'tokens_out': op_out / len(metrics_list) if metrics_list else 0,
-                    'tokens_total': op_total / len(metrics_list) if metrics_list else 0
+                    'tokens_in': op_in / count if count else 0,
+                    'tokens_out': op_out / count if count else 0,
+                    'tokens_total': op_total / count if count else 0
                 }
             }
 
@@ -133,35 +208,25 @@ class TokenTracker:
         Returns:
             Dict com comparação ou None se TOON não foi usado
         """
-        # Separar métricas com e sem TOON
-        with_toon = [m for m in self.metrics if m.use_toon]
-        without_toon = [m for m in self.metrics if not m.use_toon]
+        with_toon_count = self._toon_totals['count']
+        without_toon_count = self._notoon_totals['count']
 
-        if not with_toon:
+        if not with_toon_count:
             return None  # TOON não foi usado
 
         # Calcular totais
-        total_with_toon = sum(m.tokens_total for m in with_toon)
-        total_without_toon = sum(m.tokens_total for m in without_toon) if without_toon else 0
+        total_with_toon = self._toon_totals['total']
+        total_without_toon = self._notoon_totals['total']
 
         # Calcular economia (se houver comparação)
-        if without_toon:
-            # Comparar operações similares
-            # Agrupar por operação para comparação mais precisa
-            with_toon_by_op = defaultdict(list)
-            without_toon_by_op = defaultdict(list)
-
-            for m in with_toon:
-                with_toon_by_op[m.operation].append(m)
-            for m in without_toon:
-                without_toon_by_op[m.operation].append(m)
-
+        if without_toon_count:
             # Comparar operações que existem em ambos
             comparison_by_op = {}
-            for op in set(with_toon_by_op.keys()) & set(without_toon_by_op.keys()):
-                toon_total = sum(m.tokens_total for m in with_toon_by_op[op])
-                no_toon_total = sum(m.tokens_total for m in without_toon_by_op[op])
-                if no_toon_total > 0:
+            for op, toon_count, toon_total, no_toon_count, no_toon_total in zip(
+                self._operation_names, self._op_toon_count, self._op_toon_total,
+                self._op_notoon_count, self._op_notoon_total
+            ):
+                if toon_count and no_toon_count and no_toon_total > 0:
                     savings = ((no_toon_total - toon_total) / no_toon_total) * 100
                     comparison_by_op[op] = {
                         'with_toon': toon_total,
@@ -175,11 +240,11 @@ class TokenTracker:
             return {
                 'with_toon': {
                     'total_tokens': total_with_toon,
-                    'request_count': len(with_toon)
+                    'request_count': with_toon_count
                 },
                 'without_toon': {
                     'total_tokens': total_without_toon,
-                    'request_count': len(without_toon)
+                    'request_count': without_toon_count
                 },
                 'overall_savings_percent': overall_savings,
                 'overall_savings_tokens': total_without_toon - total_with_toon,
@@ -190,7 +255,7 @@ class TokenTracker:
             return {
                 'with_toon': {
                     'total_tokens': total_with_toon,
-                    'request_count': len(with_toon)
+                    'request_count': with_toon_count
                 },
                 'without_toon': None,
                 'note': 'TOON foi usado em todas as requisições. Não há comparação disponível.'
@@ -199,11 +264,25 @@ class TokenTracker:
     def reset(self) -> None:
         """Limpa todas as métricas armazenadas"""
         self.metrics.clear()
+        self._init_aggregates()
         logger.debug("Métricas de tokens resetadas")
 
+    def iter_metrics(self) -> Iterator[LLMRequestMetrics]:
+        """
+        Itera sobre as métricas armazenadas sem copiar a lista
+
+        Para consumidores somente leitura (exportação, agregações).
+
+        Returns:
+            Iterador sobre as métricas
+        """
+        return iter(self.metrics)
+
     def get_all_metrics(self) -> List[LLMRequestMetrics]:
         """
-        Retorna todas as métricas armazenadas
+        Retorna snapshot (cópia) de todas as métricas armazenadas
+
+        Para apenas leitura, prefira iter_metrics(), que não copia a lista.
 
         Returns:
             Lista de todas as métricas
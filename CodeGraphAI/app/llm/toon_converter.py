@@ -3,19 +3,51 @@ Módulo de conversão TOON (Token-Oriented Object Notation) para CodeGraphAI
 Otimiza uso de tokens ao enviar dados estruturados para LLMs
 """
 
+import importlib.util
 import json
 import logging
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, Any, Iterator, Optional
 
-try:
-    from toon_format import encode, decode
+from app.core.serialization import loads
 
-    TOON_AVAILABLE = True
-except ImportError:
-    TOON_AVAILABLE = False
+# Disponibilidade verificada sem importar o módulo; import real fica em _get_toon_module
+TOON_AVAILABLE = importlib.util.find_spec("toon_format") is not None
+_toon_module = None
 
 logger = logging.getLogger(__name__)
 
+# Tabela para escapar chaves de template em uma única passada
+_BRACE_ESCAPE_TABLE = str.maketrans({"{": "{{", "}": "}}"})
+
+# Exemplo estático de resposta usado em format_dependencies_prompt_example
+_DEPENDENCIES_EXAMPLE = {
+    "procedures": ["proc1", "schema.proc2", "proc3"],
+    "tables": ["table1", "schema.table2", "table3"]
+}
+
+# Objeto JSON com até um nível de aninhamento (compilado uma única vez)
+_JSON_OBJECT_PATTERN = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+
+
+def _get_toon_module() -> ModuleType:
+    """
+    Importa toon_format no primeiro uso (evita custo no import deste módulo).
+
+    Returns:
+        Módulo toon_format
+
+    Raises:
+        ImportError: Se toon_format não puder ser importado
+    """
+    global _toon_module
+    if _toon_module is None:
+        import toon_format
+        _toon_module = toon_format
+    return _toon_module
+
 
 def _escape_template_braces(text: str) -> str:
     """
@@ -36,7 +68,77 @@ def _escape_template_braces(text: str) -> str:
     """
     if not text:
         return text
-    return text.replace("{", "{{").replace("}", "}}")
+    return text.translate(_BRACE_ESCAPE_TABLE)
+
+
+def _scan_json_objects(text: str) -> Iterator[str]:
+    """
+    Extrai candidatos a objeto JSON contando profundidade de chaves.
+
+    Varredura O(n) sem backtracking, usada como fallback do regex para
+    objetos com aninhamento profundo. Chaves dentro de strings são ignoradas.
+
+    Args:
+        text: Texto com possíveis objetos JSON
+
+    Yields:
+        Substrings balanceadas de `{` até o `}` correspondente
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = depth > 0
+        elif char == '{':
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == '}' and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+
+def _is_toon_header(line: str) -> bool:
+    """Verifica se linha parece cabeçalho TOON (formato [N]{fields}: ou similar)."""
+    return '[' in line and '{' in line and ':' in line
+
+
+def _extract_toon_block(response: str) -> Optional[str]:
+    """
+    Extrai o primeiro bloco TOON da resposta em uma única passada.
+
+    Args:
+        response: Resposta do LLM
+
+    Returns:
+        Bloco TOON (cabeçalho e linhas seguintes) ou None se não encontrado
+    """
+    toon_lines = []
+    for line in response.splitlines():
+        if not toon_lines:
+            if _is_toon_header(line):
+                toon_lines.append(line)
+            continue
+        if _is_toon_header(line):
+            toon_lines.append(line)
+            continue
+        stripped = line.strip()
+        if stripped and not stripped.startswith(('{', '[')):
+            toon_lines.append(line)
+        else:
+            break
+
+    return '\n'.join(toon_lines) if toon_lines else None
 
 
 def json_to_toon(data: Dict[str, Any]) -> str:
@@ -56,7 +158,7 @@ def json_to_toon(data: Dict[str, Any]) -> str:
         raise ValueError("Biblioteca toon-python não está disponível. Instale com: pip install toon-python")
 
     try:
-        return encode(data)
+        return _get_toon_module().encode(data)
     except Exception as e:
         logger.warning(f"Erro ao converter para TOON: {e}, usando JSON")
         raise ValueError(f"Erro ao converter para TOON: {e}") from e
@@ -79,7 +181,7 @@ def toon_to_json(toon_str: str) -> Dict[str, Any]:
         raise ValueError("Biblioteca toon-python não está disponível. Instale com: pip install toon-python")
 
     try:
-        return decode(toon_str)
+        return _get_toon_module().decode(toon_str)
     except Exception as e:
         logger.warning(f"Erro ao parsear TOON: {e}")
         raise ValueError(f"Erro ao parsear TOON: {e}") from e
@@ -123,31 +225,36 @@ def format_dependencies_prompt_example(use_toon: bool = False) -> str:
     Note:
         As chaves no JSON/TOON são escapadas para compatibilidade com
         PromptTemplate do LangChain, que interpreta `{var}` como variável.
+        O exemplo é estático, então o resultado é memoizado por formato.
     """
-    example_data = {
-        "procedures": ["proc1", "schema.proc2", "proc3"],
-        "tables": ["table1", "schema.table2", "table3"]
-    }
+    return _build_dependencies_prompt_example(use_toon and TOON_AVAILABLE)
 
-    if use_toon and TOON_AVAILABLE:
+
+@lru_cache(maxsize=None)
+def _build_dependencies_prompt_example(use_toon: bool) -> str:
+    """
+    Monta exemplo de resposta de dependências (memoizado).
+
+    Args:
+        use_toon: Se True, usa formato TOON (TOON já verificado como disponível)
+
+    Returns:
+        String com exemplo formatado e chaves escapadas para LangChain
+    """
+    # JSON é usado em todos os formatos: serializar e escapar uma única vez
+    escaped_json = _escape_template_braces(
+        json.dumps(_DEPENDENCIES_EXAMPLE, indent=2, ensure_ascii=False)
+    )
+
+    if use_toon:
         try:
-            toon_str = json_to_toon(example_data)
-            json_str = json.dumps(example_data, indent=2, ensure_ascii=False)
-            # Escapar chaves no JSON e TOON para evitar interpretação como variáveis
-            escaped_toon = _escape_template_braces(toon_str)
-            escaped_json = _escape_template_braces(json_str)
+            # Escapar chaves no TOON para evitar interpretação como variáveis
+            escaped_toon = _escape_template_braces(json_to_toon(_DEPENDENCIES_EXAMPLE))
             return f"Retorne no formato TOON:\n{escaped_toon}\n\nOu no formato JSON:\n{escaped_json}"
         except Exception as e:
             logger.debug(f"Erro ao formatar exemplo TOON: {e}, usando JSON")
-            # Fallback para JSON
-            json_str = json.dumps(example_data, indent=2, ensure_ascii=False)
-            escaped_json = _escape_template_braces(json_str)
-            return f"Retorne no formato JSON:\n{escaped_json}"
-    else:
-        # JSON padrão
-        json_str = json.dumps(example_data, indent=2, ensure_ascii=False)
-        escaped_json = _escape_template_braces(json_str)
-        return f"Retorne no formato JSON:\n{escaped_json}"
+
+    return f"Retorne no formato JSON:\n{escaped_json}"
 
 
 def parse_llm_response(response: str, use_toon: bool = False) -> Optional[Dict[str, Any]]:
@@ -167,40 +274,24 @@ def parse_llm_response(response: str, use_toon: bool = False) -> Optional[Dict[s
     # Se TOON está habilitado e disponível, tenta parsear TOON primeiro
     if use_toon and TOON_AVAILABLE:
         try:
-            # Procura por padrão TOON na resposta
-            # TOON geralmente tem formato [N]{fields}: ou similar
-            if '[' in response and '{' in response and ':' in response:
-                # Tenta extrair bloco TOON
-                lines = response.split('\n')
-                toon_lines = []
-                in_toon_block = False
-                for line in lines:
-                    if '[' in line and '{' in line and ':' in line:
-                        in_toon_block = True
-                        toon_lines.append(line)
-                    elif in_toon_block:
-                        if line.strip() and not line.strip().startswith('{') and not line.strip().startswith('['):
-                            toon_lines.append(line)
-                        else:
-                            break
-
-                if toon_lines:
-                    toon_str = '\n'.join(toon_lines)
-                    return toon_to_json(toon_str)
+            toon_str = _extract_toon_block(response)
+            if toon_str:
+                return toon_to_json(toon_str)
         except Exception as e:
             logger.debug(f"Erro ao parsear TOON da resposta: {e}, tentando JSON")
 
     # Fallback para JSON
     try:
         # Procura por bloco JSON na resposta
-        json_match = None
-        import re
-        # Tenta encontrar objeto JSON completo
-        json_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-        matches = re.finditer(json_pattern, response, re.DOTALL)
-        for match in matches:
+        for match in _JSON_OBJECT_PATTERN.finditer(response):
+            try:
+                return loads(match.group())
+            except json.JSONDecodeError:
+                continue
+        # Objetos com aninhamento mais profundo que o suportado pelo regex
+        for candidate in _scan_json_objects(response):
             try:
-                return json.loads(match.group())
+                return loads(candidate)
             except json.JSONDecodeError:
                 continue
         return None
@@ -21,7 +21,8 @@ def init_tools(
     config: Optional[Any] = None,
     llm_analyzer: Optional[Any] = None,
     procedures_dir: Optional[str] = None,
-    vector_kg: Optional[Any] = None
+    vector_kg: Optional[Any] = None,
+    warmup: bool = False
 ) -> None:
     """
     Initialize tools with dependencies
@@ -31,10 +32,13 @@ def init_tools(
         crawler: CodeCrawler instance (optional)
         db_config: DatabaseConfig instance (optional, required for query tools)
         on_demand_analyzer: OnDemandAnalyzer instance (optional, if not provided will create one)
-        config: Application config (optional, required to create OnDemandAnalyzer)
+        config: Application config (optional, required to create OnDemandAnalyzer;
+            also provides the semantic cache settings of the vector tools)
         llm_analyzer: LLMAnalyzer instance (optional, required to create OnDemandAnalyzer)
         procedures_dir: Directory with .prc files (optional, for OnDemandAnalyzer)
         vector_kg: VectorKnowledgeGraph instance (optional, for semantic search)
+        warmup: Run one encode/search on vector_kg now, so the first tool calls
+            do not pay model and index cold-start costs
     """
     global _knowledge_graph, _crawler, _db_config, _on_demand_analyzer, _vector_kg
     _knowledge_graph = knowledge_graph
@@ -62,24 +66,25 @@ def init_tools(
     import app.tools.field_tools as ft
     import app.tools.crawler_tools as ct
 
-    gt._knowledge_graph = knowledge_graph
-    gt._on_demand_analyzer = _on_demand_analyzer
-    # graph_tools doesn't use crawler by default, but set it for consistency
-    if hasattr(gt, '_crawler'):
-        gt._crawler = crawler
+    # Single source of truth for modules sharing graph/crawler/analyzer globals
+    for module in (gt, ft, ct):
+        module._knowledge_graph = knowledge_graph
+        module._on_demand_analyzer = _on_demand_analyzer
+        # graph_tools doesn't use crawler by default
+        if hasattr(module, '_crawler'):
+            module._crawler = crawler
 
-    ft._knowledge_graph = knowledge_graph
-    ft._crawler = crawler
-    ft._on_demand_analyzer = _on_demand_analyzer
-
-    ct._knowledge_graph = knowledge_graph
-    ct._crawler = crawler
-    ct._on_demand_analyzer = _on_demand_analyzer
+    # New crawler/graph instances invalidate cached crawl and trace results
+    ct._crawl_to_json.cache_clear()
+    ft._trace_to_json.cache_clear()
 
     # Update query_tools if available
     try:
         import app.tools.query_tools as qt
         qt._db_config = db_config
+        # Pooled connections and cached results belong to the previous configuration
+        qt._close_pool()
+        qt._clear_result_cache()
     except ImportError:
         # query_tools might not be available, ignore
         pass
@@ -88,6 +93,12 @@ def init_tools(
     try:
         import app.tools.vector_tools as vt
         vt._vector_kg = _vector_kg
+        vt._clear_semantic_cache()
+        if config is not None:
+            vt._semantic_cache_tau = config.semantic_cache_tau
+            vt._semantic_cache_ttl = config.semantic_cache_ttl
+        if warmup and _vector_kg is not None:
+            _vector_kg.warmup()
     except ImportError:
         # vector_tools might not be available, ignore
         pass
@@ -100,25 +111,30 @@ def get_all_tools() -> List:
     Returns:
         List of tool functions
     """
-    from app.tools.graph_tools import query_procedure, query_table
-    from app.tools.field_tools import analyze_field, trace_field_flow
+    from app.tools.graph_tools import query_procedure, query_table, query_entity
+    from app.tools.field_tools import analyze_field, analyze_fields, trace_field_flow
     from app.tools.crawler_tools import crawl_procedure
 
     tools = [
         query_procedure,
         query_table,
+        query_entity,
         analyze_field,
+        analyze_fields,
         trace_field_flow,
         crawl_procedure
     ]
 
     # Add query tools if available
     try:
-        from app.tools.query_tools import execute_query, sample_table_data, get_field_statistics
+        from app.tools.query_tools import (
+            execute_query, sample_table_data, get_field_statistics, get_fields_statistics
+        )
         tools.extend([
             execute_query,
             sample_table_data,
-            get_field_statistics
+            get_field_statistics,
+            get_fields_statistics
         ])
     except ImportError:
         # query_tools might not be available, skip
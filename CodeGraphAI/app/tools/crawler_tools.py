@@ -4,9 +4,14 @@ Crawler Tools for procedure dependency analysis
 
 import json
 import logging
+from functools import lru_cache
+from typing import Any, Optional
+
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 
+from app.core.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 # Global dependencies (set by init_tools)
@@ -14,6 +19,15 @@ _knowledge_graph = None
 _crawler = None
 _on_demand_analyzer = None
 
+# Pre-serialized guard clause errors (payload never changes)
+_ERR_CRAWLER_NOT_INIT = json.dumps({
+    "success": False,
+    "error": "Crawler não inicializado. Esta funcionalidade requer o crawler."
+})
+
+# Crawl results cached per crawler instance (cleared by init_tools)
+_CRAWL_CACHE_SIZE = 256
+
 
 class CrawlProcedureInput(BaseModel):
     """Input schema for crawl_procedure tool"""
@@ -61,16 +75,12 @@ def crawl_procedure(
         - "Qual o impacto de modificar VALIDAR_USUARIO?"
     """
     if not _crawler:
-        return json.dumps({
-            "success": False,
-            "error": "Crawler não inicializado. Esta funcionalidade requer o crawler."
-        })
+        return _ERR_CRAWLER_NOT_INIT
 
     try:
         # If procedure not in cache, try on-demand analysis
         if _on_demand_analyzer:
-            proc_context = _knowledge_graph.get_procedure_context(procedure_name)
-            if not proc_context:
+            if not _knowledge_graph.has_procedure(procedure_name):
                 logger.info(f"Procedure '{procedure_name}' not in cache for crawling, attempting on-demand...")
                 on_demand_result = _on_demand_analyzer.get_or_analyze_procedure(procedure_name)
                 if not on_demand_result.get("success"):
@@ -79,36 +89,9 @@ def crawl_procedure(
                         "error": f"Procedure '{procedure_name}' não encontrada. {on_demand_result.get('error', '')}"
                     })
 
-        crawl_result = _crawler.crawl_procedure(
-            proc_name=procedure_name,
-            max_depth=max_depth,
-            include_tables=include_tables
-        )
-
-        result = {
-            "success": True,
-            "data": {
-                "procedure_name": procedure_name,
-                "dependencies_tree": crawl_result.dependencies_tree,
-                "procedures_found": crawl_result.procedures_found,
-                "tables_found": crawl_result.tables_found if include_tables else [],
-                "depth_reached": crawl_result.depth_reached
-            },
-            "statistics": {
-                "total_procedures": len(crawl_result.procedures_found),
-                "total_tables": len(crawl_result.tables_found) if include_tables else 0,
-                "max_depth": max_depth,
-                "depth_reached": crawl_result.depth_reached
-            },
-            "summary": {
-                "procedure": procedure_name,
-                "calls": len(crawl_result.procedures_found) - 1,  # Exclude self
-                "accesses": len(crawl_result.tables_found) if include_tables else 0,
-                "complexity": "alta" if len(crawl_result.procedures_found) > 10 else "média" if len(crawl_result.procedures_found) > 5 else "baixa"
-            }
-        }
-
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        # Graph revision in the key: on-demand analysis may add callees later
+        revision = getattr(_knowledge_graph, "revision", None)
+        return _crawl_to_json(_crawler, revision, procedure_name, max_depth, include_tables)
 
     except Exception as e:
         logger.exception(f"Erro ao fazer crawling de {procedure_name}")
@@ -117,3 +100,62 @@ def crawl_procedure(
             "error": f"Erro ao fazer crawling: {str(e)}"
         })
 
+
+@lru_cache(maxsize=_CRAWL_CACHE_SIZE)
+def _crawl_to_json(
+    crawler: Any,
+    revision: Optional[int],
+    procedure_name: str,
+    max_depth: int,
+    include_tables: bool
+) -> str:
+    """
+    Run crawling and serialize the result (memoized).
+
+    The crawler instance and the graph revision are part of the key, so
+    replacing the crawler or changing the graph never returns stale results.
+    Exceptions are not cached.
+
+    Args:
+        crawler: CodeCrawler instance
+        revision: Knowledge graph revision (only used as cache key)
+        procedure_name: Procedure name
+        max_depth: Maximum crawling depth
+        include_tables: Include tables in crawling
+
+    Returns:
+        JSON with the full dependency tree
+    """
+    crawl_result = crawler.crawl_procedure(
+        proc_name=procedure_name,
+        max_depth=max_depth,
+        include_tables=include_tables
+    )
+
+    n_proc = len(crawl_result.procedures_found)
+    n_tab = len(crawl_result.tables_found) if include_tables else 0
+
+    result = {
+        "success": True,
+        "data": {
+            "procedure_name": procedure_name,
+            "dependencies_tree": crawl_result.dependencies_tree,
+            "procedures_found": crawl_result.procedures_found,
+            "tables_found": crawl_result.tables_found if include_tables else [],
+            "depth_reached": crawl_result.depth_reached
+        },
+        "statistics": {
+            "total_procedures": n_proc,
+            "total_tables": n_tab,
+            "max_depth": max_depth,
+            "depth_reached": crawl_result.depth_reached
+        },
+        "summary": {
+            "procedure": procedure_name,
+            "calls": n_proc - 1,  # Exclude self
+            "accesses": n_tab,
+            "complexity": "alta" if n_proc > 10 else "média" if n_proc > 5 else "baixa"
+        }
+    }
+
+    return dumps(result)
@@ -5,10 +5,13 @@ Tools for analyzing specific fields/columns
 
 import json
 import logging
-from typing import Optional
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_core.tools import tool
 
+from app.core.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 # Global dependencies (set by init_tools)
@@ -16,9 +19,127 @@ _knowledge_graph = None
 _crawler = None
 _on_demand_analyzer = None
 
+# Pre-serialized guard clause errors (payload never changes)
+_ERR_KG_NOT_INIT = json.dumps({
+    "success": False,
+    "error": "Knowledge graph não inicializado. Execute a análise primeiro."
+})
+_ERR_CRAWLER_NOT_INIT = json.dumps({
+    "success": False,
+    "error": "Crawler não inicializado. Esta funcionalidade requer o crawler."
+})
+
+# Field traces cached per crawler instance (cleared by init_tools)
+_TRACE_CACHE_SIZE = 256
+
+
+def _ensure_loaded(procedure_name: Optional[str], table_name: Optional[str]) -> None:
+    """
+    Load procedure/table on-demand when they are not in the knowledge graph
+
+    Args:
+        procedure_name: Procedure used to filter field usage (optional)
+        table_name: Table where the field is defined (optional)
+    """
+    if not _on_demand_analyzer:
+        return
+
+    # If procedure_name provided and not in cache, try on-demand analysis
+    if procedure_name:
+        if not _knowledge_graph.has_procedure(procedure_name):
+            logger.info("Procedure '%s' not in cache for field analysis, attempting on-demand...", procedure_name)
+            on_demand_result = _on_demand_analyzer.get_or_analyze_procedure(procedure_name)
+            if not on_demand_result.get("success"):
+                logger.warning("Failed to load procedure '%s' on-demand: %s", procedure_name, on_demand_result.get('error'))
+
+    # If table_name provided and not in cache, try on-demand analysis
+    if table_name:
+        if not _knowledge_graph.has_table(table_name):
+            logger.info("Table '%s' not in cache for field analysis, attempting on-demand...", table_name)
+            on_demand_result = _on_demand_analyzer.get_or_analyze_table(table_name)
+            if not on_demand_result.get("success"):
+                logger.warning("Failed to load table '%s' on-demand: %s", table_name, on_demand_result.get('error'))
+
+
+def _check_scope(procedure_name: Optional[str], table_name: Optional[str]) -> Optional[str]:
+    """
+    Validate procedure/table filters before scanning field usage
+
+    Args:
+        procedure_name: Procedure used to filter field usage (optional)
+        table_name: Table where the field is defined (optional)
+
+    Returns:
+        JSON error with similar names if a filter does not exist, None otherwise
+    """
+    if procedure_name and not _knowledge_graph.has_procedure(procedure_name):
+        return json.dumps({
+            "success": False,
+            "error": f"Procedure '{procedure_name}' não encontrada no knowledge graph.",
+            "similar": _knowledge_graph.get_similar_names(procedure_name, "procedure")
+        })
+
+    if table_name and not _knowledge_graph.has_table(table_name):
+        return json.dumps({
+            "success": False,
+            "error": f"Tabela '{table_name}' não encontrada no knowledge graph.",
+            "similar": _knowledge_graph.get_similar_names(table_name, "table")
+        })
+
+    return None
+
+
+def _build_field_analysis(
+    field_name: str,
+    bundle: Dict[str, Any],
+    table_name: Optional[str],
+    max_usages: int
+) -> Dict[str, Any]:
+    """
+    Build analyze_field payload from a knowledge graph field bundle
+
+    Args:
+        field_name: Field name
+        bundle: Result of get_field_bundle(s) for the field
+        table_name: Table where the field is defined (optional)
+        max_usages: Maximum detailed_usage entries returned
+
+    Returns:
+        Dict with definition, usage, relationships and detailed usage
+    """
+    usage_info = bundle["usage"]
+    detailed_usage = bundle["detailed_usage"]
+
+    definition = None
+    col = bundle["column"]
+    if col:
+        definition = {
+            "table": table_name,
+            "data_type": col.get("data_type"),
+            "nullable": col.get("nullable"),
+            "is_primary_key": col.get("is_primary_key"),
+            "is_foreign_key": col.get("is_foreign_key")
+        }
+
+    return {
+        "field_name": field_name,
+        "definition": definition,
+        "usage": {
+            "read_by": usage_info["read_by"],
+            "written_by": usage_info["written_by"],
+            "used_in_procedures": usage_info["procedures"]
+        },
+        "usage_count": len(detailed_usage),
+        "relationships": bundle["relationships"],
+        "detailed_usage": detailed_usage[:max_usages],
+        "truncated": len(detailed_usage) > max_usages
+    }
+
 
 class AnalyzeFieldInput(BaseModel):
     """Input schema for analyze_field tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     field_name: str = Field(
         description="Nome do campo/coluna a ser analisado"
     )
@@ -30,13 +151,19 @@ class AnalyzeFieldInput(BaseModel):
         default=None,
         description="Nome da tabela onde o campo está definido (opcional)"
     )
+    max_usages: int = Field(
+        default=50,
+        ge=1,
+        description="Máximo de usos detalhados retornados por campo (padrão: 50; aumente se 'truncated' for true)"
+    )
 
 
 @tool(args_schema=AnalyzeFieldInput)
 def analyze_field(
     field_name: str,
     procedure_name: Optional[str] = None,
-    table_name: Optional[str] = None
+    table_name: Optional[str] = None,
+    max_usages: int = 50
 ) -> str:
     """Analisa um campo/coluna específico em detalhes.
 
@@ -51,6 +178,8 @@ def analyze_field(
         field_name: Nome do campo
         procedure_name: Procedure onde buscar o campo (opcional, ajuda a filtrar)
         table_name: Tabela onde buscar o campo (opcional)
+        max_usages: Máximo de usos detalhados (detailed_usage); se 'truncated'
+            vier true, chame novamente com um valor maior
 
     Returns:
         JSON com análise completa do campo
@@ -61,100 +190,149 @@ def analyze_field(
         - "De onde vem o campo 'total_valor'?"
     """
     if not _knowledge_graph:
-        return json.dumps({
-            "success": False,
-            "error": "Knowledge graph não inicializado. Execute a análise primeiro."
-        })
+        return _ERR_KG_NOT_INIT
 
     try:
-        # If procedure_name provided and not in cache, try on-demand analysis
-        if procedure_name and _on_demand_analyzer:
-            proc_context = _knowledge_graph.get_procedure_context(procedure_name)
-            if not proc_context:
-                logger.info(f"Procedure '{procedure_name}' not in cache for field analysis, attempting on-demand...")
-                on_demand_result = _on_demand_analyzer.get_or_analyze_procedure(procedure_name)
-                if not on_demand_result.get("success"):
-                    logger.warning(f"Failed to load procedure '{procedure_name}' on-demand: {on_demand_result.get('error')}")
-
-        # If table_name provided and not in cache, try on-demand analysis
-        if table_name and _on_demand_analyzer:
-            table_info = _knowledge_graph.get_table_info(table_name)
-            if not table_info:
-                logger.info(f"Table '{table_name}' not in cache for field analysis, attempting on-demand...")
-                on_demand_result = _on_demand_analyzer.get_or_analyze_table(table_name)
-                if not on_demand_result.get("success"):
-                    logger.warning(f"Failed to load table '{table_name}' on-demand: {on_demand_result.get('error')}")
+        _ensure_loaded(procedure_name, table_name)
+
+        # Unknown filter (typo/hallucination): fail before the usage scan
+        scope_error = _check_scope(procedure_name, table_name)
+        if scope_error:
+            return scope_error
 
-        # Query field usage
-        field_usage_list = _knowledge_graph.query_field_usage(
+        # Query usage, relationships and definition in a single graph pass
+        bundle = _knowledge_graph.get_field_bundle(
             field_name=field_name,
-            procedure_name=procedure_name
+            procedure_name=procedure_name,
+            table_name=table_name
         )
-
-        if not field_usage_list:
+        if not bundle["detailed_usage"]:
             return json.dumps({
                 "success": False,
                 "error": f"Campo '{field_name}' não encontrado no knowledge graph. "
                         f"Verifique se o nome está correto ou se a análise foi executada."
             })
 
-        # Get usage info
-        usage_info = _knowledge_graph.get_field_usage(field_name)
-
-        # Get relationships
-        relationships = _knowledge_graph.get_field_relationships(field_name)
-
-        # Find field in tables if table_name provided
-        definition = None
-        if table_name:
-            table_info = _knowledge_graph.get_table_info(table_name)
-            if table_info:
-                for col in table_info.get("columns", []):
-                    if col.get("name") == field_name:
-                        definition = {
-                            "table": table_name,
-                            "data_type": col.get("data_type"),
-                            "nullable": col.get("nullable"),
-                            "is_primary_key": col.get("is_primary_key"),
-                            "is_foreign_key": col.get("is_foreign_key")
-                        }
-                        break
+        result = {
+            "success": True,
+            "data": _build_field_analysis(field_name, bundle, table_name, max_usages)
+        }
+
+        return dumps(result)
+
+    except Exception as e:
+        logger.exception("Erro ao analisar campo %s", field_name)
+        return json.dumps({
+            "success": False,
+            "error": f"Erro ao analisar campo: {str(e)}"
+        })
+
+
+class AnalyzeFieldsInput(BaseModel):
+    """Input schema for analyze_fields tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
+    field_names: List[str] = Field(
+        description="Lista de campos/colunas a serem analisados"
+    )
+    procedure_name: Optional[str] = Field(
+        default=None,
+        description="Nome da procedure onde os campos são usados (opcional, ajuda a filtrar resultados)"
+    )
+    table_name: Optional[str] = Field(
+        default=None,
+        description="Nome da tabela onde os campos estão definidos (opcional)"
+    )
+    max_usages: int = Field(
+        default=50,
+        ge=1,
+        description="Máximo de usos detalhados retornados por campo (padrão: 50; aumente se 'truncated' for true)"
+    )
+
+
+@tool(args_schema=AnalyzeFieldsInput)
+def analyze_fields(
+    field_names: List[str],
+    procedure_name: Optional[str] = None,
+    table_name: Optional[str] = None,
+    max_usages: int = 50
+) -> str:
+    """Analisa vários campos/colunas de uma vez (versão em lote de analyze_field).
+
+    Prefira esta tool a chamar analyze_field repetidamente quando precisar
+    analisar 3 ou mais campos: o knowledge graph é percorrido uma única vez.
+
+    Args:
+        field_names: Nomes dos campos
+        procedure_name: Procedure onde buscar os campos (opcional, ajuda a filtrar)
+        table_name: Tabela onde buscar os campos (opcional)
+        max_usages: Máximo de usos detalhados por campo (ver analyze_field)
+
+    Returns:
+        JSON com a análise de cada campo encontrado e a lista dos não encontrados
+
+    Examples:
+        - "Analise os campos 'status', 'email' e 'created_at'"
+        - "O que fazem as colunas id, valor e data da tabela PEDIDOS?"
+    """
+    if not _knowledge_graph:
+        return _ERR_KG_NOT_INIT
+
+    try:
+        _ensure_loaded(procedure_name, table_name)
+
+        # Unknown filter (typo/hallucination): fail before the usage scan
+        scope_error = _check_scope(procedure_name, table_name)
+        if scope_error:
+            return scope_error
+
+        # Deduplicate keeping the requested order
+        names = list(dict.fromkeys(field_names))
+        bundles = _knowledge_graph.get_field_bundles(
+            field_names=names,
+            procedure_name=procedure_name,
+            table_name=table_name
+        )
+
+        fields = {}
+        not_found = []
+        for name in names:
+            bundle = bundles[name]
+            if bundle["detailed_usage"]:
+                fields[name] = _build_field_analysis(name, bundle, table_name, max_usages)
+            else:
+                not_found.append(name)
+
+        if not fields:
+            return json.dumps({
+                "success": False,
+                "error": f"Nenhum dos campos {names} foi encontrado no knowledge graph. "
+                        f"Verifique se os nomes estão corretos ou se a análise foi executada."
+            })
 
         result = {
             "success": True,
             "data": {
-                "field_name": field_name,
-                "definition": definition,
-                "usage": {
-                    "read_by": usage_info.get("read_by", []),
-                    "written_by": usage_info.get("written_by", []),
-                    "used_in_procedures": usage_info.get("procedures", [])
-                },
-                "usage_count": len(field_usage_list),
-                "relationships": relationships,
-                "detailed_usage": [
-                    {
-                        "procedure": usage.get("procedure"),
-                        "operations": usage.get("usage", {}).get("operations", []),
-                        "transformations": usage.get("usage", {}).get("transformations", [])
-                    }
-                    for usage in field_usage_list
-                ]
+                "fields": fields,
+                "not_found": not_found,
+                "field_count": len(fields)
             }
         }
 
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return dumps(result)
 
     except Exception as e:
-        logger.exception(f"Erro ao analisar campo {field_name}")
+        logger.exception("Erro ao analisar campos %s", field_names)
         return json.dumps({
             "success": False,
-            "error": f"Erro ao analisar campo: {str(e)}"
+            "error": f"Erro ao analisar campos: {str(e)}"
         })
 
 
 class TraceFieldFlowInput(BaseModel):
     """Input schema for trace_field_flow tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     field_name: str = Field(
         description="Nome do campo a ser rastreado"
     )
@@ -165,13 +343,19 @@ class TraceFieldFlowInput(BaseModel):
         default=10,
         description="Profundidade máxima do rastreamento (padrão: 10)"
     )
+    max_path: int = Field(
+        default=100,
+        ge=1,
+        description="Máximo de passos do caminho retornados (padrão: 100; aumente se 'truncated' for true)"
+    )
 
 
 @tool(args_schema=TraceFieldFlowInput)
 def trace_field_flow(
     field_name: str,
     start_procedure: str,
-    max_depth: int = 10
+    max_depth: int = 10,
+    max_path: int = 100
 ) -> str:
     """Rastreia o fluxo completo de um campo através de procedures.
 
@@ -188,6 +372,8 @@ def trace_field_flow(
         field_name: Nome do campo
         start_procedure: Procedure onde começar o rastreamento
         max_depth: Profundidade máxima do rastreamento
+        max_path: Máximo de passos em path; se 'truncated' vier true, chame
+            novamente com um valor maior
 
     Returns:
         JSON com caminho completo e transformações
@@ -198,17 +384,14 @@ def trace_field_flow(
         - "Trace o fluxo do campo 'email' começando em CRIAR_USUARIO"
     """
     if not _crawler:
-        return json.dumps({
-            "success": False,
-            "error": "Crawler não inicializado. Esta funcionalidade requer o crawler."
-        })
+        return _ERR_CRAWLER_NOT_INIT
 
     try:
         # If start_procedure not in cache, try on-demand analysis
         if _on_demand_analyzer:
             proc_context = _knowledge_graph.get_procedure_context(start_procedure)
             if not proc_context:
-                logger.info(f"Start procedure '{start_procedure}' not in cache for field tracing, attempting on-demand...")
+                logger.info("Start procedure '%s' not in cache for field tracing, attempting on-demand...", start_procedure)
                 on_demand_result = _on_demand_analyzer.get_or_analyze_procedure(start_procedure)
                 if not on_demand_result.get("success"):
                     return json.dumps({
@@ -216,48 +399,73 @@ def trace_field_flow(
                         "error": f"Procedure '{start_procedure}' não encontrada. {on_demand_result.get('error', '')}"
                     })
 
-        trace_result = _crawler.trace_field(
-            field_name=field_name,
-            start_procedure=start_procedure,
-            max_depth=max_depth
-        )
-
-        result = {
-            "success": True,
-            "data": {
-                "field_name": trace_result.field_name,
-                "start_procedure": start_procedure,
-                "path": [
-                    {
-                        "procedure": step.procedure,
-                        "operation": step.operation,
-                        "depth": step.depth,
-                        "context": step.context
-                    }
-                    for step in trace_result.path
-                ],
-                "sources": trace_result.sources,
-                "destinations": trace_result.destinations,
-                "transformations": trace_result.transformations,
-                "path_length": len(trace_result.path),
-                "source_count": len(trace_result.sources),
-                "destination_count": len(trace_result.destinations)
-            },
-            "summary": {
-                "field": field_name,
-                "starts_at": start_procedure,
-                "comes_from": trace_result.sources,
-                "goes_to": trace_result.destinations,
-                "has_transformations": len(trace_result.transformations) > 0
-            }
-        }
-
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        # Graph revision in the key: on-demand analysis may add procedures later
+        revision = getattr(_knowledge_graph, "revision", None)
+        return _trace_to_json(_crawler, revision, field_name, start_procedure, max_depth, max_path)
 
     except Exception as e:
-        logger.exception(f"Erro ao rastrear fluxo de {field_name}")
+        logger.exception("Erro ao rastrear fluxo de %s", field_name)
         return json.dumps({
             "success": False,
             "error": f"Erro ao rastrear fluxo: {str(e)}"
         })
 
+
+@lru_cache(maxsize=_TRACE_CACHE_SIZE)
+def _trace_to_json(
+    crawler: Any,
+    revision: Optional[int],
+    field_name: str,
+    start_procedure: str,
+    max_depth: int,
+    max_path: int
+) -> str:
+    """
+    Trace field flow and serialize the result (memoized).
+
+    The crawler instance and the graph revision are part of the key, so
+    replacing the crawler or changing the graph never returns stale results.
+    Exceptions are not cached.
+
+    Args:
+        crawler: CodeCrawler instance
+        revision: Knowledge graph revision (only used as cache key)
+        field_name: Field name
+        start_procedure: Procedure where tracing starts
+        max_depth: Maximum tracing depth
+        max_path: Maximum path steps returned
+
+    Returns:
+        JSON with path, sources, destinations and transformations
+    """
+    trace_result = crawler.trace_field(
+        field_name=field_name,
+        start_procedure=start_procedure,
+        max_depth=max_depth
+    )
+
+    result = {
+        "success": True,
+        "data": {
+            "field_name": trace_result.field_name,
+            "start_procedure": start_procedure,
+            # TraceStep dataclasses are serialized as-is (no intermediate dicts)
+            "path": trace_result.path[:max_path],
+            "truncated": len(trace_result.path) > max_path,
+            "sources": trace_result.sources,
+            "destinations": trace_result.destinations,
+            "transformations": trace_result.transformations,
+            "path_length": len(trace_result.path),
+            "source_count": len(trace_result.sources),
+            "destination_count": len(trace_result.destinations)
+        },
+        "summary": {
+            "field": field_name,
+            "starts_at": start_procedure,
+            "comes_from": trace_result.sources,
+            "goes_to": trace_result.destinations,
+            "has_transformations": len(trace_result.transformations) > 0
+        }
+    }
+
+    return dumps(result)
@@ -4,19 +4,143 @@ Graph Tools for querying Knowledge Graph
 
 import json
 import logging
-from typing import Optional, Set
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional, Set
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_core.tools import tool
 
+from app.core.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 # Global dependencies (set by init_tools)
 _knowledge_graph = None
 _on_demand_analyzer = None
 
+# Pre-serialized guard clause errors (payload never changes)
+_ERR_KG_NOT_INIT = json.dumps({
+    "success": False,
+    "error": "Knowledge graph não inicializado. Execute a análise primeiro."
+})
+
+
+def _procedure_data(
+    proc_context: Dict[str, Any],
+    procedure_name: str,
+    include_dependencies: bool,
+    include_callers: bool
+) -> Dict[str, Any]:
+    """
+    Build query_procedure payload from a procedure context
+
+    Args:
+        proc_context: Result of get_procedure_context (or on-demand data)
+        procedure_name: Name requested by the agent
+        include_dependencies: Include called procedures and tables
+        include_callers: Include procedures that call this one
+
+    Returns:
+        Dict with procedure data
+    """
+    data = {
+        "procedure_name": proc_context.get("name"),
+        "schema": proc_context.get("schema"),
+        "full_name": proc_context.get("full_name"),
+        "parameters": proc_context.get("parameters", []),
+        "business_logic": proc_context.get("business_logic", ""),
+        "complexity_score": proc_context.get("complexity_score", 0)
+    }
+
+    if include_dependencies:
+        data["dependencies"] = {
+            "procedures": proc_context.get("called_procedures", []),
+            "tables": proc_context.get("called_tables", [])
+        }
+        data["total_dependencies"] = (
+            len(proc_context.get("called_procedures", [])) +
+            len(proc_context.get("called_tables", []))
+        )
+
+    if include_callers:
+        callers = _knowledge_graph.get_callers(proc_context.get("full_name", procedure_name))
+        # get_callers already deduplicates (set); sort once for stable output
+        callers_list = sorted(callers)
+        data["callers"] = callers_list
+        data["caller_count"] = len(callers_list)
+
+    return data
+
+
+def _table_data(
+    table_info: Dict[str, Any],
+    table_name: str,
+    include_columns: bool,
+    include_relationships: bool
+) -> Dict[str, Any]:
+    """
+    Build query_table payload from table info
+
+    Args:
+        table_info: Result of get_table_info (or on-demand data)
+        table_name: Name requested by the agent
+        include_columns: Include column details
+        include_relationships: Include foreign keys and relationships
+
+    Returns:
+        Dict with table data
+    """
+    data = {
+        "table_name": table_info.get("name"),
+        "schema": table_info.get("schema"),
+        "full_name": table_info.get("full_name"),
+        "business_purpose": table_info.get("business_purpose", ""),
+        "complexity_score": table_info.get("complexity_score", 0),
+        "row_count": table_info.get("row_count")
+    }
+
+    if include_columns:
+        columns = table_info.get("columns", [])
+
+        # WORKAROUND: Remove duplicatas causadas por bug no PostgreSQL loader
+        # TODO: Fix root cause in PostgreSQLTableLoader._load_columns()
+        # Issue: LEFT JOIN on FK constraints returns multiple rows per column
+        # Tracking: FASE 2 do plano de correção
+        seen_columns: Set[str] = set()
+        unique_columns = []
+
+        for col in columns:
+            col_name = col.get("name")
+            if col_name not in seen_columns:
+                seen_columns.add(col_name)
+                unique_columns.append(col)
+            else:
+                logger.debug(
+                    "Skipping duplicate column '%s' in table '%s' (loader bug)",
+                    col_name, table_name
+                )
+
+        data["columns"] = [
+            {
+                "name": col.get("name"),
+                "data_type": col.get("data_type"),
+                "nullable": col.get("nullable", True),
+                "is_primary_key": col.get("is_primary_key", False),
+                "is_foreign_key": col.get("is_foreign_key", False),
+                "default_value": col.get("default_value")
+            }
+            for col in unique_columns
+        ]
+        data["column_count"] = len(unique_columns)
+
+    if include_relationships:
+        data["relationships"] = table_info.get("relationships", {})
+
+    return data
+
 
 class QueryProcedureInput(BaseModel):
     """Input schema for query_procedure tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     procedure_name: str = Field(
         description="Nome da procedure a ser consultada (ex: 'SCHEMA.PROC_NAME' ou apenas 'PROC_NAME')"
     )
@@ -58,22 +182,19 @@ def query_procedure(
         - "Quem chama a procedure CALCULAR_SALDO?"
     """
     if not _knowledge_graph:
-        return json.dumps({
-            "success": False,
-            "error": "Knowledge graph não inicializado. Execute a análise primeiro."
-        })
+        return _ERR_KG_NOT_INIT
 
     try:
         proc_context = _knowledge_graph.get_procedure_context(procedure_name)
 
         # If not in cache, try on-demand analysis
         if not proc_context and _on_demand_analyzer:
-            logger.info(f"Procedure '{procedure_name}' not in cache, attempting on-demand analysis...")
+            logger.info("Procedure '%s' not in cache, attempting on-demand analysis...", procedure_name)
             on_demand_result = _on_demand_analyzer.get_or_analyze_procedure(procedure_name)
 
             if on_demand_result.get("success"):
                 proc_context = on_demand_result.get("data")
-                logger.info(f"Procedure '{procedure_name}' loaded on-demand from {on_demand_result.get('source')}")
+                logger.info("Procedure '%s' loaded on-demand from %s", procedure_name, on_demand_result.get('source'))
             else:
                 return json.dumps({
                     "success": False,
@@ -88,35 +209,13 @@ def query_procedure(
 
         result = {
             "success": True,
-            "data": {
-                "procedure_name": proc_context.get("name"),
-                "schema": proc_context.get("schema"),
-                "full_name": proc_context.get("full_name"),
-                "parameters": proc_context.get("parameters", []),
-                "business_logic": proc_context.get("business_logic", ""),
-                "complexity_score": proc_context.get("complexity_score", 0)
-            }
+            "data": _procedure_data(proc_context, procedure_name, include_dependencies, include_callers)
         }
 
-        if include_dependencies:
-            result["data"]["dependencies"] = {
-                "procedures": proc_context.get("called_procedures", []),
-                "tables": proc_context.get("called_tables", [])
-            }
-            result["data"]["total_dependencies"] = (
-                len(proc_context.get("called_procedures", [])) +
-                len(proc_context.get("called_tables", []))
-            )
-
-        if include_callers:
-            callers = _knowledge_graph.get_callers(proc_context.get("full_name", procedure_name))
-            result["data"]["callers"] = list(callers)
-            result["data"]["caller_count"] = len(callers)
-
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return dumps(result)
 
     except Exception as e:
-        logger.exception(f"Erro ao consultar procedure {procedure_name}")
+        logger.exception("Erro ao consultar procedure %s", procedure_name)
         return json.dumps({
             "success": False,
             "error": f"Erro ao consultar procedure: {str(e)}"
@@ -125,6 +224,8 @@ def query_procedure(
 
 class QueryTableInput(BaseModel):
     """Input schema for query_table tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     table_name: str = Field(
         description="Nome da tabela (ex: 'SCHEMA.TABLE_NAME' ou apenas 'TABLE_NAME')"
     )
@@ -166,22 +267,19 @@ def query_table(
         - "Com quais tabelas a tabela PRODUTOS se relaciona?"
     """
     if not _knowledge_graph:
-        return json.dumps({
-            "success": False,
-            "error": "Knowledge graph não inicializado. Execute a análise primeiro."
-        })
+        return _ERR_KG_NOT_INIT
 
     try:
         table_info = _knowledge_graph.get_table_info(table_name)
 
         # If not in cache, try on-demand analysis
         if not table_info and _on_demand_analyzer:
-            logger.info(f"Table '{table_name}' not in cache, attempting on-demand analysis...")
+            logger.info("Table '%s' not in cache, attempting on-demand analysis...", table_name)
             on_demand_result = _on_demand_analyzer.get_or_analyze_table(table_name)
 
             if on_demand_result.get("success"):
                 table_info = on_demand_result.get("data")
-                logger.info(f"Table '{table_name}' loaded on-demand from {on_demand_result.get('source')}")
+                logger.info("Table '%s' loaded on-demand from %s", table_name, on_demand_result.get('source'))
             else:
                 return json.dumps({
                     "success": False,
@@ -196,59 +294,75 @@ def query_table(
 
         result = {
             "success": True,
-            "data": {
-                "table_name": table_info.get("name"),
-                "schema": table_info.get("schema"),
-                "full_name": table_info.get("full_name"),
-                "business_purpose": table_info.get("business_purpose", ""),
-                "complexity_score": table_info.get("complexity_score", 0),
-                "row_count": table_info.get("row_count")
-            }
+            "data": _table_data(table_info, table_name, include_columns, include_relationships)
         }
 
-        if include_columns:
-            columns = table_info.get("columns", [])
-
-            # WORKAROUND: Remove duplicatas causadas por bug no PostgreSQL loader
-            # TODO: Fix root cause in PostgreSQLTableLoader._load_columns()
-            # Issue: LEFT JOIN on FK constraints returns multiple rows per column
-            # Tracking: FASE 2 do plano de correção
-            seen_columns: Set[str] = set()
-            unique_columns = []
-
-            for col in columns:
-                col_name = col.get("name")
-                if col_name not in seen_columns:
-                    seen_columns.add(col_name)
-                    unique_columns.append(col)
-                else:
-                    logger.debug(
-                        f"Skipping duplicate column '{col_name}' in table "
-                        f"'{table_name}' (loader bug)"
-                    )
-
-            result["data"]["columns"] = [
-                {
-                    "name": col.get("name"),
-                    "data_type": col.get("data_type"),
-                    "nullable": col.get("nullable", True),
-                    "is_primary_key": col.get("is_primary_key", False),
-                    "is_foreign_key": col.get("is_foreign_key", False),
-                    "default_value": col.get("default_value")
-                }
-                for col in unique_columns
-            ]
-            result["data"]["column_count"] = len(unique_columns)
-
-        if include_relationships:
-            result["data"]["relationships"] = table_info.get("relationships", {})
-
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return dumps(result)
 
     except Exception as e:
-        logger.exception(f"Erro ao consultar tabela {table_name}")
+        logger.exception("Erro ao consultar tabela %s", table_name)
         return json.dumps({
             "success": False,
             "error": f"Erro ao consultar tabela: {str(e)}"
         })
 
+
+class QueryEntityInput(BaseModel):
+    """Input schema for query_entity tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
+    name: str = Field(
+        description="Nome da procedure ou tabela (com ou sem schema)"
+    )
+
+
+@tool(args_schema=QueryEntityInput)
+def query_entity(name: str) -> str:
+    """Consulta uma procedure OU tabela pelo nome, sem precisar saber o tipo.
+
+    Use esta tool quando não souber se o nome é de uma procedure ou de uma
+    tabela ("o que é X?"): resolve ambos com uma única busca no knowledge graph,
+    em vez de chamar query_procedure e query_table em sequência.
+
+    Args:
+        name: Nome da procedure ou tabela (com ou sem schema)
+
+    Returns:
+        JSON com "kind" ("procedure" ou "table") e os mesmos dados de
+        query_procedure/query_table com as opções padrão
+
+    Examples:
+        - "O que é PEDIDOS?"
+        - "Explique CALCULAR_SALDO"
+    """
+    if not _knowledge_graph:
+        return _ERR_KG_NOT_INIT
+
+    try:
+        entity = _knowledge_graph.find_entity(name)
+
+        if entity is None:
+            return json.dumps({
+                "success": False,
+                "error": f"'{name}' não encontrado no knowledge graph como procedure ou tabela. "
+                        f"Verifique se o nome está correto ou use query_procedure/query_table."
+            })
+
+        kind, info = entity
+        if kind == "procedure":
+            data = _procedure_data(info, name, include_dependencies=True, include_callers=False)
+        else:
+            data = _table_data(info, name, include_columns=True, include_relationships=True)
+
+        return dumps({
+            "success": True,
+            "kind": kind,
+            "data": data
+        })
+
+    except Exception as e:
+        logger.exception("Erro ao consultar entidade %s", name)
+        return json.dumps({
+            "success": False,
+            "error": f"Erro ao consultar entidade: {str(e)}"
+        })
@@ -6,47 +6,200 @@ Tools for retrieving actual data, not just metadata
 import json
 import logging
 import re
-import signal
-from typing import Optional, List, Dict, Any, Tuple
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache, partial
+from itertools import repeat
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 
+from app.core.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 # Global dependency (set by init_tools)
 _db_config = None
 
+# Connect callable resolved once per _db_config (driver import, args, DSN)
+_connector: Optional[Tuple[Callable[[], Any], Optional[str]]] = None
+_connector_config = None
+
+# Idle connections reused across tool calls (bound to the _db_config that created them)
+_POOL_MAX_IDLE = 4
+_pool: deque = deque()
+_pool_config = None
+_pool_lock = threading.Lock()
+
+# Rows fetched per round-trip (results are capped at 1000 rows)
+_FETCH_ARRAYSIZE = 500
+# PostgreSQL server-side cursor (one at a time per pooled connection)
+_PG_CURSOR_NAME = 'codegraph_stream'
+
+# Recent SELECT results (agents often repeat the same probe within a few turns)
+_RESULT_CACHE_SIZE = 128
+_RESULT_CACHE_TTL = 60.0
+_result_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_result_cache_config = None
+_result_cache_lock = threading.Lock()
+
+# Regexes compiled once at import (validation runs before every query)
+_COMMENT_LINE_RE = re.compile(r'--.*?$', re.MULTILINE)
+_COMMENT_BLOCK_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_LIMIT_RE = re.compile(r'\bLIMIT\s+(\d+)', re.IGNORECASE)
+_TOP_RE = re.compile(r'\bTOP\s+\d+', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+# Quoted literals/identifiers (kept verbatim) or a whitespace run (collapsed)
+_CACHE_KEY_TOKEN_RE = re.compile(
+    r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`(?:[^`]|``)*`|\[[^\]]*\]|\s+"
+)
+
+# Identifier quoting per database (opening, closing character)
+_IDENT_QUOTES = {
+    'postgresql': ('"', '"'),
+    'oracle': ('"', '"'),
+    'mssql': ('[', ']'),
+    'mysql': ('`', '`'),
+}
+# Names the database would accept unquoted (and therefore case-fold)
+_PLAIN_IDENT_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_$#]*$')
+
+# Block dangerous commands (keyword as separate word, not part of another word)
+_DANGEROUS_KEYWORDS = (
+    'DROP', 'DELETE', 'UPDATE', 'INSERT', 'TRUNCATE',
+    'ALTER', 'CREATE', 'EXEC', 'EXECUTE', 'CALL',
+    'GRANT', 'REVOKE', 'COMMIT', 'ROLLBACK'
+)
+_DANGEROUS_RE = re.compile(r'\b(' + '|'.join(_DANGEROUS_KEYWORDS) + r')\b', re.IGNORECASE)
+
+
+# Pre-serialized error payloads (identical on every call)
+_ERR_DB_NOT_CONFIGURED = json.dumps({
+    "success": False,
+    "error": "Configuração de banco de dados não disponível. "
+            "Forneça credenciais de banco para usar esta tool."
+})
+_ERR_TIMEOUT = json.dumps({
+    "success": False,
+    "error": "Query excedeu o timeout de 30 segundos"
+})
+
 
 class TimeoutError(Exception):
     """Timeout exception for query execution"""
     pass
 
 
-def _timeout_handler(signum, frame):
-    """Handler for query timeout"""
-    raise TimeoutError("Query execution timeout")
+def _set_statement_timeout(connection: Any, timeout: int) -> None:
+    """
+    Set the driver/server-side statement timeout (no signals, thread-safe)
+
+    Args:
+        connection: Database connection
+        timeout: Timeout in seconds
+    """
+    db_type = _db_config.db_type.value
+    timeout_ms = timeout * 1000
+
+    if db_type == 'oracle':
+        # python-oracledb: applies to every round-trip on this connection
+        connection.call_timeout = timeout_ms
+    elif db_type == 'mssql':
+        # pyodbc: query timeout in seconds
+        connection.timeout = timeout
+    elif db_type == 'postgresql':
+        with connection.cursor() as temp_cursor:
+            temp_cursor.execute(f"SET statement_timeout = {timeout_ms}")
+    elif db_type == 'mysql':
+        temp_cursor = connection.cursor()
+        try:
+            temp_cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {timeout_ms}")
+        except Exception:
+            # MariaDB and old MySQL versions don't have MAX_EXECUTION_TIME
+            logger.debug("Timeout de sessão MySQL não suportado", exc_info=True)
+        finally:
+            temp_cursor.close()
 
 
-def _get_connection():
+def _raise_if_timeout(exc: Exception) -> None:
     """
-    Create database connection based on DatabaseConfig
+    Map driver-specific timeout errors to TimeoutError
+
+    Args:
+        exc: Exception raised while executing the query
+
+    Raises:
+        TimeoutError: If exc was caused by the statement timeout
+    """
+    message = str(exc)
+    is_timeout = (
+        getattr(exc, 'pgcode', None) == '57014'      # PostgreSQL query_canceled
+        or 'DPI-1067' in message                     # oracledb call timeout exceeded
+        or 'HYT00' in message                        # ODBC timeout expired
+        or (exc.args and exc.args[0] == 3024)        # pymysql ER_QUERY_TIMEOUT
+        or getattr(exc, 'errno', None) == 3024       # mysql-connector ER_QUERY_TIMEOUT
+    )
+    if is_timeout:
+        raise TimeoutError("Query execution timeout") from exc
+
+
+def _is_connection_error(exc: Exception) -> bool:
+    """
+    Tell whether a driver error means the connection itself is unusable
+
+    Args:
+        exc: Exception raised while executing the query
 
     Returns:
-        Database connection object
+        True for dropped/closed connections (server idle timeout, restart)
+    """
+    message = str(exc)
+    return (
+        any(cls.__name__ in ('OperationalError', 'InterfaceError') for cls in type(exc).__mro__)
+        or 'DPY-4011' in message                     # oracledb connection closed
+        or 'ORA-03113' in message                    # end-of-file on communication channel
+        or 'ORA-03114' in message                    # not connected to ORACLE
+        or '08S01' in message                        # ODBC communication link failure
+        or '08003' in message                        # ODBC connection does not exist
+    )
+
+
+def _resolve_oracle_dsn(host_value: str) -> str:
+    """
+    Normalize Oracle 'host[:port][/service]' into an oracledb DSN
+
+    Args:
+        host_value: DatabaseConfig.host for Oracle
+
+    Returns:
+        DSN string 'host:port[/service]' (port defaults to 1521)
+    """
+    host_port, _, service = host_value.partition('/')
+    host, _, port_str = host_port.partition(':')
+    port = int(port_str) if port_str.isdigit() else 1521
+    return f"{host}:{port}/{service}" if service else f"{host}:{port}"
+
+
+def _build_connector() -> Tuple[Callable[[], Any], Optional[str]]:
+    """
+    Resolve driver and connection arguments for the current _db_config
+
+    Runs once per configuration: driver imports and argument/DSN parsing are
+    not repeated on every connection.
+
+    Returns:
+        Tuple of (connect callable, cursor_type/driver)
 
     Raises:
-        ValueError: If db_config is not set or invalid
+        ValueError: If db_config is invalid
         ImportError: If required driver is not installed
     """
-    if not _db_config:
-        raise ValueError("Database configuration not available. Provide database credentials to use query tools.")
-
     db_type = _db_config.db_type
 
     if db_type.value == 'postgresql':
         try:
             import psycopg2
-            from psycopg2.extras import RealDictCursor
         except ImportError:
             raise ImportError("psycopg2 não está instalado. Instale com: pip install psycopg2-binary>=2.9.0")
 
@@ -54,14 +207,15 @@ def _get_connection():
         if not _db_config.database:
             raise ValueError("PostgreSQL requer o nome do banco de dados (database)")
 
-        connection = psycopg2.connect(
+        connect = partial(
+            psycopg2.connect,
             host=_db_config.host,
             port=port,
             database=_db_config.database,
             user=_db_config.user,
             password=_db_config.password
         )
-        return connection, 'RealDictCursor'
+        return connect, 'RealDictCursor'
 
     elif db_type.value == 'oracle':
         try:
@@ -69,33 +223,15 @@ def _get_connection():
         except ImportError:
             raise ImportError("oracledb não está instalado. Instale com: pip install oracledb>=1.4.0")
 
-        # Parse DSN
-        dsn_parts = _db_config.host.split('/')
-        if len(dsn_parts) == 2:
-            host_port = dsn_parts[0]
-            service = dsn_parts[1]
-        else:
-            host_port = _db_config.host
-            service = None
-
-        if ':' in host_port:
-            host, port_str = host_port.split(':')
-            try:
-                port = int(port_str)
-            except ValueError:
-                port = 1521
-        else:
-            host = host_port
-            port = 1521
+        dsn = _resolve_oracle_dsn(_db_config.host)
 
-        dsn = f"{host}:{port}/{service}" if service else f"{host}:{port}"
-
-        connection = oracledb.connect(
+        connect = partial(
+            oracledb.connect,
             user=_db_config.user,
             password=_db_config.password,
             dsn=dsn
         )
-        return connection, None
+        return connect, None
 
     elif db_type.value == 'mssql':
         try:
@@ -116,8 +252,7 @@ def _get_connection():
             f"PWD={_db_config.password}"
         )
 
-        connection = pyodbc.connect(connection_string)
-        return connection, None
+        return partial(pyodbc.connect, connection_string), None
 
     elif db_type.value == 'mysql':
         try:
@@ -139,7 +274,8 @@ def _get_connection():
         port = _db_config.port or 3306
 
         if driver == 'mysql-connector':
-            connection = mysql.connector.connect(
+            connect = partial(
+                mysql.connector.connect,
                 host=_db_config.host,
                 port=port,
                 database=_db_config.database,
@@ -147,7 +283,8 @@ def _get_connection():
                 password=_db_config.password
             )
         else:  # pymysql
-            connection = pymysql.connect(
+            connect = partial(
+                pymysql.connect,
                 host=_db_config.host,
                 port=port,
                 database=_db_config.database,
@@ -155,12 +292,170 @@ def _get_connection():
                 password=_db_config.password,
                 cursorclass=pymysql.cursors.DictCursor
             )
-        return connection, driver
+        return connect, driver
 
     else:
         raise ValueError(f"Tipo de banco não suportado: {db_type.value}")
 
 
+def _get_connection():
+    """
+    Create database connection based on DatabaseConfig
+
+    Returns:
+        Database connection object
+
+    Raises:
+        ValueError: If db_config is not set or invalid
+        ImportError: If required driver is not installed
+    """
+    global _connector, _connector_config
+
+    if not _db_config:
+        raise ValueError("Database configuration not available. Provide database credentials to use query tools.")
+
+    if _connector_config is not _db_config:
+        _connector = _build_connector()
+        _connector_config = _db_config
+
+    connect, cursor_type = _connector
+    return connect(), cursor_type
+
+
+def _close_connections(conn_results: List[Tuple[Any, Optional[str]]]) -> None:
+    """Close connections ignoring errors (they may already be broken)"""
+    for connection, _ in conn_results:
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Erro ao fechar conexão", exc_info=True)
+
+
+def _close_pool() -> None:
+    """Close all idle pooled connections (called when db_config changes)"""
+    with _pool_lock:
+        idle = list(_pool)
+        _pool.clear()
+    _close_connections(idle)
+
+
+def _acquire_connection() -> Tuple[Tuple[Any, Optional[str]], bool]:
+    """
+    Get an idle pooled connection or open a new one
+
+    Returns:
+        Tuple of (same tuple as _get_connection, whether it came from the pool)
+    """
+    global _pool_config
+
+    stale = []
+    with _pool_lock:
+        if _pool_config is not _db_config:
+            # Configuration replaced: connections belong to the old database
+            stale = list(_pool)
+            _pool.clear()
+            _pool_config = _db_config
+        conn_result = _pool.pop() if _pool else None
+
+    _close_connections(stale)
+    if conn_result is not None:
+        return conn_result, True
+    return _get_connection(), False
+
+
+def _release_connection(conn_result: Tuple[Any, Optional[str]], reusable: bool) -> None:
+    """
+    Return connection to the pool, or close it
+
+    Args:
+        conn_result: Tuple returned by _acquire_connection
+        reusable: False after errors (connection state is unknown)
+    """
+    if reusable:
+        try:
+            # End the implicit read transaction before reuse
+            conn_result[0].rollback()
+            with _pool_lock:
+                if _pool_config is _db_config and len(_pool) < _POOL_MAX_IDLE:
+                    _pool.append(conn_result)
+                    return
+        except Exception:
+            logger.debug("Conexão descartada do pool", exc_info=True)
+
+    _close_connections([conn_result])
+
+
+def _clear_result_cache() -> None:
+    """Drop all cached query results (called when db_config changes)"""
+    with _result_cache_lock:
+        _result_cache.clear()
+
+
+def _get_cached_result(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a cached result that is still fresh
+
+    Args:
+        key: Normalized query text
+
+    Returns:
+        Cached result dict or None
+    """
+    global _result_cache_config
+
+    with _result_cache_lock:
+        if _result_cache_config is not _db_config:
+            # Results belong to the old database
+            _result_cache.clear()
+            _result_cache_config = _db_config
+            return None
+
+        entry = _result_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > _RESULT_CACHE_TTL:
+            del _result_cache[key]
+            return None
+        _result_cache.move_to_end(key)
+        return entry[1]
+
+
+def _store_cached_result(key: str, result: Dict[str, Any]) -> None:
+    """
+    Cache a query result, evicting the least recently used entry when full
+
+    Args:
+        key: Normalized query text
+        result: Result dict returned by _execute_safe_query
+    """
+    with _result_cache_lock:
+        if _result_cache_config is not _db_config:
+            return
+        _result_cache[key] = (time.monotonic(), result)
+        _result_cache.move_to_end(key)
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def _result_cache_key(query: str) -> str:
+    """
+    Build the result cache key for a query
+
+    Whitespace runs are collapsed only outside quoted literals and identifiers:
+    'A  B' and 'A B' are different values. Case is kept because literals are
+    case-sensitive.
+
+    Args:
+        query: SQL query (after the LIMIT rewrite)
+
+    Returns:
+        Normalized query text
+    """
+    return _CACHE_KEY_TOKEN_RE.sub(
+        lambda m: ' ' if m.group().isspace() else m.group(), query
+    ).strip()
+
+
 def _validate_select_query(query: str) -> Tuple[bool, Optional[str]]:
     """
     Validate that query is a safe SELECT statement
@@ -171,36 +466,31 @@ def _validate_select_query(query: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    # Remove comments and normalize whitespace
-    query_clean = re.sub(r'--.*?$', '', query, flags=re.MULTILINE)
-    query_clean = re.sub(r'/\*.*?\*/', '', query_clean, flags=re.DOTALL)
-    query_clean = ' '.join(query_clean.split())
+    if ';' in query or '--' in query or '/*' in query:
+        # Remove comments and normalize whitespace
+        query_clean = _COMMENT_LINE_RE.sub('', query)
+        query_clean = _COMMENT_BLOCK_RE.sub('', query_clean)
+        query_clean = _WS_RE.sub(' ', query_clean).strip()
+
+        # Check for multiple statements (semicolon followed by non-comment)
+        parts = query_clean.split(';')
+        if len(parts) > 1:
+            for part in parts[1:]:
+                part_clean = part.strip()
+                if part_clean and not part_clean.startswith('--'):
+                    return False, "Múltiplos comandos não são permitidos"
+    else:
+        # Common case: no comments or separators, skip the cleanup regexes
+        query_clean = query.lstrip()
 
-    # Check if starts with SELECT (case-insensitive)
-    if not re.match(r'^\s*SELECT\s+', query_clean, re.IGNORECASE):
-        return False, "Apenas queries SELECT são permitidas"
+    # Block dangerous commands (single case-insensitive scan, no uppercase copy)
+    dangerous_match = _DANGEROUS_RE.search(query_clean)
+    if dangerous_match:
+        return False, f"Comando '{dangerous_match.group(1).upper()}' não é permitido por segurança"
 
-    # Block dangerous commands
-    dangerous_keywords = [
-        'DROP', 'DELETE', 'UPDATE', 'INSERT', 'TRUNCATE',
-        'ALTER', 'CREATE', 'EXEC', 'EXECUTE', 'CALL',
-        'GRANT', 'REVOKE', 'COMMIT', 'ROLLBACK'
-    ]
-
-    query_upper = query_clean.upper()
-    for keyword in dangerous_keywords:
-        # Check for keyword as separate word (not part of another word)
-        pattern = r'\b' + keyword + r'\b'
-        if re.search(pattern, query_upper):
-            return False, f"Comando '{keyword}' não é permitido por segurança"
-
-    # Check for multiple statements (semicolon followed by non-comment)
-    parts = query_clean.split(';')
-    if len(parts) > 1:
-        for part in parts[1:]:
-            part_clean = part.strip()
-            if part_clean and not part_clean.startswith('--'):
-                return False, "Múltiplos comandos não são permitidos"
+    # Check if starts with SELECT followed by whitespace
+    if query_clean[:6].upper() != 'SELECT' or not query_clean[6:7].isspace():
+        return False, "Apenas queries SELECT são permitidas"
 
     return True, None
 
@@ -216,21 +506,18 @@ def _add_limit_if_needed(query: str, max_limit: int = 1000) -> str:
     Returns:
         Query with LIMIT clause
     """
-    query_upper = query.upper()
-
     # Check if LIMIT already exists
-    if re.search(r'\bLIMIT\s+\d+', query_upper):
-        # Extract existing limit and ensure it's within max
-        limit_match = re.search(r'\bLIMIT\s+(\d+)', query_upper)
-        if limit_match:
-            existing_limit = int(limit_match.group(1))
-            if existing_limit > max_limit:
-                # Replace with max_limit
-                query = re.sub(r'\bLIMIT\s+\d+', f'LIMIT {max_limit}', query, flags=re.IGNORECASE)
+    limit_match = _LIMIT_RE.search(query)
+    if limit_match:
+        # Ensure existing limit is within max
+        existing_limit = int(limit_match.group(1))
+        if existing_limit > max_limit:
+            # Replace with max_limit
+            query = _LIMIT_RE.sub(f'LIMIT {max_limit}', query)
         return query
 
     # Check if TOP exists (SQL Server)
-    if re.search(r'\bTOP\s+\d+', query_upper):
+    if _TOP_RE.search(query):
         return query
 
     # Add LIMIT at the end
@@ -241,105 +528,189 @@ def _add_limit_if_needed(query: str, max_limit: int = 1000) -> str:
     return query
 
 
-def _execute_safe_query(query: str, timeout: int = 30) -> Dict[str, Any]:
+def _quote_ident(name: str, db_type: str) -> str:
     """
-    Execute a safe SELECT query with timeout
+    Quote a (possibly schema-qualified) identifier for the given database
+
+    Unquoted names are folded the way the database itself would (lowercase in
+    PostgreSQL, uppercase in Oracle) before quoting, so 'Users' and 'users'
+    produce the same SQL text and still resolve to the same object.
+    Parts wrapped in quotes keep their case; the closing quote character is
+    always escaped inside every part, so a name can never leave its identifier.
+
+    Args:
+        name: Identifier, e.g. 'users' or 'public.users'
+        db_type: Database type value
+
+    Returns:
+        Quoted identifier, e.g. '"public"."users"'
+    """
+    open_q, close_q = _IDENT_QUOTES[db_type]
+    quoted_parts = []
+    for part in name.strip().split('.'):
+        part = part.strip()
+        if len(part) > 1 and part[0] == open_q and part[-1] == close_q:
+            # Caller-quoted part: unwrap and escape like any other name
+            part = part[1:-1]
+        elif _PLAIN_IDENT_RE.match(part):
+            if db_type == 'postgresql':
+                part = part.lower()
+            elif db_type == 'oracle':
+                part = part.upper()
+        quoted_parts.append(open_q + part.replace(close_q, close_q * 2) + close_q)
+    return '.'.join(quoted_parts)
+
+
+def _fetch_rows(cursor: Any, query: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Execute query and stream results in batches into a list of dicts
 
     Args:
+        cursor: DB-API cursor (tuple or dictionary rows)
         query: SQL SELECT query
-        timeout: Timeout in seconds (default: 30)
 
     Returns:
-        Dict with columns and rows
+        Tuple of (columns, rows)
+    """
+    # Larger batches mean fewer network round-trips (oracledb defaults to 100)
+    cursor.arraysize = _FETCH_ARRAYSIZE
+    cursor.execute(query)
+
+    columns: Optional[List[str]] = None
+    rows: List[Dict[str, Any]] = []
+    while True:
+        batch = cursor.fetchmany(_FETCH_ARRAYSIZE)
+        if columns is None:
+            # Server-side cursors only have a description after the first fetch
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        if not batch:
+            break
+        if isinstance(batch[0], dict):
+            # Dictionary cursor (RealDictCursor, mysql-connector, pymysql)
+            rows.extend(batch)
+        else:
+            # Keep native values (serialized once by dumps with default=str);
+            # map/zip/dict all run in C, no Python frame per row
+            rows.extend(map(dict, map(zip, repeat(columns), batch)))
+
+    return columns, rows
+
+
+def _run_query(
+    conn_result: Tuple[Any, Optional[str]],
+    query: str,
+    timeout: int
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Execute a validated query on a connection
+
+    Args:
+        conn_result: Tuple returned by _get_connection
+        query: SQL query (already validated and limited)
+        timeout: Timeout in seconds
+
+    Returns:
+        Tuple of (column names, rows as dicts)
 
     Raises:
-        ValueError: If query is invalid
         TimeoutError: If query times out
         Exception: For other database errors
     """
-    # Validate query
-    is_valid, error_msg = _validate_select_query(query)
-    if not is_valid:
-        raise ValueError(error_msg)
-
-    # Add limit if needed
-    query = _add_limit_if_needed(query, max_limit=1000)
-
-    # Get connection
-    conn_result = _get_connection()
     connection = conn_result[0]
     cursor_type = conn_result[1] if len(conn_result) > 1 else None
     driver = conn_result[1] if len(conn_result) > 1 and isinstance(conn_result[1], str) else None
+    cursor = None
 
     try:
-        # Set timeout (if supported)
-        if hasattr(connection, 'set_session'):
-            # PostgreSQL
-            with connection.cursor() as temp_cursor:
-                temp_cursor.execute(f"SET statement_timeout = {timeout * 1000}")  # milliseconds
+        # Set timeout (native to each driver)
+        _set_statement_timeout(connection, timeout)
 
         # Create cursor
         if cursor_type == 'RealDictCursor':
             from psycopg2.extras import RealDictCursor
-            cursor = connection.cursor(cursor_factory=RealDictCursor)
+            # Named cursor = server-side portal: rows arrive in fetchmany batches
+            # instead of the whole result being buffered by the client first
+            cursor = connection.cursor(name=_PG_CURSOR_NAME, cursor_factory=RealDictCursor)
         elif driver == 'mysql-connector':
             cursor = connection.cursor(dictionary=True)
         else:
             cursor = connection.cursor()
 
-        # Execute query with timeout using signal (Unix only)
         try:
-            # Set signal alarm for timeout (Unix)
-            signal.signal(signal.SIGALRM, _timeout_handler)
-            signal.alarm(timeout)
-
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-            # Cancel alarm
-            signal.alarm(0)
-        except (AttributeError, OSError):
-            # Windows doesn't support SIGALRM, just execute without signal timeout
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-        # Get column names
-        if cursor_type == 'RealDictCursor' or driver == 'mysql-connector' or driver == 'pymysql':
-            # Dictionary cursor
-            if rows:
-                columns = list(rows[0].keys())
-            else:
-                # No rows, get columns from cursor description
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
-        else:
-            # Regular cursor - get from description
-            if cursor.description:
-                columns = [desc[0] for desc in cursor.description]
-            else:
-                columns = []
-
-        # Convert rows to list of dicts
-        result_rows = []
-        for row in rows:
-            if isinstance(row, dict):
-                result_rows.append({k: str(v) if v is not None else None for k, v in row.items()})
-            else:
-                # Convert tuple to dict
-                row_dict = {}
-                for i, col in enumerate(columns):
-                    value = row[i] if i < len(row) else None
-                    row_dict[col] = str(value) if value is not None else None
-                result_rows.append(row_dict)
-
-        return {
-            "columns": columns,
-            "rows": result_rows,
-            "row_count": len(result_rows)
-        }
+            return _fetch_rows(cursor, query)
+        except Exception as e:
+            _raise_if_timeout(e)
+            raise
 
     finally:
-        cursor.close()
-        connection.close()
+        if cursor is not None:
+            cursor.close()
+
+
+def _execute_safe_query(
+    query: str,
+    timeout: int = 30,
+    use_cache: bool = True,
+    skip_limit: bool = False
+) -> Dict[str, Any]:
+    """
+    Execute a safe SELECT query with timeout
+
+    Args:
+        query: SQL SELECT query
+        timeout: Timeout in seconds (default: 30)
+        use_cache: Reuse a result cached in the last minute (default: True)
+        skip_limit: Caller already applied a LIMIT within the 1000-row cap
+
+    Returns:
+        Dict with columns and rows
+
+    Raises:
+        ValueError: If query is invalid
+        TimeoutError: If query times out
+        Exception: For other database errors
+    """
+    # Validate query
+    is_valid, error_msg = _validate_select_query(query)
+    if not is_valid:
+        raise ValueError(error_msg)
+
+    # Add limit if needed
+    if not skip_limit:
+        query = _add_limit_if_needed(query, max_limit=1000)
+
+    cache_key = _result_cache_key(query)
+    if use_cache:
+        cached = _get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+    # Get connection (reused from pool when available)
+    conn_result, pooled = _acquire_connection()
+    while True:
+        reusable = False
+        try:
+            columns, rows = _run_query(conn_result, query, timeout)
+            reusable = True
+            break
+        except Exception as e:
+            if not (pooled and _is_connection_error(e)):
+                raise
+            # Idle connection dropped by the server (idle timeout, restart): the
+            # other idle ones are most likely dead too, so retry once on a fresh one
+            logger.debug("Conexão do pool inválida, reconectando: %s", e)
+            _close_pool()
+        finally:
+            _release_connection(conn_result, reusable)
+        conn_result, pooled = _get_connection(), False
+
+    result = {
+        "columns": columns,
+        "rows": rows,
+        "row_count": len(rows)
+    }
+    _store_cached_result(cache_key, result)
+    return result
 
 
 class ExecuteQueryInput(BaseModel):
@@ -351,10 +722,14 @@ class ExecuteQueryInput(BaseModel):
         default=100,
         description="Limite máximo de linhas (padrão: 100, máximo: 1000). Será aplicado automaticamente se não especificado na query."
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Reutilizar resultado da mesma query executada no último minuto (padrão: True). Use False para forçar dados atualizados."
+    )
 
 
 @tool(args_schema=ExecuteQueryInput)
-def execute_query(query: str, limit: Optional[int] = 100) -> str:
+def execute_query(query: str, limit: Optional[int] = 100, use_cache: bool = True) -> str:
     """Executa uma query SELECT segura no banco de dados.
 
     Use esta tool quando precisar:
@@ -366,11 +741,13 @@ def execute_query(query: str, limit: Optional[int] = 100) -> str:
     - Apenas queries SELECT são permitidas
     - LIMIT é aplicado automaticamente (máximo 1000 linhas)
     - Timeout de 30 segundos
+    - Mesma query repetida em até 60 segundos usa resultado em cache (use_cache=False força nova execução)
     - Comandos perigosos (DROP, DELETE, UPDATE, etc.) são bloqueados
 
     Args:
         query: Query SQL SELECT
         limit: Limite de linhas (padrão: 100, máximo: 1000)
+        use_cache: Reutilizar resultado recente da mesma query (padrão: True)
 
     Returns:
         JSON com colunas e dados retornados
@@ -382,11 +759,7 @@ def execute_query(query: str, limit: Optional[int] = 100) -> str:
     """
     try:
         if not _db_config:
-            return json.dumps({
-                "success": False,
-                "error": "Configuração de banco de dados não disponível. "
-                        "Forneça credenciais de banco para usar esta tool."
-            })
+            return _ERR_DB_NOT_CONFIGURED
 
         # Validate and adjust limit
         if limit and limit > 1000:
@@ -394,16 +767,16 @@ def execute_query(query: str, limit: Optional[int] = 100) -> str:
         elif not limit:
             limit = 100
 
-        # Add limit to query if not present
+        # Add limit to query if not present (single pass: limit is already capped at 1000)
         query_with_limit = _add_limit_if_needed(query, max_limit=limit)
 
         # Execute query
-        result = _execute_safe_query(query_with_limit, timeout=30)
+        result = _execute_safe_query(query_with_limit, timeout=30, use_cache=use_cache, skip_limit=True)
 
-        return json.dumps({
+        return dumps({
             "success": True,
             "data": result
-        }, indent=2)
+        }, default=str)
 
     except ValueError as e:
         return json.dumps({
@@ -411,10 +784,7 @@ def execute_query(query: str, limit: Optional[int] = 100) -> str:
             "error": str(e)
         })
     except TimeoutError:
-        return json.dumps({
-            "success": False,
-            "error": "Query excedeu o timeout de 30 segundos"
-        })
+        return _ERR_TIMEOUT
     except ImportError as e:
         return json.dumps({
             "success": False,
@@ -471,11 +841,7 @@ def sample_table_data(
     """
     try:
         if not _db_config:
-            return json.dumps({
-                "success": False,
-                "error": "Configuração de banco de dados não disponível. "
-                        "Forneça credenciais de banco para usar esta tool."
-            })
+            return _ERR_DB_NOT_CONFIGURED
 
         # Validate and adjust limit
         if limit and limit > 100:
@@ -483,21 +849,23 @@ def sample_table_data(
         elif not limit:
             limit = 10
 
-        # Build query
+        # Build query (quoted identifiers: injection-safe, one canonical SQL text)
+        db_type = _db_config.db_type.value
+        table_sql = _quote_ident(table_name, db_type)
         if columns:
-            cols_str = ', '.join(columns)
-            query = f"SELECT {cols_str} FROM {table_name} LIMIT {limit}"
+            cols_str = ', '.join(_quote_ident(col, db_type) for col in columns)
+            query = f"SELECT {cols_str} FROM {table_sql} LIMIT {limit}"
         else:
-            query = f"SELECT * FROM {table_name} LIMIT {limit}"
+            query = f"SELECT * FROM {table_sql} LIMIT {limit}"
 
-        # Execute query
-        result = _execute_safe_query(query, timeout=30)
+        # Execute query (LIMIT already capped at 100)
+        result = _execute_safe_query(query, timeout=30, skip_limit=True)
 
-        return json.dumps({
+        return dumps({
             "success": True,
             "data": result,
             "table_name": table_name
-        }, indent=2)
+        }, default=str)
 
     except ValueError as e:
         return json.dumps({
@@ -505,10 +873,7 @@ def sample_table_data(
             "error": str(e)
         })
     except TimeoutError:
-        return json.dumps({
-            "success": False,
-            "error": "Query excedeu o timeout de 30 segundos"
-        })
+        return _ERR_TIMEOUT
     except ImportError as e:
         return json.dumps({
             "success": False,
@@ -522,6 +887,135 @@ def sample_table_data(
         })
 
 
+def _stats_select_list(db_type: str, field_name: str, prefix: str = '', values: bool = True) -> str:
+    """
+    Build the per-field aggregate columns (non-null, null, distinct, min/max/avg)
+
+    Args:
+        db_type: Database type value (key of _IDENT_QUOTES)
+        field_name: Field name
+        prefix: Alias prefix (distinguishes fields in a batch query)
+        values: Include min/max/avg (False for the counts-only fallback)
+
+    Returns:
+        Comma-separated SELECT list fragment
+    """
+    field = _quote_ident(field_name, db_type)
+    select_list = (
+        f"COUNT({field}) as {prefix}non_null_count, "
+        f"COUNT(*) - COUNT({field}) as {prefix}null_count, "
+        f"COUNT(DISTINCT {field}) as {prefix}distinct_count"
+    )
+    if not values:
+        return select_list
+    return (
+        f"{select_list}, "
+        f"MIN({field}) as {prefix}min_value, "
+        f"MAX({field}) as {prefix}max_value, "
+        f"AVG({field}) as {prefix}avg_value"
+    )
+
+
+@lru_cache(maxsize=256)
+def _field_statistics_query(db_type: str, table_name: str, field_name: str, values: bool = True) -> str:
+    """
+    Build the statistics query (counts + min/max/avg) for a field
+
+    Identifiers cannot be bound as parameters, so the text is memoized instead:
+    repeated calls send byte-identical SQL, which lets the server plan cache and
+    the driver statement cache (oracledb/pyodbc, on pooled connections) reuse it.
+
+    Args:
+        db_type: Database type value (key of _IDENT_QUOTES)
+        table_name: Table name (with or without schema)
+        field_name: Field name
+        values: Include min/max/avg (False for the counts-only fallback)
+
+    Returns:
+        SQL SELECT returning a single row
+    """
+    return (
+        f"SELECT COUNT(*) as total_count, "
+        f"{_stats_select_list(db_type, field_name, values=values)} "
+        f"FROM {_quote_ident(table_name, db_type)}"
+    )
+
+
+@lru_cache(maxsize=256)
+def _fields_statistics_query(
+    db_type: str,
+    table_name: str,
+    field_names: Tuple[str, ...],
+    values: bool = True
+) -> str:
+    """
+    Build one statistics query for several fields of the same table (single scan)
+
+    Args:
+        db_type: Database type value (key of _IDENT_QUOTES)
+        table_name: Table name (with or without schema)
+        field_names: Field names (aliases are prefixed with f0_, f1_, ...)
+        values: Include min/max/avg (False for the counts-only fallback)
+
+    Returns:
+        SQL SELECT returning a single row
+    """
+    select_list = ', '.join(
+        _stats_select_list(db_type, field_name, f"f{i}_", values)
+        for i, field_name in enumerate(field_names)
+    )
+    return (
+        f"SELECT COUNT(*) as total_count, {select_list} "
+        f"FROM {_quote_ident(table_name, db_type)}"
+    )
+
+
+def _execute_statistics_query(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Run a statistics query, returning None when the database rejects it
+
+    MIN/MAX/AVG are not defined for every column type (AVG over text, MIN/MAX
+    over boolean/jsonb in PostgreSQL or bit in SQL Server); callers then fall
+    back to the counts-only query.
+    Validation errors, timeouts and missing drivers still propagate.
+
+    Args:
+        query: Statistics SQL built by _field(s)_statistics_query
+
+    Returns:
+        Query result, or None if the database raised an error
+    """
+    try:
+        return _execute_safe_query(query, timeout=30, skip_limit=True)
+    except (ValueError, TimeoutError, ImportError):
+        raise
+    except Exception as e:
+        logger.debug("Estatísticas com min/max/avg falharam, usando apenas contagens: %s", e)
+        return None
+
+
+def _parse_field_stats(stats_row: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """
+    Extract one field's statistics from an aggregate result row
+
+    Args:
+        stats_row: Row returned by the statistics query
+        prefix: Alias prefix used when building the query
+
+    Returns:
+        Dict with counts and min/max/avg values
+    """
+    return {
+        "total_count": int(stats_row.get("total_count", 0)),
+        "non_null_count": int(stats_row.get(f"{prefix}non_null_count", 0)),
+        "null_count": int(stats_row.get(f"{prefix}null_count", 0)),
+        "distinct_count": int(stats_row.get(f"{prefix}distinct_count", 0)),
+        "min_value": stats_row.get(f"{prefix}min_value"),
+        "max_value": stats_row.get(f"{prefix}max_value"),
+        "avg_value": stats_row.get(f"{prefix}avg_value")
+    }
+
+
 class GetFieldStatisticsInput(BaseModel):
     """Input schema for get_field_statistics tool"""
     table_name: str = Field(
@@ -556,101 +1050,39 @@ def get_field_statistics(table_name: str, field_name: str) -> str:
     """
     try:
         if not _db_config:
-            return json.dumps({
-                "success": False,
-                "error": "Configuração de banco de dados não disponível. "
-                        "Forneça credenciais de banco para usar esta tool."
-            })
+            return _ERR_DB_NOT_CONFIGURED
 
         db_type = _db_config.db_type.value
-
-        # Build statistics query based on database type
-        if db_type == 'postgresql':
-            query = f"""
-                SELECT
-                    COUNT(*) as total_count,
-                    COUNT({field_name}) as non_null_count,
-                    COUNT(*) - COUNT({field_name}) as null_count,
-                    COUNT(DISTINCT {field_name}) as distinct_count
-                FROM {table_name}
-            """
-        elif db_type == 'oracle':
-            query = f"""
-                SELECT
-                    COUNT(*) as total_count,
-                    COUNT({field_name}) as non_null_count,
-                    COUNT(*) - COUNT({field_name}) as null_count,
-                    COUNT(DISTINCT {field_name}) as distinct_count
-                FROM {table_name}
-            """
-        elif db_type == 'mssql':
-            query = f"""
-                SELECT
-                    COUNT(*) as total_count,
-                    COUNT({field_name}) as non_null_count,
-                    COUNT(*) - COUNT({field_name}) as null_count,
-                    COUNT(DISTINCT {field_name}) as distinct_count
-                FROM {table_name}
-            """
-        elif db_type == 'mysql':
-            query = f"""
-                SELECT
-                    COUNT(*) as total_count,
-                    COUNT({field_name}) as non_null_count,
-                    COUNT(*) - COUNT({field_name}) as null_count,
-                    COUNT(DISTINCT {field_name}) as distinct_count
-                FROM {table_name}
-            """
-        else:
+        if db_type not in _IDENT_QUOTES:
             return json.dumps({
                 "success": False,
                 "error": f"Tipo de banco não suportado: {db_type}"
             })
 
-        # Execute basic statistics
-        basic_stats = _execute_safe_query(query, timeout=30)
+        # Counts and min/max/avg in a single round-trip (aggregate: one row, no LIMIT);
+        # column types without MIN/MAX still get their counts
+        query = _field_statistics_query(db_type, table_name, field_name)
+        stats = _execute_statistics_query(query)
+        if stats is None:
+            counts_query = _field_statistics_query(db_type, table_name, field_name, values=False)
+            stats = _execute_safe_query(counts_query, timeout=30, skip_limit=True)
 
-        if not basic_stats.get("rows"):
+        if not stats.get("rows"):
             return json.dumps({
                 "success": False,
                 "error": "Não foi possível obter estatísticas básicas"
             })
 
-        stats_row = basic_stats["rows"][0]
         result = {
             "table_name": table_name,
             "field_name": field_name,
-            "total_count": int(stats_row.get("total_count", 0)),
-            "non_null_count": int(stats_row.get("non_null_count", 0)),
-            "null_count": int(stats_row.get("null_count", 0)),
-            "distinct_count": int(stats_row.get("distinct_count", 0))
+            **_parse_field_stats(stats["rows"][0])
         }
 
-        # Try to get min, max, avg for numeric fields
-        try:
-            numeric_query = f"""
-                SELECT
-                    MIN({field_name}) as min_value,
-                    MAX({field_name}) as max_value,
-                    AVG(CAST({field_name} AS DECIMAL)) as avg_value
-                FROM {table_name}
-                WHERE {field_name} IS NOT NULL
-            """
-
-            numeric_stats = _execute_safe_query(numeric_query, timeout=30)
-            if numeric_stats.get("rows"):
-                numeric_row = numeric_stats["rows"][0]
-                result["min_value"] = numeric_row.get("min_value")
-                result["max_value"] = numeric_row.get("max_value")
-                result["avg_value"] = numeric_row.get("avg_value")
-        except Exception:
-            # Field might not be numeric, ignore
-            pass
-
-        return json.dumps({
+        return dumps({
             "success": True,
             "data": result
-        }, indent=2)
+        }, default=str)
 
     except ValueError as e:
         return json.dumps({
@@ -658,10 +1090,117 @@ def get_field_statistics(table_name: str, field_name: str) -> str:
             "error": str(e)
         })
     except TimeoutError:
+        return _ERR_TIMEOUT
+    except ImportError as e:
+        return json.dumps({
+            "success": False,
+            "error": f"Driver de banco não instalado: {str(e)}"
+        })
+    except Exception as e:
+        logger.exception(f"Erro ao obter estatísticas: {e}")
+        return json.dumps({
+            "success": False,
+            "error": f"Erro ao obter estatísticas: {str(e)}"
+        })
+
+
+class GetFieldsStatisticsInput(BaseModel):
+    """Input schema for get_fields_statistics tool"""
+    table_name: str = Field(
+        description="Nome da tabela (com ou sem schema)"
+    )
+    field_names: List[str] = Field(
+        min_length=1,
+        max_length=20,
+        description="Lista de campos/colunas da mesma tabela para análise estatística (máximo: 20)"
+    )
+
+
+@tool(args_schema=GetFieldsStatisticsInput)
+def get_fields_statistics(table_name: str, field_names: List[str]) -> str:
+    """Retorna estatísticas de vários campos de uma mesma tabela em uma única consulta.
+
+    Use esta tool quando precisar:
+    - Estatísticas de 2 ou mais campos da mesma tabela
+    - Comparar nulos, distintos, mínimo, máximo e média entre colunas
+
+    Mais eficiente que chamar get_field_statistics para cada campo: a tabela
+    é percorrida uma única vez.
+
+    Args:
+        table_name: Nome da tabela
+        field_names: Lista de campos
+
+    Returns:
+        JSON com estatísticas por campo
+
+    Examples:
+        - "Estatísticas dos campos price, quantity e discount na tabela orders"
+        - "Quantos nulos têm os campos email e phone na tabela users?"
+    """
+    try:
+        if not _db_config:
+            return _ERR_DB_NOT_CONFIGURED
+
+        db_type = _db_config.db_type.value
+        if db_type not in _IDENT_QUOTES:
+            return json.dumps({
+                "success": False,
+                "error": f"Tipo de banco não suportado: {db_type}"
+            })
+
+        # Duplicates would only add columns to the scan
+        unique_fields = tuple(dict.fromkeys(field_names))
+
+        # One table scan for all fields (aggregate: one row, no LIMIT)
+        query = _fields_statistics_query(db_type, table_name, unique_fields)
+        stats = _execute_statistics_query(query)
+        per_field_values = stats is None
+        if per_field_values:
+            # A column type without MIN/MAX failed the batch: counts for every
+            # field in one scan, then min/max/avg per field where supported
+            counts_query = _fields_statistics_query(db_type, table_name, unique_fields, values=False)
+            stats = _execute_safe_query(counts_query, timeout=30, skip_limit=True)
+
+        if not stats.get("rows"):
+            return json.dumps({
+                "success": False,
+                "error": "Não foi possível obter estatísticas básicas"
+            })
+
+        stats_row = stats["rows"][0]
+        fields = {
+            field_name: _parse_field_stats(stats_row, f"f{i}_")
+            for i, field_name in enumerate(unique_fields)
+        }
+
+        if per_field_values:
+            for field_name, field_stats in fields.items():
+                field_result = _execute_statistics_query(
+                    _field_statistics_query(db_type, table_name, field_name)
+                )
+                if field_result and field_result.get("rows"):
+                    values_row = field_result["rows"][0]
+                    field_stats["min_value"] = values_row.get("min_value")
+                    field_stats["max_value"] = values_row.get("max_value")
+                    field_stats["avg_value"] = values_row.get("avg_value")
+
+        return dumps({
+            "success": True,
+            "data": {
+                "table_name": table_name,
+                "total_count": int(stats_row.get("total_count", 0)),
+                "fields": fields
+            }
+        }, default=str)
+
+    except ValueError as e:
         return json.dumps({
             "success": False,
-            "error": "Query excedeu o timeout de 30 segundos"
+            "error": str(e)
         })
+    except TimeoutError:
+        return _ERR_TIMEOUT
     except ImportError as e:
         return json.dumps({
             "success": False,
@@ -673,4 +1212,3 @@ def get_field_statistics(table_name: str, field_name: str) -> str:
             "success": False,
             "error": f"Erro ao obter estatísticas: {str(e)}"
         })
-
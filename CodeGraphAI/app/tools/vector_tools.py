@@ -5,18 +5,157 @@ Tools for semantic search in the knowledge graph using vector embeddings
 
 import json
 import logging
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_core.tools import tool
 
+from app.core.serialization import dumps
+
 logger = logging.getLogger(__name__)
 
 # Global dependency (set by init_tools)
 _vector_kg = None
 
+# Pre-serialized guard clause error (payload never changes)
+_ERR_VECTOR_KG_UNAVAILABLE = json.dumps({
+    "success": False,
+    "error": "Vector knowledge graph não está disponível. "
+            "Verifique se a busca semântica está habilitada."
+})
+
+# Semantic result cache: paraphrased queries (cosine >= tau) reuse the
+# formatted results of a previous search instead of running it again.
+# Tau/TTL are overridden by init_tools from CODEGRAPHAI_SEM_CACHE_TAU/_TTL
+_SEMANTIC_CACHE_SIZE = 256
+_semantic_cache_tau = 0.97
+_semantic_cache_ttl = 7 * 24 * 3600.0
+# Entries: (cache key, normalized query embedding, timestamp, formatted results)
+_semantic_cache: "deque[Tuple[str, np.ndarray, float, List[Any]]]" = deque(
+    maxlen=_SEMANTIC_CACHE_SIZE
+)
+_semantic_cache_owner = None
+_semantic_cache_lock = threading.Lock()
+
+# slots on dataclasses requires Python 3.10+; older versions keep __dict__
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class TableHit:
+    """Table found by semantic_search_tables (serialized field by field)"""
+    table_name: str
+    schema: str
+    full_name: str
+    similarity: float
+    business_purpose: str
+    columns_count: int
+    complexity_score: int
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class ProcedureHit:
+    """Procedure found by semantic_search_procedures (serialized field by field)"""
+    procedure_name: str
+    schema: str
+    full_name: str
+    similarity: float
+    business_logic: str
+    parameters_count: int
+    complexity_score: int
+
+
+def _clear_semantic_cache() -> None:
+    """Drop all cached search results (called when vector_kg changes)"""
+    with _semantic_cache_lock:
+        _semantic_cache.clear()
+
+
+def _query_embedding(query: str) -> Optional[np.ndarray]:
+    """
+    Get the L2-normalized embedding of a query
+
+    Args:
+        query: Natural language query
+
+    Returns:
+        Unit-length embedding, or None if it cannot be normalized
+    """
+    embedding = _vector_kg.encode_query(query)
+    norm = np.linalg.norm(embedding)
+    if not norm:
+        return None
+    return embedding / norm
+
+
+def _get_semantic_cached(key: str, embedding: Optional[np.ndarray]) -> Optional[List[Any]]:
+    """
+    Get cached results of the most similar previous query
+
+    Args:
+        key: Tool name and search parameters
+        embedding: Normalized query embedding
+
+    Returns:
+        Cached formatted results or None
+    """
+    global _semantic_cache_owner
+
+    if embedding is None or _semantic_cache_ttl <= 0:
+        return None
+
+    with _semantic_cache_lock:
+        if _semantic_cache_owner is not _vector_kg:
+            # Results belong to the old vector graph
+            _semantic_cache.clear()
+            _semantic_cache_owner = _vector_kg
+            return None
+
+        now = time.monotonic()
+        best_similarity = _semantic_cache_tau
+        best_results = None
+        for entry_key, entry_embedding, created, results in _semantic_cache:
+            if entry_key != key or now - created > _semantic_cache_ttl:
+                continue
+            similarity = float(np.dot(entry_embedding, embedding))
+            if similarity >= best_similarity:
+                best_similarity = similarity
+                best_results = results
+        return best_results
+
+
+def _store_semantic_cached(
+    key: str,
+    embedding: Optional[np.ndarray],
+    results: List[Any]
+) -> None:
+    """
+    Cache formatted results, evicting the oldest entry when full
+
+    Args:
+        key: Tool name and search parameters
+        embedding: Normalized query embedding
+        results: Formatted results returned by the tool
+    """
+    if embedding is None or _semantic_cache_ttl <= 0:
+        return
+
+    with _semantic_cache_lock:
+        if _semantic_cache_owner is not _vector_kg:
+            return
+        _semantic_cache.append((key, embedding, time.monotonic(), results))
+
 
 class SemanticSearchInput(BaseModel):
     """Input schema for semantic_search_tables tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     query: str = Field(
         description="Query em linguagem natural para buscar tabelas semanticamente relacionadas"
     )
@@ -32,6 +171,8 @@ class SemanticSearchInput(BaseModel):
 
 class SemanticSearchProceduresInput(BaseModel):
     """Input schema for semantic_search_procedures tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     query: str = Field(
         description="Query em linguagem natural para buscar procedures semanticamente relacionadas"
     )
@@ -47,6 +188,8 @@ class SemanticSearchProceduresInput(BaseModel):
 
 class HybridSearchInput(BaseModel):
     """Input schema for hybrid_search tool"""
+    model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
     query: str = Field(
         description="Query em linguagem natural para busca híbrida (vetorial + estrutural)"
     )
@@ -91,52 +234,49 @@ def semantic_search_tables(
     """
     try:
         if not _vector_kg:
-            return json.dumps({
-                "success": False,
-                "error": "Vector knowledge graph não está disponível. "
-                        "Verifique se a busca semântica está habilitada."
-            })
-
-        # Validar top_k
-        if top_k and top_k > 20:
-            top_k = 20
-        elif not top_k:
-            top_k = 5
-
-        # Validar threshold
-        if similarity_threshold is None:
-            similarity_threshold = 0.0
-        elif similarity_threshold < 0.0 or similarity_threshold > 1.0:
-            similarity_threshold = 0.0
-
-        # Buscar tabelas
-        results = _vector_kg.semantic_search(
-            query=query,
-            top_k=top_k,
-            node_type="table",
-            similarity_threshold=similarity_threshold
-        )
-
-        # Formatar resultados
-        formatted_results = []
-        for result in results:
-            context = result.context
-            formatted_results.append({
-                "table_name": context.get("name", result.node_id),
-                "schema": context.get("schema", ""),
-                "full_name": result.node_id,
-                "similarity": round(result.similarity, 4),
-                "business_purpose": context.get("business_purpose", ""),
-                "columns_count": len(context.get("columns", [])),
-                "complexity_score": context.get("complexity_score", 0)
-            })
-
-        return json.dumps({
+            return _ERR_VECTOR_KG_UNAVAILABLE
+
+        # Validar top_k (1 a 20, padrão 5)
+        top_k = min(max(top_k or 5, 1), 20)
+
+        # Validar threshold (limitado a 0.0-1.0)
+        similarity_threshold = 0.0 if similarity_threshold is None else min(max(similarity_threshold, 0.0), 1.0)
+
+        # Reutilizar resultado de query equivalente (paráfrase)
+        cache_key = f"tables:{top_k}:{similarity_threshold}"
+        query_embedding = _query_embedding(query)
+        formatted_results = _get_semantic_cached(cache_key, query_embedding)
+
+        if formatted_results is None:
+            # Buscar tabelas
+            results = _vector_kg.semantic_search(
+                query=query,
+                top_k=top_k,
+                node_type="table",
+                similarity_threshold=similarity_threshold
+            )
+
+            # Formatar resultados
+            formatted_results = []
+            for result in results:
+                context = result.context
+                formatted_results.append(TableHit(
+                    table_name=context.get("name", result.node_id),
+                    schema=context.get("schema", ""),
+                    full_name=result.node_id,
+                    similarity=round(result.similarity, 4),
+                    business_purpose=context.get("business_purpose", ""),
+                    columns_count=len(context.get("columns", [])),
+                    complexity_score=context.get("complexity_score", 0)
+                ))
+            _store_semantic_cached(cache_key, query_embedding, formatted_results)
+
+        return dumps({
             "success": True,
             "query": query,
             "results_count": len(formatted_results),
             "results": formatted_results
-        }, indent=2, ensure_ascii=False)
+        })
 
     except Exception as e:
         logger.exception(f"Erro na busca semântica de tabelas: {e}")
@@ -177,52 +317,50 @@ def semantic_search_procedures(
     """
     try:
         if not _vector_kg:
-            return json.dumps({
-                "success": False,
-                "error": "Vector knowledge graph não está disponível. "
-                        "Verifique se a busca semântica está habilitada."
-            })
-
-        # Validar top_k
-        if top_k and top_k > 20:
-            top_k = 20
-        elif not top_k:
-            top_k = 5
-
-        # Validar threshold
-        if similarity_threshold is None:
-            similarity_threshold = 0.0
-        elif similarity_threshold < 0.0 or similarity_threshold > 1.0:
-            similarity_threshold = 0.0
-
-        # Buscar procedures
-        results = _vector_kg.semantic_search(
-            query=query,
-            top_k=top_k,
-            node_type="procedure",
-            similarity_threshold=similarity_threshold
-        )
-
-        # Formatar resultados
-        formatted_results = []
-        for result in results:
-            context = result.context
-            formatted_results.append({
-                "procedure_name": context.get("name", result.node_id),
-                "schema": context.get("schema", ""),
-                "full_name": result.node_id,
-                "similarity": round(result.similarity, 4),
-                "business_logic": context.get("business_logic", "")[:200] + "..." if len(context.get("business_logic", "")) > 200 else context.get("business_logic", ""),
-                "parameters_count": len(context.get("parameters", [])),
-                "complexity_score": context.get("complexity_score", 0)
-            })
-
-        return json.dumps({
+            return _ERR_VECTOR_KG_UNAVAILABLE
+
+        # Validar top_k (1 a 20, padrão 5)
+        top_k = min(max(top_k or 5, 1), 20)
+
+        # Validar threshold (limitado a 0.0-1.0)
+        similarity_threshold = 0.0 if similarity_threshold is None else min(max(similarity_threshold, 0.0), 1.0)
+
+        # Reutilizar resultado de query equivalente (paráfrase)
+        cache_key = f"procedures:{top_k}:{similarity_threshold}"
+        query_embedding = _query_embedding(query)
+        formatted_results = _get_semantic_cached(cache_key, query_embedding)
+
+        if formatted_results is None:
+            # Buscar procedures
+            results = _vector_kg.semantic_search(
+                query=query,
+                top_k=top_k,
+                node_type="procedure",
+                similarity_threshold=similarity_threshold
+            )
+
+            # Formatar resultados
+            formatted_results = []
+            for result in results:
+                context = result.context
+                business_logic = context.get("business_logic", "")
+                formatted_results.append(ProcedureHit(
+                    procedure_name=context.get("name", result.node_id),
+                    schema=context.get("schema", ""),
+                    full_name=result.node_id,
+                    similarity=round(result.similarity, 4),
+                    business_logic=business_logic[:200] + "..." if len(business_logic) > 200 else business_logic,
+                    parameters_count=len(context.get("parameters", [])),
+                    complexity_score=context.get("complexity_score", 0)
+                ))
+            _store_semantic_cached(cache_key, query_embedding, formatted_results)
+
+        return dumps({
             "success": True,
             "query": query,
             "results_count": len(formatted_results),
             "results": formatted_results
-        }, indent=2, ensure_ascii=False)
+        })
 
     except Exception as e:
         logger.exception(f"Erro na busca semântica de procedures: {e}")
@@ -264,64 +402,69 @@ def hybrid_search(
     """
     try:
         if not _vector_kg:
-            return json.dumps({
-                "success": False,
-                "error": "Vector knowledge graph não está disponível. "
-                        "Verifique se a busca semântica está habilitada."
-            })
-
-        # Validar top_k
-        if top_k and top_k > 20:
-            top_k = 20
-        elif not top_k:
-            top_k = 5
+            return _ERR_VECTOR_KG_UNAVAILABLE
+
+        # Validar top_k (1 a 20, padrão 5)
+        top_k = min(max(top_k or 5, 1), 20)
 
         # Validar node_type
         if node_type and node_type not in ["table", "procedure"]:
             node_type = None
 
-        # Busca híbrida
-        results = _vector_kg.hybrid_search(
-            query=query,
-            top_k=top_k,
-            node_type=node_type
-        )
-
-        # Formatar resultados
-        formatted_results = []
-        for result in results:
-            context = result.context
-            relationships = context.get("relationships", {})
-
-            formatted_result = {
-                "node_id": result.node_id,
-                "name": context.get("name", result.node_id),
-                "schema": context.get("schema", ""),
-                "node_type": context.get("node_type", "unknown"),
-                "similarity": round(result.similarity, 4),
-                "relationships": {}
-            }
-
-            # Adicionar informações específicas do tipo
-            if context.get("node_type") == "table":
-                formatted_result["business_purpose"] = context.get("business_purpose", "")
-                formatted_result["columns_count"] = len(context.get("columns", []))
-            elif context.get("node_type") == "procedure":
-                formatted_result["business_logic"] = context.get("business_logic", "")[:200] + "..." if len(context.get("business_logic", "")) > 200 else context.get("business_logic", "")
-                formatted_result["parameters_count"] = len(context.get("parameters", []))
-
-            # Adicionar relacionamentos
-            for rel_type, targets in relationships.items():
-                formatted_result["relationships"][rel_type] = targets[:10]  # Limitar a 10 por tipo
-
-            formatted_results.append(formatted_result)
-
-        return json.dumps({
+        # Reutilizar resultado de query equivalente (paráfrase); relacionamentos
+        # mudam com a análise sob demanda, então a chave inclui a revisão do grafo
+        revision = getattr(_vector_kg.kg, "revision", None)
+        cache_key = f"hybrid:{top_k}:{node_type}:{revision}"
+        query_embedding = _query_embedding(query)
+        formatted_results = _get_semantic_cached(cache_key, query_embedding)
+
+        if formatted_results is None:
+            # Busca híbrida
+            results = _vector_kg.hybrid_search(
+                query=query,
+                top_k=top_k,
+                node_type=node_type,
+                relationships_per_type_limit=10
+            )
+
+            # Formatar resultados
+            formatted_results = []
+            for result in results:
+                context = result.context
+                relationships = context.get("relationships", {})
+                result_type = context.get("node_type", "unknown")
+
+                formatted_result = {
+                    "node_id": result.node_id,
+                    "name": context.get("name", result.node_id),
+                    "schema": context.get("schema", ""),
+                    "node_type": result_type,
+                    "similarity": round(result.similarity, 4),
+                    "relationships": {}
+                }
+
+                # Adicionar informações específicas do tipo
+                if result_type == "table":
+                    formatted_result["business_purpose"] = context.get("business_purpose", "")
+                    formatted_result["columns_count"] = len(context.get("columns", []))
+                elif result_type == "procedure":
+                    business_logic = context.get("business_logic", "")
+                    formatted_result["business_logic"] = business_logic[:200] + "..." if len(business_logic) > 200 else business_logic
+                    formatted_result["parameters_count"] = len(context.get("parameters", []))
+
+                # Adicionar relacionamentos
+                for rel_type, targets in relationships.items():
+                    formatted_result["relationships"][rel_type] = targets[:10]  # Já limitado na busca; defensivo
+
+                formatted_results.append(formatted_result)
+            _store_semantic_cached(cache_key, query_embedding, formatted_results)
+
+        return dumps({
             "success": True,
             "query": query,
             "results_count": len(formatted_results),
             "results": formatted_results
-        }, indent=2, ensure_ascii=False)
+        })
 
     except Exception as e:
         logger.exception(f"Erro na busca híbrida: {e}")
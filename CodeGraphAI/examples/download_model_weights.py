@@ -14,6 +14,7 @@ except ImportError:
     subprocess.check_call([sys.executable, "-m", "pip", "install", "huggingface_hub"])
     from huggingface_hub import hf_hub_download
 
+
 def download_model_files():
     """Baixa os arquivos de pesos do modelo."""
     model_dir = Path(__file__).parent.parent / "models" / "elastic" / "multilingual-e5-small-optimized"
@@ -41,6 +42,40 @@ def download_model_files():
         except Exception as e:
             print(f"❌ Erro ao baixar {filename}: {e}")
 
+    return model_dir
+
+
+def export_onnx_model(model_dir: Path):
+    """
+    Exporta o modelo para ONNX (otimizado e quantizado int8) para inferência em CPU.
+
+    Requer: pip install optimum[onnxruntime]
+    """
+    import subprocess
+
+    print(f"\nExportando modelo ONNX em: {model_dir}")
+    try:
+        # O3: fusões de grafo para CPU (O4 adiciona fp16 e é apenas para GPU)
+        subprocess.check_call([
+            "optimum-cli", "export", "onnx",
+            "--model", str(model_dir),
+            "--task", "feature-extraction",
+            "--optimize", "O3",
+            str(model_dir)
+        ])
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(
+            str(model_dir / "model.onnx"),
+            str(model_dir / "model_quantized.onnx"),
+            weight_type=QuantType.QInt8
+        )
+        print("✅ Modelo ONNX exportado: model.onnx, model_quantized.onnx")
+    except Exception as e:
+        print(f"❌ Erro ao exportar modelo ONNX: {e}")
+        print("   Instale com: pip install optimum[onnxruntime]")
+
 if __name__ == "__main__":
-    download_model_files()
+    model_dir = download_model_files()
+    if "--onnx" in sys.argv:
+        export_onnx_model(model_dir)
 
@@ -6,6 +6,7 @@ Valida que o modelo quantizado pode ser carregado e usado para criar embeddings.
 
 import sys
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 # Adicionar raiz do projeto ao path
@@ -24,6 +25,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _get_loader(model_path: str, device: str) -> QuantizedModelLoader:
+    """Carrega o modelo uma única vez por processo (compartilhado entre os testes)."""
+    return QuantizedModelLoader(model_path=model_path, device=device)
+
+
 def test_quantized_model_detection():
     """Testa detecção de modelo quantizado."""
     logger.info("=" * 60)
@@ -62,10 +69,7 @@ def test_quantized_model_loading():
         return False
 
     try:
-        loader = QuantizedModelLoader(
-            model_path=str(model_path),
-            device="cpu"
-        )
+        loader = _get_loader(str(model_path), "cpu")
 
         logger.info("✅ Modelo quantizado carregado com sucesso")
         logger.info(f"   Dimensão: {loader.get_sentence_embedding_dimension()}")
@@ -90,10 +94,7 @@ def test_quantized_embeddings():
         return False
 
     try:
-        loader = QuantizedModelLoader(
-            model_path=str(model_path),
-            device="cpu"
-        )
+        loader = _get_loader(str(model_path), "cpu")
 
         texts = [
             "Este é um teste de embedding em português",
@@ -1039,7 +1039,10 @@ def query(ctx, question, verbose, max_iterations, cache_path,
                 embedding_backend=config.embedding_backend if hasattr(config, 'embedding_backend') else 'sentence-transformers',
                 embedding_model=config.embedding_model if hasattr(config, 'embedding_model') else None,
                 vector_store_path=vector_store_path,
-                batch_size=32
+                batch_size=32,
+                embedding_dtype=config.embed_dtype if hasattr(config, 'embed_dtype') else 'fp16',
+                index_type=config.index_type if hasattr(config, 'index_type') else 'flat',
+                hnsw_ef_search=config.hnsw_ef_search if hasattr(config, 'hnsw_ef_search') else 64
             )
             vkg_stats = vector_kg.get_statistics()
             click.echo(f"✓ Vector store: {vkg_stats.get('indexed_nodes', 0)} nós indexados")
@@ -1117,6 +1120,7 @@ def query(ctx, question, verbose, max_iterations, cache_path,
             knowledge_graph=knowledge_graph,
             crawler=crawler,
             db_config=db_config,
+            config=config,
             vector_kg=vector_kg
         )
         tools = get_all_tools()
@@ -553,7 +553,7 @@ class TableAnalyzer:
                 if not predecessors:
                     levels[node] = 0  # Tabela base (sem dependências)
                 else:
-                    max_dep_level = max([levels.get(p, 0) for p in predecessors], default=-1)
+                    max_dep_level = max((levels.get(p, 0) for p in predecessors), default=-1)
                     levels[node] = max_dep_level + 1
 
             # Organiza por nível
@@ -621,9 +621,18 @@ class TableAnalyzer:
                         'timestamp': m.timestamp.isoformat(),
                         'use_toon': m.use_toon
                     }
-                    for m in self.llm.token_tracker.get_all_metrics()
+                    for m in self.llm.token_tracker.iter_metrics()
                 ]
 
+            # Estatísticas em uma única passada
+            total_complexity = 0
+            total_foreign_keys = 0
+            total_indexes = 0
+            for t in self.tables.values():
+                total_complexity += t.complexity_score
+                total_foreign_keys += len(t.foreign_keys)
+                total_indexes += len(t.indexes)
+
             results = {
                 'tables': {
                     name: {
@@ -637,9 +646,9 @@ class TableAnalyzer:
                 'hierarchy': self.get_table_hierarchy(),
                 'statistics': {
                     'total_tables': len(self.tables),
-                    'avg_complexity': sum(t.complexity_score for t in self.tables.values()) / len(self.tables) if self.tables else 0,
-                    'total_foreign_keys': sum(len(t.foreign_keys) for t in self.tables.values()),
-                    'total_indexes': sum(len(t.indexes) for t in self.tables.values())
+                    'avg_complexity': total_complexity / len(self.tables),
+                    'total_foreign_keys': total_foreign_keys,
+                    'total_indexes': total_indexes
                 }
             }
 
@@ -0,0 +1,64 @@
+"""
+Testes para o módulo serialization
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+import app.core.serialization as serialization
+from app.analysis.models import TraceStep
+from app.core.serialization import dumps, loads
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Executa o teste com orjson (se instalado) e com o fallback da stdlib"""
+    if request.param and not serialization.ORJSON_AVAILABLE:
+        pytest.skip("orjson não está instalado")
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", request.param)
+    return request.param
+
+
+class TestSerialization:
+    """Testes para dumps/loads"""
+
+    def test_dumps_compact_by_default(self, backend, monkeypatch):
+        """Testa saída compacta e sem escape de caracteres não-ASCII"""
+        monkeypatch.setattr(serialization, "PRETTY_JSON", False)
+        result = dumps({"nome": "ação", "itens": [1, 2]})
+        assert result == '{"nome":"ação","itens":[1,2]}'
+
+    def test_dumps_pretty(self, backend):
+        """Testa saída indentada quando solicitada"""
+        result = dumps({"a": [1]}, pretty=True)
+        assert result == json.dumps({"a": [1]}, indent=2)
+
+    def test_dumps_dataclass(self, backend):
+        """Testa serialização direta de dataclasses (com slots)"""
+        step = TraceStep(procedure="P1", operation="read", context={"t": "T1"}, depth=1)
+        assert loads(dumps({"path": [step]})) == {
+            "path": [{"procedure": "P1", "operation": "read", "context": {"t": "T1"}, "depth": 1}]
+        }
+
+    def test_dumps_default_for_unsupported_types(self, backend):
+        """Testa conversão de tipos não suportados via default"""
+        assert loads(dumps({"v": Decimal("35.50")}, default=str)) == {"v": "35.50"}
+        with pytest.raises(TypeError):
+            dumps({"v": Decimal("1")})
+
+    def test_dumps_uses_env_flag(self, backend, monkeypatch):
+        """Testa que CODEGRAPHAI_PRETTY_JSON define o padrão"""
+        monkeypatch.setattr(serialization, "PRETTY_JSON", True)
+        assert "\n" in dumps({"a": 1})
+
+    def test_loads_round_trip(self, backend):
+        """Testa round-trip dumps/loads"""
+        data = {"procedures": ["proc1"], "nested": {"x": None, "y": 1.5}}
+        assert loads(dumps(data)) == data
+
+    def test_loads_invalid_raises_json_decode_error(self, backend):
+        """Testa que JSON inválido levanta json.JSONDecodeError"""
+        with pytest.raises(json.JSONDecodeError):
+            loads("{invalid")
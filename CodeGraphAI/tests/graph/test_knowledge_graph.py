@@ -7,6 +7,7 @@ import unittest
 import tempfile
 import shutil
 import json
+import sys
 from pathlib import Path
 from app.graph.knowledge_graph import CodeKnowledgeGraph
 
@@ -148,6 +149,75 @@ class TestKnowledgeGraphProcedures(unittest.TestCase):
 
         self.assertIsNone(context)
 
+    def test_has_procedure(self):
+        """Test procedure existence check with and without schema"""
+        self.kg.add_procedure({"name": "PROC1", "schema": "PUBLIC"})
+        self.kg.add_table({"name": "TABLE1", "schema": "PUBLIC"})
+
+        self.assertTrue(self.kg.has_procedure("PUBLIC.PROC1"))
+        self.assertTrue(self.kg.has_procedure("PROC1"))
+        self.assertFalse(self.kg.has_procedure("PUBLIC.TABLE1"))
+        self.assertFalse(self.kg.has_procedure("NONEXISTENT"))
+
+    def test_get_procedure_context_memoized_until_mutation(self):
+        """Test context is reused between calls and refreshed after changes"""
+        self.kg.add_procedure({"name": "PROC1", "schema": "PUBLIC"})
+
+        first = self.kg.get_procedure_context("PROC1")
+        self.assertIs(self.kg.get_procedure_context("PROC1"), first)
+        self.assertIsNone(self.kg.get_procedure_context("PROC2"))
+
+        self.kg.add_procedure({
+            "name": "PROC2",
+            "schema": "PUBLIC",
+            "called_procedures": ["PUBLIC.PROC1"]
+        })
+
+        self.assertIsNotNone(self.kg.get_procedure_context("PROC2"))
+        self.assertIsNot(self.kg.get_procedure_context("PROC1"), first)
+
+        self.kg.clear()
+        self.assertIsNone(self.kg.get_procedure_context("PROC1"))
+
+    def test_get_similar_names(self):
+        """Test suggestions for names that are not in the graph"""
+        self.kg.add_procedure({"name": "CALCULAR_SALDO", "schema": "PUBLIC"})
+        self.kg.add_procedure({"name": "VALIDAR_USUARIO", "schema": "PUBLIC"})
+        self.kg.add_table({"name": "CALCULAR_SALDOS", "schema": "PUBLIC"})
+
+        similar = self.kg.get_similar_names("APP.CALCULA_SALDO", "procedure")
+
+        self.assertEqual(similar, ["PUBLIC.CALCULAR_SALDO"])
+        self.assertTrue(self.kg.has_table("CALCULAR_SALDOS"))
+        self.assertFalse(self.kg.has_table("CALCULAR_SALDO"))
+
+    def test_find_entity(self):
+        """Test resolving a name to a procedure or a table"""
+        self.kg.add_procedure({"name": "PROC1", "schema": "PUBLIC"})
+        self.kg.add_table({"name": "TABLE1", "schema": "PUBLIC"})
+
+        kind, info = self.kg.find_entity("PROC1")
+        self.assertEqual(kind, "procedure")
+        self.assertEqual(info["full_name"], "PUBLIC.PROC1")
+
+        kind, info = self.kg.find_entity("PUBLIC.TABLE1")
+        self.assertEqual(kind, "table")
+        self.assertEqual(info["name"], "TABLE1")
+
+        self.assertIsNone(self.kg.find_entity("MISSING"))
+
+    def test_node_ids_are_interned(self):
+        """Test node ids and edge endpoints share interned strings"""
+        self.kg.add_procedure({
+            "name": "PROC1",
+            "schema": "PUBLIC",
+            "called_procedures": ["".join(["PUBLIC.", "PROC2"])]
+        })
+
+        source, target = next(iter(self.kg.graph.edges()))
+        self.assertIs(source, sys.intern("PUBLIC.PROC1"))
+        self.assertIs(target, sys.intern("PUBLIC.PROC2"))
+
     def test_get_callers(self):
         """Test finding procedures that call a given procedure"""
         # Setup: proc1 calls proc2, proc3 calls proc2
@@ -254,6 +324,7 @@ class TestKnowledgeGraphTables(unittest.TestCase):
         self.assertIsNotNone(info)
         self.assertEqual(info["name"], "PRODUCTS")
         self.assertEqual(info["business_purpose"], "Product catalog")
+        self.assertEqual(info["columns_by_name"]["id"]["data_type"], "INTEGER")
 
 
 class TestKnowledgeGraphFields(unittest.TestCase):
@@ -342,6 +413,37 @@ class TestKnowledgeGraphFields(unittest.TestCase):
         self.assertIn("written_by", usage)
         self.assertIn("procedures", usage)
 
+    def test_get_field_bundle_matches_individual_queries(self):
+        """Test field bundle returns the same data as the separate queries"""
+        self.kg.add_procedure({
+            "name": "PROC1",
+            "schema": "PUBLIC",
+            "fields_used": {"status": {"operations": ["read"], "transformations": []}}
+        })
+        self.kg.add_procedure({
+            "name": "PROC2",
+            "schema": "PUBLIC",
+            "fields_used": {"status": {"operations": ["write"], "transformations": []}}
+        })
+        self.kg.add_table({
+            "name": "ORDERS",
+            "schema": "PUBLIC",
+            "columns": [{"name": "status", "data_type": "VARCHAR"}]
+        })
+        self.kg.add_field({"field_name": "status", "table_name": "PUBLIC.ORDERS"})
+
+        bundle = self.kg.get_field_bundle("status", "PROC2", "PUBLIC.ORDERS")
+
+        self.assertEqual(bundle["detailed_usage"], [{
+            "procedure": "PUBLIC.PROC2",
+            "operations": ["write"],
+            "transformations": []
+        }])
+        self.assertEqual(bundle["usage"], self.kg.get_field_usage("status"))
+        self.assertEqual(bundle["relationships"], self.kg.get_field_relationships("status"))
+        self.assertEqual(bundle["column"]["data_type"], "VARCHAR")
+        self.assertIsNone(self.kg.get_field_bundle("status", table_name="MISSING")["column"])
+
 
 class TestKnowledgeGraphPersistence(unittest.TestCase):
     """Test persistence and caching"""
@@ -416,6 +518,22 @@ class TestKnowledgeGraphPersistence(unittest.TestCase):
         self.assertEqual(kg.graph.number_of_nodes(), 0)
         self.assertEqual(kg.graph.number_of_edges(), 0)
 
+    def test_revision_bumped_by_mutations(self):
+        """Test every mutation changes the revision used by derived caches"""
+        kg = CodeKnowledgeGraph(cache_path=str(self.cache_path))
+        revisions = [kg.revision]
+
+        kg.add_procedure({"name": "PROC1", "schema": "PUBLIC"})
+        revisions.append(kg.revision)
+        kg.add_table({"name": "TABLE1", "schema": "PUBLIC"})
+        revisions.append(kg.revision)
+        kg.add_field({"field_name": "id", "table_name": "PUBLIC.TABLE1"})
+        revisions.append(kg.revision)
+        kg.clear()
+        revisions.append(kg.revision)
+
+        self.assertEqual(len(set(revisions)), 5)
+
 
 class TestKnowledgeGraphStatistics(unittest.TestCase):
     """Test graph statistics"""
@@ -0,0 +1,306 @@
+"""
+Tests for VectorKnowledgeGraph - in-memory search indices
+"""
+
+import subprocess
+import sys
+import unittest
+from functools import lru_cache
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import networkx as nx
+import pytest
+
+import app.graph.vector_knowledge_graph as vkg_module
+from app.graph.vector_knowledge_graph import VectorKnowledgeGraph
+
+
+def _make_vector_kg(nodes, index_type="flat"):
+    """
+    Build a VectorKnowledgeGraph without model/ChromaDB
+
+    Args:
+        nodes: List of (node_id, node_type, embedding)
+        index_type: FAISS index type
+    """
+    graph = nx.MultiDiGraph()
+    for node_id, node_type, _ in nodes:
+        graph.add_node(node_id, node_type=node_type, name=node_id.split(".")[-1])
+
+    vector_kg = VectorKnowledgeGraph.__new__(VectorKnowledgeGraph)
+    vector_kg.kg = Mock(graph=graph)
+    vector_kg.embedding_backend = "sentence-transformers"
+    vector_kg.index_type = index_type
+    vector_kg.hnsw_ef_search = 64
+    vector_kg.batch_size = 32
+    vector_kg.embedder = Mock()
+    vector_kg._cached_query_embedding = lru_cache(maxsize=vkg_module._QUERY_CACHE_SIZE)(vector_kg._embed_query)
+    vector_kg.collection = Mock()
+    vector_kg.collection.get.return_value = {
+        "ids": [node_id for node_id, _, _ in nodes],
+        "embeddings": [embedding for _, _, embedding in nodes],
+        "metadatas": [{"type": node_type, "name": node_id} for node_id, node_type, _ in nodes]
+    }
+    vector_kg._build_search_indices()
+    return vector_kg
+
+
+NODES = [
+    ("public.payments", "table", [1.0, 0.0, 0.0]),
+    ("public.patients", "table", [0.0, 2.0, 0.0]),
+    ("public.proc_pay", "procedure", [3.0, 0.1, 0.0]),
+]
+
+
+class _SearchIndicesTests:
+    """Search behaviour shared by the FAISS and NumPy backends"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.vector_kg = _make_vector_kg(NODES)
+        self.vector_kg.embedder.encode.return_value = vkg_module.np.array([2.0, 0.0, 0.0])
+
+    def test_search_filters_by_type_and_uses_cosine(self):
+        """Test search returns only the requested type with cosine similarity"""
+        results = self.vector_kg.semantic_search("pagamentos", top_k=5, node_type="table")
+
+        self.assertEqual([r.node_id for r in results], ["public.payments", "public.patients"])
+        self.assertAlmostEqual(results[0].similarity, 1.0, places=5)
+        self.assertAlmostEqual(results[1].similarity, 0.0, places=5)
+        self.vector_kg.collection.query.assert_not_called()
+
+    def test_search_without_type_merges_indices(self):
+        """Test node_type=None searches every index and applies the threshold"""
+        results = self.vector_kg.semantic_search("pagamentos", top_k=5, similarity_threshold=0.5)
+
+        self.assertEqual([r.node_id for r in results], ["public.payments", "public.proc_pay"])
+
+    def test_top_k_keeps_best_matches(self):
+        """Test top_k smaller than the index returns the best rows in order"""
+        results = self.vector_kg.semantic_search("pagamentos", top_k=1, node_type="table")
+
+        self.assertEqual([r.node_id for r in results], ["public.payments"])
+
+    def test_warmup_touches_model_and_indices(self):
+        """Test warmup runs one encode and searches every index without errors"""
+        with self.assertNoLogs(vkg_module.logger, level="WARNING"):
+            self.vector_kg.warmup()
+
+        self.vector_kg.embedder.encode.assert_called_once()
+
+    def test_batch_search_encodes_once(self):
+        """Test semantic_search_batch returns one result list per query"""
+        self.vector_kg.embedder.encode.return_value = vkg_module.np.array([[2.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+
+        batch = self.vector_kg.semantic_search_batch(["pagamentos", "pacientes"], top_k=1, node_type="table")
+
+        self.assertEqual([[r.node_id for r in results] for results in batch],
+                         [["public.payments"], ["public.patients"]])
+        self.vector_kg.embedder.encode.assert_called_once()
+
+
+@pytest.mark.skipif(not vkg_module.FAISS_AVAILABLE, reason="faiss não está instalado")
+class TestFaissSearchIndices(_SearchIndicesTests, unittest.TestCase):
+    """Test FAISS-backed semantic search"""
+
+    def test_one_index_per_node_type(self):
+        """Test tables and procedures are indexed separately"""
+        self.assertEqual(self.vector_kg._indices["table"].ntotal, 2)
+        self.assertEqual(self.vector_kg._indices["procedure"].ntotal, 1)
+
+
+@pytest.mark.skipif(not vkg_module.FAISS_AVAILABLE, reason="faiss não está instalado")
+class TestScalarQuantizedSearchIndices(unittest.TestCase):
+    """Test int8 scalar-quantized FAISS search"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.vector_kg = _make_vector_kg(NODES, index_type="sq8")
+        self.vector_kg.embedder.encode.return_value = vkg_module.np.array([2.0, 0.0, 0.0])
+
+    def test_uses_scalar_quantizer(self):
+        """Test sq8 builds IndexScalarQuantizer indices"""
+        self.assertIsInstance(self.vector_kg._indices["table"], vkg_module.faiss.IndexScalarQuantizer)
+
+    def test_search_keeps_ranking(self):
+        """Test int8 vectors rank results like the exact index"""
+        results = self.vector_kg.semantic_search("pagamentos", top_k=5, node_type="table")
+
+        self.assertEqual([r.node_id for r in results], ["public.payments", "public.patients"])
+        self.assertAlmostEqual(results[0].similarity, 1.0, places=2)
+
+
+@pytest.mark.skipif(not vkg_module.FAISS_AVAILABLE, reason="faiss não está instalado")
+class TestHnswSearchIndices(_SearchIndicesTests, unittest.TestCase):
+    """Test HNSW-backed semantic search"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.vector_kg = _make_vector_kg(NODES, index_type="hnsw")
+        self.vector_kg.embedder.encode.return_value = vkg_module.np.array([2.0, 0.0, 0.0])
+
+    def test_uses_hnsw_with_ef_search(self):
+        """Test hnsw builds IndexHNSWFlat with the configured efSearch"""
+        index = self.vector_kg._indices["table"]
+
+        self.assertIsInstance(index, vkg_module.faiss.IndexHNSWFlat)
+        self.assertEqual(index.hnsw.efSearch, 64)
+
+
+class TestNumpySearchIndices(_SearchIndicesTests, unittest.TestCase):
+    """Test the NumPy fallback used when faiss is not installed"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        patcher = patch.object(vkg_module, "FAISS_AVAILABLE", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def test_matrices_normalized_once(self):
+        """Test stored rows are unit length per node type"""
+        matrix = self.vector_kg._indices["table"]
+
+        self.assertEqual(matrix.shape, (2, 3))
+        self.assertEqual(matrix.dtype, vkg_module.np.float32)
+        vkg_module.np.testing.assert_allclose(vkg_module.np.linalg.norm(matrix, axis=1), [1.0, 1.0], rtol=1e-6)
+
+
+class TestCollectionSearch(unittest.TestCase):
+    """Test search straight on ChromaDB when no in-memory index exists"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.vector_kg = _make_vector_kg([])
+        self.vector_kg.embedder.encode.return_value = vkg_module.np.array([[1.0, 0.0], [0.0, 1.0]])
+        self.vector_kg.collection.query.return_value = {
+            "ids": [["public.payments", "public.patients"], ["public.patients"]],
+            "metadatas": [[{"type": "table"}, {"type": "table"}], [{"type": "table"}]],
+            "distances": [[0.1, 0.7], [0.2]]
+        }
+
+    def test_batch_queries_in_one_call(self):
+        """Test every query goes to ChromaDB in a single query call"""
+        batch = self.vector_kg.semantic_search_batch(["pagamentos", "pacientes"], top_k=5,
+                                                     similarity_threshold=0.5)
+
+        self.vector_kg.collection.query.assert_called_once()
+        self.assertEqual(len(self.vector_kg.collection.query.call_args.kwargs["query_embeddings"]), 2)
+        self.assertEqual([[r.node_id for r in results] for results in batch],
+                         [["public.payments"], ["public.patients"]])
+        self.assertAlmostEqual(batch[0][0].similarity, 0.9)
+
+
+class TestHybridSearch(unittest.TestCase):
+    """Test graph expansion in hybrid_search"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.vector_kg = _make_vector_kg(NODES)
+        self.vector_kg.embedder.encode.return_value = vkg_module.np.array([2.0, 0.0, 0.0])
+        graph = self.vector_kg.kg.graph
+        for i in range(12):
+            graph.add_edge("public.proc_pay", f"public.caller_{i}", edge_type="calls")
+        graph.add_edge("public.payments", "public.proc_pay", edge_type="reads")
+
+    def test_relationships_limited_per_type(self):
+        """Test each relationship type keeps at most the requested targets"""
+        results = self.vector_kg.hybrid_search("pagamentos", top_k=1, node_type="procedure",
+                                               relationships_per_type_limit=10)
+
+        relationships = results[0].context["relationships"]
+        self.assertEqual(relationships["calls"], [f"public.caller_{i}" for i in range(10)])
+        self.assertEqual(relationships["reads"], ["public.payments"])
+
+    def test_no_limit_keeps_all_relationships(self):
+        """Test None returns every related node"""
+        results = self.vector_kg.hybrid_search("pagamentos", top_k=1, node_type="procedure",
+                                               relationships_per_type_limit=None)
+
+        self.assertEqual(len(results[0].context["relationships"]["calls"]), 12)
+
+
+class TestQueryEmbeddingCache(unittest.TestCase):
+    """Test query embedding memoization"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.vector_kg = _make_vector_kg(NODES)
+        self.vector_kg.embedder.encode.return_value = vkg_module.np.array([1.0, 0.0, 0.0])
+
+    def test_repeated_query_encoded_once(self):
+        """Test the model runs once for the same query text"""
+        first = self.vector_kg.encode_query("tabelas de pagamentos")
+        second = self.vector_kg.encode_query("tabelas de pagamentos")
+
+        self.assertIs(first, second)
+        self.vector_kg.embedder.encode.assert_called_once()
+
+    def test_cache_not_shared_between_instances(self):
+        """Test a new graph instance does not reuse another instance's vectors"""
+        self.vector_kg.encode_query("pacientes")
+        other = _make_vector_kg(NODES)
+        other.embedder.encode.return_value = vkg_module.np.array([0.0, 1.0, 0.0])
+
+        embedding = other.encode_query("pacientes")
+
+        self.assertEqual(embedding.tolist(), [0.0, 1.0, 0.0])
+        other.embedder.encode.assert_called_once()
+
+    def test_cached_embedding_is_read_only(self):
+        """Test callers cannot mutate the shared cached vector"""
+        embedding = self.vector_kg.encode_query("pacientes")
+
+        self.assertEqual(embedding.dtype, vkg_module.np.float32)
+        with self.assertRaises(ValueError):
+            embedding[0] = 2.0
+
+
+class TestEmbedderSelection(unittest.TestCase):
+    """Test embedding model selection in _load_embedder"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        pytest.importorskip("torch")
+        self.vector_kg = VectorKnowledgeGraph.__new__(VectorKnowledgeGraph)
+        self.vector_kg.device = "cpu"
+
+    def test_onnx_export_preferred_on_cpu(self):
+        """Test a local ONNX export is loaded without building a PyTorch model"""
+        with patch("app.llm.onnx_model_loader.ONNXRUNTIME_AVAILABLE", True), \
+                patch("app.llm.onnx_model_loader.find_onnx_model", return_value=Path("model.onnx")), \
+                patch("app.llm.onnx_model_loader.OnnxModelLoader") as onnx_loader, \
+                patch.object(VectorKnowledgeGraph, "_load_sentence_transformer") as load_st:
+            embedder = self.vector_kg._load_embedder("models/e5", True, True, None)
+
+        self.assertIs(embedder, onnx_loader.return_value)
+        load_st.assert_not_called()
+
+    def test_onnx_failure_falls_back_to_pytorch(self):
+        """Test an unreadable ONNX export falls back to the PyTorch model"""
+        with patch("app.llm.onnx_model_loader.ONNXRUNTIME_AVAILABLE", True), \
+                patch("app.llm.onnx_model_loader.find_onnx_model", return_value=Path("model.onnx")), \
+                patch("app.llm.onnx_model_loader.OnnxModelLoader", side_effect=RuntimeError("boom")), \
+                patch.object(VectorKnowledgeGraph, "_load_sentence_transformer") as load_st:
+            embedder = self.vector_kg._load_embedder("models/e5", True, False, None)
+
+        self.assertIs(embedder, load_st.return_value)
+        load_st.assert_called_once_with("models/e5", True, None)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test the module import stays cheap"""
+
+    def test_import_does_not_load_ml_stack(self):
+        """Test torch/transformers/chromadb are only imported when the model is built"""
+        code = (
+            "import sys\n"
+            "import app.graph.vector_knowledge_graph\n"
+            "print(sorted(m for m in ('torch', 'transformers', 'sentence_transformers', 'chromadb') "
+            "if m in sys.modules))"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=Path(__file__).parent.parent.parent)
+
+        self.assertEqual(output.stdout.strip(), "[]")
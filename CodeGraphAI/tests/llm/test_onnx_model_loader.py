@@ -0,0 +1,93 @@
+"""
+Testes para carregador de modelos ONNX.
+"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+import app.llm.onnx_model_loader as onnx_module
+from app.llm.onnx_model_loader import OnnxModelLoader, find_onnx_model
+
+
+def _make_loader(monkeypatch, hidden_states, input_names=("input_ids", "attention_mask")):
+    """Cria carregador com sessão e tokenizer simulados."""
+    monkeypatch.setattr(onnx_module, "ONNXRUNTIME_AVAILABLE", True)
+
+    session = Mock()
+    session.get_inputs.return_value = [Mock() for _ in input_names]
+    for node, name in zip(session.get_inputs.return_value, input_names):
+        node.name = name
+    session.get_outputs.return_value = [Mock(shape=["batch", "sequence", hidden_states.shape[-1]])]
+    session.run.return_value = [hidden_states]
+
+    tokenizer = Mock(return_value={
+        "input_ids": np.array([[1, 2, 0], [3, 0, 0]]),
+        "token_type_ids": np.zeros((2, 3), dtype=np.int32),
+        "attention_mask": np.array([[1, 1, 0], [1, 0, 0]]),
+    })
+
+    return OnnxModelLoader("modelo", preloaded_session=session, preloaded_tokenizer=tokenizer)
+
+
+class TestOnnxModelLoader:
+    """Testes para OnnxModelLoader."""
+
+    def test_find_onnx_model_prefers_quantized(self, tmp_path):
+        """Testa que o arquivo int8 tem prioridade sobre o fp32."""
+        assert find_onnx_model(tmp_path) is None
+
+        (tmp_path / "model.onnx").write_bytes(b"")
+        assert find_onnx_model(tmp_path) == tmp_path / "model.onnx"
+
+        (tmp_path / "model_quantized.onnx").write_bytes(b"")
+        assert find_onnx_model(tmp_path) == tmp_path / "model_quantized.onnx"
+
+    def test_missing_file_name(self, monkeypatch, tmp_path):
+        """Testa erro quando o arquivo ONNX pedido não existe."""
+        monkeypatch.setattr(onnx_module, "ONNXRUNTIME_AVAILABLE", True)
+        (tmp_path / "model.onnx").write_bytes(b"")
+
+        with pytest.raises(ValueError, match="ONNX"):
+            OnnxModelLoader(str(tmp_path), file_name="model_quantized.onnx")
+
+    def test_requires_onnxruntime(self, monkeypatch):
+        """Testa erro claro quando onnxruntime não está instalado."""
+        monkeypatch.setattr(onnx_module, "ONNXRUNTIME_AVAILABLE", False)
+
+        with pytest.raises(ImportError, match="onnxruntime"):
+            OnnxModelLoader("modelo")
+
+    def test_encode_mean_pooling(self, monkeypatch):
+        """Testa mean pooling ignorando tokens de padding."""
+        hidden_states = np.array([
+            [[1.0, 0.0], [3.0, 2.0], [100.0, 100.0]],
+            [[0.0, 4.0], [100.0, 100.0], [100.0, 100.0]],
+        ], dtype=np.float32)
+        loader = _make_loader(monkeypatch, hidden_states)
+
+        embeddings = loader.encode(["a", "b"])
+
+        assert embeddings.dtype == np.float32
+        np.testing.assert_allclose(embeddings, [[2.0, 1.0], [0.0, 4.0]])
+        assert loader.get_sentence_embedding_dimension() == 2
+
+    def test_encode_feeds_only_graph_inputs(self, monkeypatch):
+        """Testa que entradas não usadas pelo grafo não são enviadas."""
+        loader = _make_loader(monkeypatch, np.ones((2, 3, 2), dtype=np.float32))
+
+        loader.encode(["a", "b"])
+
+        feed = loader.session.run.call_args[0][1]
+        assert set(feed) == {"input_ids", "attention_mask"}
+        assert all(value.dtype == np.int64 for value in feed.values())
+
+    def test_encode_normalize(self, monkeypatch):
+        """Testa normalização L2 dos embeddings."""
+        hidden_states = np.full((2, 3, 2), 3.0, dtype=np.float32)
+        loader = _make_loader(monkeypatch, hidden_states)
+
+        embeddings = loader.encode(["a", "b"], normalize_embeddings=True)
+
+        np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), [1.0, 1.0], rtol=1e-6)
@@ -139,6 +139,113 @@ class TestQuantizedModelLoader:
         # Em produção, seria testado com modelo real
         pass
 
+    def test_preloaded_components_bypass_disk(self, tmp_path, monkeypatch):
+        """Testa que componentes pré-carregados dispensam leitura do disco."""
+        from unittest.mock import MagicMock
+
+        monkeypatch.setattr(QuantizedModelLoader, "_cpu_threads_configured", True)
+
+        model = MagicMock()
+        tokenizer = MagicMock()
+        config = MagicMock(hidden_size=256)
+
+        loader = QuantizedModelLoader(
+            model_path=str(tmp_path / "inexistente"),
+            device="cpu",
+            preloaded_model=model,
+            preloaded_tokenizer=tokenizer,
+            preloaded_config=config
+        )
+
+        assert loader.model is model
+        assert loader.tokenizer is tokenizer
+        assert loader.embedding_dimension == 256
+        model.to.assert_called_once_with("cpu")
+        model.eval.assert_called_once()
+
+    def test_dtype_converts_weights_on_device(self, tmp_path, monkeypatch):
+        """Testa que dtype converte os pesos ao mover o modelo para o device."""
+        import torch
+        from unittest.mock import MagicMock
+
+        monkeypatch.setattr(QuantizedModelLoader, "_cpu_threads_configured", True)
+
+        model = MagicMock()
+        QuantizedModelLoader(
+            model_path=str(tmp_path / "inexistente"),
+            device="cuda",
+            dtype=torch.float16,
+            preloaded_model=model,
+            preloaded_tokenizer=MagicMock(),
+            preloaded_config=MagicMock(hidden_size=384)
+        )
+
+        model.to.assert_called_once_with(device="cuda", dtype=torch.float16)
+
+    def test_load_model_prefers_safetensors(self, tmp_path, mocker):
+        """Testa que model.safetensors é carregado sem o patch de weights_only."""
+        (tmp_path / "model.safetensors").write_bytes(b"")
+
+        loader = QuantizedModelLoader.__new__(QuantizedModelLoader)
+        loader.model_path = tmp_path
+        loader.trust_remote_code = False
+
+        from_pretrained = mocker.patch(
+            "app.llm.quantized_model_loader.AutoModel.from_pretrained"
+        )
+        patch_ctx = mocker.patch("app.llm.quantized_model_loader.allow_quantized_loading")
+
+        loader._load_model()
+
+        assert from_pretrained.call_args.kwargs["use_safetensors"] is True
+        patch_ctx.assert_not_called()
+
+    def test_configure_cpu_threads_is_idempotent(self, mocker, monkeypatch):
+        """Testa que threads de CPU são configuradas apenas uma vez."""
+        monkeypatch.setattr(QuantizedModelLoader, "_cpu_threads_configured", False)
+        monkeypatch.setenv("OMP_NUM_THREADS", "3")
+        set_threads = mocker.patch("app.llm.quantized_model_loader.torch.set_num_threads")
+        mocker.patch("app.llm.quantized_model_loader.torch.set_num_interop_threads")
+
+        QuantizedModelLoader._configure_cpu_threads()
+        QuantizedModelLoader._configure_cpu_threads()
+
+        set_threads.assert_called_once_with(3)
+
+    def test_encode_numpy_matches_tensor_output(self):
+        """Testa que saída numpy pré-alocada equivale à concatenação de tensores."""
+        import numpy as np
+        import torch
+        from unittest.mock import MagicMock
+
+        loader = QuantizedModelLoader.__new__(QuantizedModelLoader)
+        loader.device = "cpu"
+
+        def fake_tokenizer(batch, **kwargs):
+            size = len(batch)
+            return {
+                "input_ids": torch.ones(size, 4, dtype=torch.long),
+                "attention_mask": torch.ones(size, 4, dtype=torch.long),
+            }
+
+        def fake_model(**encoded):
+            size = encoded["input_ids"].shape[0]
+            outputs = MagicMock()
+            outputs.last_hidden_state = torch.randn(size, 4, 8)
+            return outputs
+
+        loader.tokenizer = fake_tokenizer
+        loader.model = fake_model
+
+        torch.manual_seed(0)
+        as_numpy = loader.encode(["a", "b", "c"], batch_size=2)
+        torch.manual_seed(0)
+        as_tensor = loader.encode(["a", "b", "c"], batch_size=2, convert_to_numpy=False)
+
+        assert isinstance(as_numpy, np.ndarray)
+        assert as_numpy.shape == (3, 8)
+        assert np.allclose(as_numpy, as_tensor.numpy())
+
     def test_mean_pooling(self):
         """Testa função de mean pooling."""
         import torch
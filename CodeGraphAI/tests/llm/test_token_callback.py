@@ -141,6 +141,7 @@ class TestTokenTracker:
         assert comparison['with_toon']['total_tokens'] == 150
         assert comparison['without_toon']['total_tokens'] == 300
         assert comparison['overall_savings_percent'] > 0
+        assert comparison['by_operation']['op1']['savings_tokens'] == 150
 
     def test_get_toon_comparison_only_toon(self):
         """Testa comparação TOON quando apenas TOON foi usado"""
@@ -160,6 +161,39 @@ class TestTokenTracker:
         assert comparison['without_toon'] is None
         assert 'note' in comparison
 
+    def test_iter_metrics_and_snapshot(self):
+        """Testa iteração sem cópia e snapshot independente"""
+        tracker = TokenTracker()
+        metrics = LLMRequestMetrics(
+            request_id="test-1",
+            operation="op1",
+            tokens_in=100,
+            tokens_out=50,
+            tokens_total=150,
+            timestamp=datetime.now(),
+            use_toon=False
+        )
+        tracker.add_metrics(metrics)
+
+        assert list(tracker.iter_metrics()) == [metrics]
+        snapshot = tracker.get_all_metrics()
+        snapshot.clear()
+        assert len(tracker.metrics) == 1
+
+    def test_add_metrics_interns_operation(self):
+        """Testa que nomes de operação são internados na ingestão"""
+        tracker = TokenTracker()
+        for i in range(2):
+            tracker.add_metrics(LLMRequestMetrics(
+                request_id=f"test-{i}",
+                operation="".join(["op", "_dyn"]),
+                tokens_in=1,
+                tokens_out=1,
+                tokens_total=2,
+                timestamp=datetime.now()
+            ))
+        assert tracker.metrics[0].operation is tracker.metrics[1].operation
+
     def test_reset(self):
         """Testa reset do tracker"""
         tracker = TokenTracker()
@@ -174,6 +208,36 @@ class TestTokenTracker:
         ))
         tracker.reset()
         assert len(tracker.metrics) == 0
+        assert tracker.get_total_tokens().total_tokens == 0
+        assert tracker.get_statistics()['by_operation'] == {}
+        assert tracker.get_toon_comparison() is None
+
+    def test_statistics_by_operation_aggregates(self):
+        """Testa totais e médias por operação acumulados incrementalmente"""
+        tracker = TokenTracker()
+        for i, (op, tokens_in, tokens_out) in enumerate([("op1", 100, 50), ("op1", 300, 150), ("op2", 10, 5)]):
+            tracker.add_metrics(LLMRequestMetrics(
+                request_id=f"test-{i}",
+                operation=op,
+                tokens_in=tokens_in,
+                tokens_out=tokens_out,
+                tokens_total=tokens_in + tokens_out,
+                timestamp=datetime.now(),
+                use_toon=(op == "op2")
+            ))
+
+        stats = tracker.get_statistics()
+        op1 = stats['by_operation']['op1']
+        assert op1['count'] == 2
+        assert op1['tokens_in'] == 400
+        assert op1['average_per_request']['tokens_total'] == 300
+        assert stats['by_operation']['op2']['tokens_total'] == 15
+        assert stats['total_tokens']['total_tokens'] == 615
+
+        comparison = tracker.get_toon_comparison()
+        assert comparison['with_toon'] == {'total_tokens': 15, 'request_count': 1}
+        assert comparison['without_toon'] == {'total_tokens': 600, 'request_count': 2}
+        assert comparison['by_operation'] == {}
 
 
 class TestTokenUsageCallback:
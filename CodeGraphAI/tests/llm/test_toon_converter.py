@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock
 import json
 
 from app.llm.toon_converter import (
+    _extract_toon_block,
     json_to_toon,
     toon_to_json,
     format_toon_example,
@@ -131,6 +132,12 @@ class TestToonConverter:
         assert "procedures" in result
         assert "tables" in result
 
+    def test_format_dependencies_prompt_example_memoized(self):
+        """Testa que exemplo estático é montado uma única vez por formato"""
+        first = format_dependencies_prompt_example(use_toon=False)
+        assert format_dependencies_prompt_example(use_toon=False) is first
+        assert "{{" in first and "}}" in first
+
     def test_format_dependencies_prompt_example_toon(self):
         """Testa formatação de exemplo para prompt com TOON"""
         if not TOON_AVAILABLE:
@@ -186,6 +193,18 @@ class TestToonConverter:
             result = parse_llm_response(json_response, use_toon=True)
             assert result is not None
 
+    def test_parse_llm_response_deeply_nested_json(self):
+        """Testa parsing de JSON com aninhamento além do suportado pelo regex"""
+        response = 'Resultado: {"a": {"b": {"c": "}"}}, "procedures": ["proc1"]} fim'
+        result = parse_llm_response(response, use_toon=False)
+        assert result == {"a": {"b": {"c": "}"}}, "procedures": ["proc1"]}
+
+    def test_extract_toon_block_crlf(self):
+        """Testa extração de bloco TOON com quebras de linha \\r\\n"""
+        response = "Resposta:\r\nitems[2]{id,name}:\r\n  1,a\r\n  2,b\r\n\r\nFim"
+        assert _extract_toon_block(response) == "items[2]{id,name}:\n  1,a\n  2,b"
+        assert _extract_toon_block("sem bloco toon") is None
+
     def test_parse_llm_response_empty(self):
         """Testa parsing de resposta vazia"""
         result = parse_llm_response("", use_toon=False)
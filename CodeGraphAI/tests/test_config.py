@@ -261,6 +261,47 @@ class TestConfigValidation:
             config = Config()
             assert config._provider_config_map == {}
 
+    def test_validate_invalid_embed_dtype(self):
+        """Testa validação da precisão do modelo de embedding"""
+        Config.reset_instance()
+        try:
+            with patch.dict(os.environ, {'CODEGRAPHAI_EMBED_DTYPE': 'int4'}):
+                with pytest.raises(ValueError, match="Embed dtype"):
+                    Config()
+        finally:
+            Config.reset_instance()
+
+
+class TestConfigSingleton:
+    """Testes para inicialização thread-safe do singleton"""
+
+    def test_concurrent_initialization_loads_once(self):
+        """Testa que threads concorrentes carregam a configuração uma única vez"""
+        import threading
+        import time
+
+        original_load = Config._load
+        calls = []
+
+        def slow_load(self):
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            original_load(self)
+
+        Config.reset_instance()
+        try:
+            with patch.object(Config, '_load', slow_load):
+                threads = [threading.Thread(target=get_config) for _ in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            assert len(calls) == 1
+            assert Config._initialized
+        finally:
+            Config.reset_instance()
+
 
 class TestConfigBackwardCompatibility:
     """Testes para garantir backward compatibility"""
@@ -246,6 +246,40 @@ class TestCrawlProcedureTool(unittest.TestCase):
         call_args = self.crawler.crawl_procedure.call_args
         self.assertEqual(call_args[1]["max_depth"], 3)
 
+    def test_crawl_procedure_cached_per_arguments(self):
+        """Test repeated crawls with the same arguments reuse the cached result"""
+        mock_crawl_result = Mock()
+        mock_crawl_result.dependencies_tree = {"name": "PUBLIC.PROC1"}
+        mock_crawl_result.procedures_found = ["PUBLIC.PROC1"]
+        mock_crawl_result.tables_found = ["PUBLIC.TABLE1"]
+        mock_crawl_result.depth_reached = 1
+
+        self.crawler.crawl_procedure.return_value = mock_crawl_result
+
+        first = crawl_procedure.invoke({"procedure_name": "PUBLIC.PROC1"})
+        second = crawl_procedure.invoke({"procedure_name": "PUBLIC.PROC1"})
+        crawl_procedure.invoke({"procedure_name": "PUBLIC.PROC1", "max_depth": 2})
+
+        self.assertEqual(first, second)
+        self.assertTrue(json.loads(first)["success"])
+        self.assertEqual(self.crawler.crawl_procedure.call_count, 2)
+
+    def test_crawl_cache_invalidated_by_graph_changes(self):
+        """Test a crawl is recomputed after procedures are added to the graph"""
+        mock_crawl_result = Mock()
+        mock_crawl_result.dependencies_tree = {"name": "PUBLIC.PROC1"}
+        mock_crawl_result.procedures_found = ["PUBLIC.PROC1"]
+        mock_crawl_result.tables_found = []
+        mock_crawl_result.depth_reached = 1
+        self.crawler.crawl_procedure.return_value = mock_crawl_result
+
+        crawl_procedure.invoke({"procedure_name": "PUBLIC.PROC1"})
+        # e.g. a callee loaded by on-demand analysis in another tool
+        self.kg.add_procedure({"name": "PROC2", "schema": "PUBLIC"})
+        crawl_procedure.invoke({"procedure_name": "PUBLIC.PROC1"})
+
+        self.assertEqual(self.crawler.crawl_procedure.call_count, 2)
+
     def test_crawl_procedure_exception_handling(self):
         """Test crawl handles exceptions gracefully"""
         self.kg.add_procedure({
@@ -1,5 +1,5 @@
 """
-Tests for Field Tools - analyze_field and trace_field_flow
+Tests for Field Tools - analyze_field, analyze_fields and trace_field_flow
 """
 
 import pytest
@@ -9,9 +9,10 @@ import tempfile
 import shutil
 from pathlib import Path
 from unittest.mock import Mock, patch
-from app.tools.field_tools import analyze_field, trace_field_flow
+from app.tools.field_tools import analyze_field, analyze_fields, trace_field_flow
 from app.graph.knowledge_graph import CodeKnowledgeGraph
 from app.analysis.code_crawler import CodeCrawler
+from app.analysis.models import TraceStep
 import app.tools.field_tools as field_tools
 
 
@@ -56,6 +57,42 @@ class TestAnalyzeFieldTool(unittest.TestCase):
         self.assertFalse(data["success"])
         self.assertIn("não encontrado", data["error"])
 
+    def test_analyze_field_unknown_procedure(self):
+        """Test analyze_field fails fast with suggestions for unknown procedure"""
+        self.kg.add_procedure({
+            "name": "PROCESSAR_PEDIDO",
+            "schema": "PUBLIC",
+            "fields_used": {"status": {"operations": ["read"]}}
+        })
+
+        result = analyze_field.invoke({
+            "field_name": "status",
+            "procedure_name": "PROCESAR_PEDIDO"
+        })
+
+        data = json.loads(result)
+        self.assertFalse(data["success"])
+        self.assertIn("PROCESAR_PEDIDO", data["error"])
+        self.assertEqual(data["similar"], ["PUBLIC.PROCESSAR_PEDIDO"])
+
+    def test_analyze_field_max_usages(self):
+        """Test detailed usage is capped and flagged as truncated"""
+        for i in range(3):
+            self.kg.add_procedure({
+                "name": f"PROC{i}",
+                "schema": "PUBLIC",
+                "fields_used": {"status": {"operations": ["read"]}}
+            })
+
+        data = json.loads(analyze_field.invoke({"field_name": "status", "max_usages": 2}))
+        self.assertEqual(data["data"]["usage_count"], 3)
+        self.assertEqual(len(data["data"]["detailed_usage"]), 2)
+        self.assertTrue(data["data"]["truncated"])
+
+        data = json.loads(analyze_field.invoke({"field_name": "status"}))
+        self.assertEqual(len(data["data"]["detailed_usage"]), 3)
+        self.assertFalse(data["data"]["truncated"])
+
     def test_analyze_field_basic(self):
         """Test basic field analysis"""
         # Add procedure with field usage
@@ -250,8 +287,8 @@ class TestTraceFieldFlowTool(unittest.TestCase):
         mock_trace_result = Mock()
         mock_trace_result.field_name = "user_id"
         mock_trace_result.path = [
-            Mock(procedure="PUBLIC.PROC1", operation="read", depth=0, context="SELECT"),
-            Mock(procedure="PUBLIC.PROC2", operation="write", depth=1, context="INSERT")
+            TraceStep(procedure="PUBLIC.PROC1", operation="read", depth=0, context="SELECT"),
+            TraceStep(procedure="PUBLIC.PROC2", operation="write", depth=1, context="INSERT")
         ]
         mock_trace_result.sources = ["PUBLIC.TABLE1"]
         mock_trace_result.destinations = ["PUBLIC.TABLE2"]
@@ -300,6 +337,26 @@ class TestTraceFieldFlowTool(unittest.TestCase):
         call_args = self.crawler.trace_field.call_args
         self.assertEqual(call_args[1]["max_depth"], 5)
 
+    def test_trace_field_flow_cached_per_arguments(self):
+        """Test repeated traces with the same arguments reuse the cached result"""
+        mock_trace_result = Mock()
+        mock_trace_result.field_name = "status"
+        mock_trace_result.path = []
+        mock_trace_result.sources = ["TABLE1"]
+        mock_trace_result.destinations = []
+        mock_trace_result.transformations = []
+
+        self.crawler.trace_field.return_value = mock_trace_result
+
+        args = {"field_name": "status", "start_procedure": "PUBLIC.PROC1"}
+        first = trace_field_flow.invoke(args)
+        second = trace_field_flow.invoke(args)
+        trace_field_flow.invoke({**args, "max_depth": 3})
+
+        self.assertEqual(first, second)
+        self.assertTrue(json.loads(first)["success"])
+        self.assertEqual(self.crawler.trace_field.call_count, 2)
+
     def test_trace_field_flow_summary_format(self):
         """Test that summary is properly formatted"""
         self.kg.add_procedure({
@@ -309,7 +366,7 @@ class TestTraceFieldFlowTool(unittest.TestCase):
 
         mock_trace_result = Mock()
         mock_trace_result.field_name = "email"
-        mock_trace_result.path = [Mock(procedure="PROC1", operation="read", depth=0, context="WHERE")]
+        mock_trace_result.path = [TraceStep(procedure="PROC1", operation="read", depth=0, context="WHERE")]
         mock_trace_result.sources = ["TABLE1"]
         mock_trace_result.destinations = ["TABLE2"]
         mock_trace_result.transformations = ["LOWER(email)"]
@@ -331,6 +388,66 @@ class TestTraceFieldFlowTool(unittest.TestCase):
         self.assertTrue(summary["has_transformations"])
 
 
+class TestAnalyzeFieldsTool(unittest.TestCase):
+    """Test analyze_fields batch tool"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = Path(self.test_dir) / "test_kg.json"
+        self.kg = CodeKnowledgeGraph(cache_path=str(self.cache_path))
+
+        field_tools._knowledge_graph = self.kg
+        field_tools._on_demand_analyzer = None
+
+        self.kg.add_procedure({
+            "name": "PROC1",
+            "schema": "PUBLIC",
+            "fields_used": {
+                "status": {"operations": ["read"], "transformations": []},
+                "email": {"operations": ["write"], "transformations": ["LOWER(email)"]}
+            }
+        })
+        self.kg.add_table({
+            "name": "USERS",
+            "schema": "PUBLIC",
+            "columns": [{"name": "email", "data_type": "VARCHAR"}]
+        })
+
+    def tearDown(self):
+        """Clean up"""
+        if Path(self.test_dir).exists():
+            shutil.rmtree(self.test_dir)
+        field_tools._knowledge_graph = None
+
+    def test_analyze_fields_matches_analyze_field(self):
+        """Test batch analysis returns the same data as single-field analysis"""
+        result = analyze_fields.invoke({
+            "field_names": ["status", "email", "missing", "status"],
+            "table_name": "PUBLIC.USERS"
+        })
+
+        data = json.loads(result)
+        self.assertTrue(data["success"])
+        self.assertEqual(list(data["data"]["fields"]), ["status", "email"])
+        self.assertEqual(data["data"]["not_found"], ["missing"])
+
+        for name in ("status", "email"):
+            single = json.loads(analyze_field.invoke({
+                "field_name": name,
+                "table_name": "PUBLIC.USERS"
+            }))
+            self.assertEqual(data["data"]["fields"][name], single["data"])
+
+    def test_analyze_fields_none_found(self):
+        """Test batch analysis when no field exists"""
+        result = analyze_fields.invoke({"field_names": ["a", "b"]})
+
+        data = json.loads(result)
+        self.assertFalse(data["success"])
+        self.assertIn("encontrado", data["error"])
+
+
 class TestFieldToolsIntegration(unittest.TestCase):
     """Integration tests for field tools"""
 
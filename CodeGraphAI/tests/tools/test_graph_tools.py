@@ -6,7 +6,7 @@ import unittest
 import json
 from unittest.mock import Mock
 from app.tools import init_tools
-from app.tools.graph_tools import query_procedure, query_table
+from app.tools.graph_tools import query_procedure, query_table, query_entity
 
 
 class TestGraphTools(unittest.TestCase):
@@ -104,6 +104,35 @@ class TestGraphTools(unittest.TestCase):
         self.assertEqual(data["data"]["table_name"], "TEST_TABLE")
         self.assertEqual(data["data"]["column_count"], 1)
 
+    def test_query_entity_table(self):
+        """Test entity query resolving to a table"""
+        self.mock_graph.find_entity.return_value = ("table", {
+            "name": "PEDIDOS",
+            "schema": "VENDAS",
+            "full_name": "VENDAS.PEDIDOS",
+            "columns": [{"name": "ID", "data_type": "NUMBER"}],
+            "relationships": {}
+        })
+
+        result = query_entity.invoke({"name": "PEDIDOS"})
+
+        data = json.loads(result)
+        self.assertTrue(data["success"])
+        self.assertEqual(data["kind"], "table")
+        self.assertEqual(data["data"]["full_name"], "VENDAS.PEDIDOS")
+        self.assertEqual(data["data"]["column_count"], 1)
+        self.mock_graph.get_procedure_context.assert_not_called()
+
+    def test_query_entity_not_found(self):
+        """Test entity not found as procedure nor table"""
+        self.mock_graph.find_entity.return_value = None
+
+        result = query_entity.invoke({"name": "NAO_EXISTE"})
+
+        data = json.loads(result)
+        self.assertFalse(data["success"])
+        self.assertIn("NAO_EXISTE", data["error"])
+
 
 if __name__ == '__main__':
     unittest.main()
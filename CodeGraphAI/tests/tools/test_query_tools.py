@@ -2,16 +2,22 @@
 Tests for Query Tools - execute_query, sample_table_data, get_field_statistics
 """
 
+import asyncio
 import pytest
 import unittest
 import json
+from decimal import Decimal
 from unittest.mock import Mock, patch, MagicMock
 from app.tools.query_tools import (
     execute_query,
     sample_table_data,
     get_field_statistics,
+    get_fields_statistics,
     _validate_select_query,
-    _add_limit_if_needed
+    _add_limit_if_needed,
+    _execute_safe_query,
+    _quote_ident,
+    _resolve_oracle_dsn
 )
 from app.core.models import DatabaseConfig, DatabaseType
 import app.tools.query_tools as query_tools
@@ -86,6 +92,31 @@ class TestQueryValidation(unittest.TestCase):
         self.assertFalse(is_valid)
         self.assertIn("EXEC", error)
 
+    def test_validate_select_query_keywords_inside_identifiers(self):
+        """Test keywords as part of identifiers are allowed, whole words are not"""
+        is_valid, error = _validate_select_query("SELECT created_at, updated_by FROM users")
+        self.assertTrue(is_valid)
+
+        is_valid, error = _validate_select_query("SELECT * FROM users WHERE EXECUTE = 1")
+        self.assertFalse(is_valid)
+        self.assertIn("EXECUTE", error)
+
+    def test_validate_select_query_fast_path_skips_comment_regexes(self):
+        """Test plain queries are validated without the comment-stripping pass"""
+        with patch.object(query_tools, '_COMMENT_LINE_RE') as line_re, \
+                patch.object(query_tools, '_COMMENT_BLOCK_RE') as block_re:
+            is_valid, error = _validate_select_query("  select\n id FROM users")
+
+        self.assertTrue(is_valid)
+        line_re.sub.assert_not_called()
+        block_re.sub.assert_not_called()
+
+    def test_validate_select_query_lowercase_dangerous_keyword(self):
+        """Test lowercase dangerous keywords are blocked and reported in uppercase"""
+        is_valid, error = _validate_select_query("select * from users where id in (call purge())")
+        self.assertFalse(is_valid)
+        self.assertIn("CALL", error)
+
     def test_validate_select_query_with_comments(self):
         """Test validation handles SQL comments"""
         query = """
@@ -141,6 +172,56 @@ class TestQueryLimitAddition(unittest.TestCase):
         # Should have only one semicolon or none at end
 
 
+class TestIdentifierQuoting(unittest.TestCase):
+    """Test _quote_ident"""
+
+    def test_quote_folds_plain_names_per_database(self):
+        """Test unquoted names are case-folded like the database does"""
+        self.assertEqual(_quote_ident("public.Users", "postgresql"), '"public"."users"')
+        self.assertEqual(_quote_ident("hr.employees", "oracle"), '"HR"."EMPLOYEES"')
+        self.assertEqual(_quote_ident("dbo.Users", "mssql"), "[dbo].[Users]")
+        self.assertEqual(_quote_ident("Users", "mysql"), "`Users`")
+
+    def test_quote_escapes_closing_character(self):
+        """Test identifiers cannot break out of the quotes"""
+        self.assertEqual(_quote_ident('users" OR 1=1', "postgresql"), '"users"" OR 1=1"')
+        self.assertEqual(_quote_ident("users]", "mssql"), "[users]]]")
+
+    def test_quote_keeps_case_of_quoted_parts(self):
+        """Test parts the caller already quoted keep their case and are not quoted twice"""
+        self.assertEqual(_quote_ident('public."MixedCase"', "postgresql"), '"public"."MixedCase"')
+
+    def test_quoted_breakout_stays_one_identifier(self):
+        """Test a pre-quoted name cannot close its identifier and append SQL"""
+        self.assertEqual(
+            _quote_ident('"a" ; DELETE FROM users ; "b"', "postgresql"),
+            '"a"" ; DELETE FROM users ; ""b"'
+        )
+        self.assertEqual(
+            _quote_ident('"a" ; DELETE FROM users ; "b"', "oracle"),
+            '"a"" ; DELETE FROM users ; ""b"'
+        )
+        self.assertEqual(
+            _quote_ident("[a] ; DELETE FROM users ; [b]", "mssql"),
+            "[a]] ; DELETE FROM users ; [b]"
+        )
+        self.assertEqual(
+            _quote_ident("`a` ; DELETE FROM users ; `b`", "mysql"),
+            "`a`` ; DELETE FROM users ; ``b`"
+        )
+
+
+class TestOracleDsn(unittest.TestCase):
+    """Test _resolve_oracle_dsn"""
+
+    def test_resolve_oracle_dsn_variants(self):
+        """Test host, port and service parsing with 1521 as default port"""
+        self.assertEqual(_resolve_oracle_dsn("db:1522/ORCL"), "db:1522/ORCL")
+        self.assertEqual(_resolve_oracle_dsn("db/ORCL"), "db:1521/ORCL")
+        self.assertEqual(_resolve_oracle_dsn("db:abc"), "db:1521")
+        self.assertEqual(_resolve_oracle_dsn("db"), "db:1521")
+
+
 class TestExecuteQueryTool(unittest.TestCase):
     """Test execute_query tool"""
 
@@ -203,6 +284,268 @@ class TestExecuteQueryTool(unittest.TestCase):
             call_args = mock_execute.call_args
             query_arg = call_args[0][0]
             self.assertIn("LIMIT 1000", query_arg)
+            self.assertTrue(call_args.kwargs["skip_limit"])
+
+    def test_execute_query_serializes_native_values(self):
+        """Test values without a JSON type (e.g. Decimal) are returned as strings"""
+        query_tools._db_config = self.db_config
+
+        with patch('app.tools.query_tools._execute_safe_query') as mock_execute:
+            mock_execute.return_value = {
+                "columns": ["id", "price"],
+                "rows": [{"id": 1, "price": Decimal("9.90")}],
+                "row_count": 1
+            }
+
+            result = execute_query.invoke({"query": "SELECT id, price FROM products"})
+
+        data = json.loads(result)
+        self.assertEqual(data["data"]["rows"], [{"id": 1, "price": "9.90"}])
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test connection reuse in _execute_safe_query"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.db_config = DatabaseConfig(
+            db_type=DatabaseType.ORACLE,
+            user="test_user",
+            password="test_pass",
+            host="localhost:1521/XE"
+        )
+        query_tools._db_config = self.db_config
+        query_tools._close_pool()
+        query_tools._clear_result_cache()
+
+    def tearDown(self):
+        """Clean up pool, cache and config"""
+        query_tools._close_pool()
+        query_tools._clear_result_cache()
+        query_tools._db_config = None
+
+    def _mock_connection(self, rows=((1,),)):
+        connection = MagicMock()
+        cursor = connection.cursor.return_value
+        cursor.description = [("ID",)]
+
+        # Each execute yields one batch of rows, then an empty batch
+        def execute(query):
+            cursor.fetchmany.side_effect = [list(rows), []]
+
+        cursor.execute.side_effect = execute
+        del connection.set_session
+        return connection
+
+    def test_connection_reused_between_queries(self):
+        """Test a healthy connection is returned to the pool and reused"""
+        connection = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)) as mock_connect:
+            first = _execute_safe_query("SELECT id FROM users")
+            second = _execute_safe_query("SELECT id FROM users", use_cache=False)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["rows"], [{"ID": 1}])
+        mock_connect.assert_called_once()
+        connection.close.assert_not_called()
+
+    def test_connection_discarded_after_error(self):
+        """Test a connection is closed, not pooled, when the query fails"""
+        connection = self._mock_connection()
+        connection.cursor.return_value.execute.side_effect = RuntimeError("boom")
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)) as mock_connect:
+            with self.assertRaises(RuntimeError):
+                _execute_safe_query("SELECT id FROM users")
+            with self.assertRaises(RuntimeError):
+                _execute_safe_query("SELECT id FROM users")
+
+        self.assertEqual(mock_connect.call_count, 2)
+        self.assertEqual(connection.close.call_count, 2)
+
+    def test_dead_pooled_connection_replaced(self):
+        """Test a pooled connection dropped by the server is retried on a fresh one"""
+        class OperationalError(Exception):
+            pass
+
+        stale = self._mock_connection()
+        fresh = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', side_effect=[(stale, None), (fresh, None)]):
+            _execute_safe_query("SELECT id FROM users")
+            stale.cursor.return_value.execute.side_effect = OperationalError("server closed the connection")
+            result = _execute_safe_query("SELECT id FROM users", use_cache=False)
+
+        self.assertEqual(result["rows"], [{"ID": 1}])
+        stale.close.assert_called_once()
+        fresh.close.assert_not_called()
+
+    def test_query_error_on_pooled_connection_not_retried(self):
+        """Test query errors (not connection errors) are raised without reconnecting"""
+        connection = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)) as mock_connect:
+            _execute_safe_query("SELECT id FROM users")
+            connection.cursor.return_value.execute.side_effect = RuntimeError("boom")
+            with self.assertRaises(RuntimeError):
+                _execute_safe_query("SELECT id FROM users", use_cache=False)
+
+        mock_connect.assert_called_once()
+
+    def test_pool_dropped_when_config_changes(self):
+        """Test pooled connections are not reused with another db_config"""
+        connection = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)) as mock_connect:
+            _execute_safe_query("SELECT id FROM users")
+            query_tools._db_config = DatabaseConfig(
+                db_type=DatabaseType.ORACLE,
+                user="other",
+                password="other",
+                host="otherhost:1521/XE"
+            )
+            _execute_safe_query("SELECT id FROM users")
+
+        self.assertEqual(mock_connect.call_count, 2)
+        connection.close.assert_called_once()
+
+    def test_rows_keep_native_values(self):
+        """Test tuple rows become dicts without stringifying values"""
+        connection = self._mock_connection(rows=[(1, Decimal("9.90"), None)])
+        connection.cursor.return_value.description = [("ID",), ("PRICE",), ("NAME",)]
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            result = _execute_safe_query("SELECT id, price, name FROM products")
+
+        self.assertEqual(result["rows"], [{"ID": 1, "PRICE": Decimal("9.90"), "NAME": None}])
+
+    def test_skip_limit_keeps_query_unchanged(self):
+        """Test skip_limit avoids rewriting a query that already has its LIMIT"""
+        connection = self._mock_connection()
+        cursor = connection.cursor.return_value
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            _execute_safe_query("SELECT id FROM users LIMIT 5000", skip_limit=True)
+            _execute_safe_query("SELECT id FROM users", skip_limit=False)
+
+        executed = [call[0][0] for call in cursor.execute.call_args_list]
+        self.assertEqual(executed, ["SELECT id FROM users LIMIT 5000", "SELECT id FROM users LIMIT 1000"])
+
+    def test_connector_resolved_once_per_config(self):
+        """Test driver/arguments are resolved once and reused for new connections"""
+        connect = Mock(side_effect=lambda: MagicMock())
+        query_tools._connector_config = None
+
+        with patch('app.tools.query_tools._build_connector', return_value=(connect, None)) as mock_build:
+            query_tools._get_connection()
+            query_tools._get_connection()
+
+        mock_build.assert_called_once()
+        self.assertEqual(connect.call_count, 2)
+
+    def test_native_timeout_set_on_connection(self):
+        """Test the Oracle call timeout is set instead of a signal alarm"""
+        connection = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            _execute_safe_query("SELECT id FROM users", timeout=5)
+
+        self.assertEqual(connection.call_timeout, 5000)
+
+    def test_driver_timeout_mapped_to_timeout_error(self):
+        """Test driver timeout errors surface as TimeoutError"""
+        connection = self._mock_connection()
+        connection.cursor.return_value.execute.side_effect = RuntimeError(
+            "DPI-1067: call timeout of 5000 ms exceeded"
+        )
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            with self.assertRaises(query_tools.TimeoutError):
+                _execute_safe_query("SELECT id FROM users", timeout=5)
+
+        connection.close.assert_called_once()
+
+    def test_concurrent_async_invocations(self):
+        """Test tools can be fanned out with ainvoke (worker threads, no signals)"""
+        connection = self._mock_connection()
+        connection.cursor.return_value.execute.side_effect = None
+        connection.cursor.return_value.fetchmany.side_effect = None
+        connection.cursor.return_value.fetchmany.return_value = []
+
+        async def fan_out():
+            return await asyncio.gather(*(
+                execute_query.ainvoke({"query": f"SELECT id FROM t{i}", "use_cache": False})
+                for i in range(4)
+            ))
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            results = asyncio.run(fan_out())
+
+        self.assertTrue(all(json.loads(r)["success"] for r in results))
+
+    def test_columns_read_after_first_fetch(self):
+        """Test server-side cursors (description set only after fetching) get columns"""
+        cursor = MagicMock()
+        cursor.description = None
+
+        def fetchmany(size):
+            cursor.description = [("id",), ("name",)]
+            return batches.pop(0)
+
+        batches = [[{"id": 1, "name": "Alice"}], []]
+        cursor.fetchmany.side_effect = fetchmany
+
+        columns, rows = query_tools._fetch_rows(cursor, "SELECT id, name FROM users")
+
+        self.assertEqual(columns, ["id", "name"])
+        self.assertEqual(rows, [{"id": 1, "name": "Alice"}])
+
+    def test_rows_fetched_in_batches(self):
+        """Test results are streamed with fetchmany until exhausted"""
+        connection = self._mock_connection()
+        cursor = connection.cursor.return_value
+        cursor.execute.side_effect = None
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            result = _execute_safe_query("SELECT id FROM users")
+
+        self.assertEqual(result["rows"], [{"ID": 1}, {"ID": 2}, {"ID": 3}])
+        self.assertEqual(cursor.arraysize, query_tools._FETCH_ARRAYSIZE)
+        cursor.fetchall.assert_not_called()
+
+    def test_repeated_query_served_from_cache(self):
+        """Test the same query (modulo whitespace) hits the database once"""
+        connection = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            first = _execute_safe_query("SELECT id FROM users")
+            second = _execute_safe_query("SELECT  id\n FROM users")
+
+        self.assertIs(first, second)
+        connection.cursor.return_value.execute.assert_called_once()
+
+    def test_whitespace_inside_literals_not_shared(self):
+        """Test literals differing only in whitespace are cached separately"""
+        connection = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)):
+            _execute_safe_query("SELECT id FROM users WHERE code = 'A  B'")
+            _execute_safe_query("SELECT id FROM users WHERE code = 'A B'")
+
+        self.assertEqual(connection.cursor.return_value.execute.call_count, 2)
+
+    def test_cached_result_expires(self):
+        """Test results older than the TTL are fetched again"""
+        connection = self._mock_connection()
+
+        with patch('app.tools.query_tools._get_connection', return_value=(connection, None)), \
+                patch('app.tools.query_tools.time.monotonic', side_effect=[0.0, 1000.0, 1000.0]):
+            _execute_safe_query("SELECT id FROM users")
+            _execute_safe_query("SELECT id FROM users")
+
+        self.assertEqual(connection.cursor.return_value.execute.call_count, 2)
 
 
 class TestSampleTableDataTool(unittest.TestCase):
@@ -277,9 +620,8 @@ class TestSampleTableDataTool(unittest.TestCase):
             # Verify correct query was built
             call_args = mock_execute.call_args
             query_arg = call_args[0][0]
-            self.assertIn("name", query_arg)
-            self.assertIn("email", query_arg)
-            self.assertIn("FROM users", query_arg)
+            self.assertIn('SELECT "name", "email"', query_arg)
+            self.assertIn('FROM "users"', query_arg)
 
     def test_sample_table_data_limit_enforcement(self):
         """Test limit is enforced (max 100)"""
@@ -363,29 +705,21 @@ class TestGetFieldStatisticsTool(unittest.TestCase):
         query_tools._db_config = self.db_config
 
         with patch('app.tools.query_tools._execute_safe_query') as mock_execute:
-            # Mock basic stats
-            mock_execute.side_effect = [
-                {
-                    "columns": ["total_count", "non_null_count", "null_count", "distinct_count"],
-                    "rows": [{
-                        "total_count": "1000",
-                        "non_null_count": "1000",
-                        "null_count": "0",
-                        "distinct_count": "100"
-                    }],
-                    "row_count": 1
-                },
-                # Mock numeric stats
-                {
-                    "columns": ["min_value", "max_value", "avg_value"],
-                    "rows": [{
-                        "min_value": "18",
-                        "max_value": "65",
-                        "avg_value": "35.5"
-                    }],
-                    "row_count": 1
-                }
-            ]
+            # Counts and min/max/avg come back in one row
+            mock_execute.return_value = {
+                "columns": ["total_count", "non_null_count", "null_count", "distinct_count",
+                            "min_value", "max_value", "avg_value"],
+                "rows": [{
+                    "total_count": "1000",
+                    "non_null_count": "1000",
+                    "null_count": "0",
+                    "distinct_count": "100",
+                    "min_value": "18",
+                    "max_value": "65",
+                    "avg_value": "35.5"
+                }],
+                "row_count": 1
+            }
 
             result = get_field_statistics.invoke({
                 "table_name": "users",
@@ -394,9 +728,175 @@ class TestGetFieldStatisticsTool(unittest.TestCase):
 
             data = json.loads(result)
             self.assertTrue(data["success"])
+            mock_execute.assert_called_once()
             self.assertEqual(data["data"]["min_value"], "18")
             self.assertEqual(data["data"]["max_value"], "65")
             self.assertEqual(data["data"]["avg_value"], "35.5")
+            # Native AVG: no text round-trip that would drop exponent/locale formats
+            self.assertIn('AVG("age") as avg_value', mock_execute.call_args[0][0])
+
+    def test_get_field_statistics_counts_without_min_max(self):
+        """Test column types without MIN/MAX (e.g. boolean) still report counts"""
+        query_tools._db_config = self.db_config
+        counts = {"total_count": 10, "non_null_count": 8, "null_count": 2, "distinct_count": 2}
+
+        with patch('app.tools.query_tools._execute_safe_query') as mock_execute:
+            mock_execute.side_effect = [
+                Exception("function min(boolean) does not exist"),
+                {"columns": list(counts), "rows": [counts], "row_count": 1}
+            ]
+
+            data = json.loads(get_field_statistics.invoke({"table_name": "users", "field_name": "active"}))
+
+        self.assertTrue(data["success"])
+        self.assertEqual(data["data"]["null_count"], 2)
+        self.assertIsNone(data["data"]["min_value"])
+        self.assertNotIn("MIN(", mock_execute.call_args_list[1][0][0])
+
+    def test_get_field_statistics_reuses_query_text(self):
+        """Test repeated calls send identical SQL text"""
+        query_tools._db_config = self.db_config
+
+        with patch('app.tools.query_tools._execute_safe_query') as mock_execute:
+            mock_execute.return_value = {"columns": [], "rows": [], "row_count": 0}
+
+            for _ in range(2):
+                get_field_statistics.invoke({"table_name": "users", "field_name": "age"})
+
+            first_query = mock_execute.call_args_list[0][0][0]
+            second_query = mock_execute.call_args_list[1][0][0]
+            self.assertIs(first_query, second_query)
+            self.assertNotIn("LIMIT", first_query)
+            self.assertTrue(mock_execute.call_args.kwargs["skip_limit"])
+            self.assertIn('COUNT(DISTINCT "age")', first_query)
+            self.assertIn('FROM "users"', first_query)
+
+
+class TestMaliciousIdentifiers(unittest.TestCase):
+    """Test tool-built SQL with hostile table names never reaches the database"""
+
+    TABLE_NAME = '"users" ; DELETE FROM users ; "x"'
+
+    def setUp(self):
+        """Set up test fixtures"""
+        query_tools._db_config = DatabaseConfig(
+            db_type=DatabaseType.POSTGRESQL,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            database="test_db",
+            schema="public"
+        )
+        query_tools._clear_result_cache()
+
+    def tearDown(self):
+        """Clean up config"""
+        query_tools._db_config = None
+
+    def test_injection_rejected_by_every_tool(self):
+        """Test statement injection through table_name is rejected before connecting"""
+        calls = (
+            (sample_table_data, {"table_name": self.TABLE_NAME, "limit": 5}),
+            (get_field_statistics, {"table_name": self.TABLE_NAME, "field_name": "age"}),
+            (get_fields_statistics, {"table_name": self.TABLE_NAME, "field_names": ["age", "name"]}),
+        )
+
+        with patch('app.tools.query_tools._acquire_connection') as mock_acquire:
+            for tool_fn, args in calls:
+                with self.subTest(tool=tool_fn.name):
+                    data = json.loads(tool_fn.invoke(args))
+                    self.assertFalse(data["success"])
+                    self.assertIn("Múltiplos comandos", data["error"])
+
+        mock_acquire.assert_not_called()
+
+
+class TestGetFieldsStatisticsTool(unittest.TestCase):
+    """Test get_fields_statistics tool"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        query_tools._db_config = DatabaseConfig(
+            db_type=DatabaseType.POSTGRESQL,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            database="test_db",
+            schema="public"
+        )
+
+    def tearDown(self):
+        """Clean up config"""
+        query_tools._db_config = None
+
+    def test_get_fields_statistics_single_scan(self):
+        """Test several fields are aggregated in one query and split per field"""
+        with patch('app.tools.query_tools._execute_safe_query') as mock_execute:
+            mock_execute.return_value = {
+                "columns": [],
+                "rows": [{
+                    "total_count": 10,
+                    "f0_non_null_count": 9, "f0_null_count": 1, "f0_distinct_count": 5,
+                    "f0_min_value": 1, "f0_max_value": 9, "f0_avg_value": "4.5",
+                    "f1_non_null_count": 10, "f1_null_count": 0, "f1_distinct_count": 2,
+                    "f1_min_value": "A", "f1_max_value": "B", "f1_avg_value": None
+                }],
+                "row_count": 1
+            }
+
+            result = get_fields_statistics.invoke({
+                "table_name": "orders",
+                "field_names": ["price", "status", "price"]
+            })
+
+        mock_execute.assert_called_once()
+        query_arg = mock_execute.call_args[0][0]
+        self.assertEqual(query_arg.count('FROM "orders"'), 1)
+        self.assertIn('COUNT(DISTINCT "status") as f1_distinct_count', query_arg)
+        self.assertNotIn("f2_", query_arg)
+
+        data = json.loads(result)
+        self.assertTrue(data["success"])
+        self.assertEqual(data["data"]["total_count"], 10)
+        self.assertEqual(list(data["data"]["fields"]), ["price", "status"])
+        self.assertEqual(data["data"]["fields"]["price"]["null_count"], 1)
+        self.assertEqual(data["data"]["fields"]["status"]["max_value"], "B")
+
+    def test_get_fields_statistics_survives_unsupported_column(self):
+        """Test one column type without MIN/MAX does not fail the other fields"""
+        def execute(query, **kwargs):
+            if "MIN(" in query and '"active"' in query:
+                raise Exception("function min(boolean) does not exist")
+            if "MIN(" in query:
+                return {"columns": [], "row_count": 1, "rows": [{
+                    "total_count": 10, "non_null_count": 9, "null_count": 1, "distinct_count": 5,
+                    "min_value": 1, "max_value": 9, "avg_value": "4.5"
+                }]}
+            return {"columns": [], "row_count": 1, "rows": [{
+                "total_count": 10,
+                "f0_non_null_count": 9, "f0_null_count": 1, "f0_distinct_count": 5,
+                "f1_non_null_count": 8, "f1_null_count": 2, "f1_distinct_count": 2
+            }]}
+
+        with patch('app.tools.query_tools._execute_safe_query', side_effect=execute):
+            result = get_fields_statistics.invoke({"table_name": "orders", "field_names": ["price", "active"]})
+
+        data = json.loads(result)
+        self.assertTrue(data["success"])
+        fields = data["data"]["fields"]
+        self.assertEqual((fields["price"]["min_value"], fields["price"]["max_value"]), (1, 9))
+        self.assertEqual(fields["active"]["null_count"], 2)
+        self.assertIsNone(fields["active"]["min_value"])
+
+    def test_get_fields_statistics_no_db_config(self):
+        """Test get_fields_statistics without database config"""
+        query_tools._db_config = None
+
+        result = get_fields_statistics.invoke({"table_name": "orders", "field_names": ["price"]})
+
+        self.assertFalse(json.loads(result)["success"])
 
 
 @pytest.mark.real_db
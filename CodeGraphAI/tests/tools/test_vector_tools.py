@@ -0,0 +1,203 @@
+"""
+Tests for vector tools
+"""
+
+import unittest
+import json
+from unittest.mock import Mock, patch
+
+import numpy as np
+from pydantic import ValidationError
+
+from app.tools import init_tools
+import app.tools.vector_tools as vt
+from app.tools.vector_tools import (
+    SemanticSearchInput, HybridSearchInput,
+    semantic_search_tables, semantic_search_procedures, hybrid_search
+)
+
+
+EMBEDDINGS = {
+    "tabelas de pagamentos": np.array([1.0, 0.0, 0.0], dtype=np.float32),
+    "tabelas que armazenam pagamentos": np.array([0.99, 0.05, 0.0], dtype=np.float32),
+    "tabelas de pacientes": np.array([0.0, 1.0, 0.0], dtype=np.float32),
+}
+
+
+def _search_result(node_id, similarity=0.9):
+    """Build a search result like VectorKnowledgeGraph returns"""
+    return Mock(
+        node_id=node_id,
+        similarity=similarity,
+        context={"name": node_id.split(".")[-1], "schema": "public", "node_type": "table"}
+    )
+
+
+class TestSemanticCache(unittest.TestCase):
+    """Test the semantic result cache of the vector tools"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.mock_vector_kg = Mock()
+        self.mock_vector_kg.encode_query.side_effect = EMBEDDINGS.__getitem__
+        self.mock_vector_kg.semantic_search.return_value = [_search_result("public.payments")]
+        self.mock_vector_kg.hybrid_search.return_value = [_search_result("public.payments")]
+        init_tools(Mock(), vector_kg=self.mock_vector_kg)
+
+    def tearDown(self):
+        """Clean up after tests"""
+        init_tools(None)
+
+    def test_paraphrase_reuses_results(self):
+        """Test a near-duplicate query skips the search"""
+        first = json.loads(semantic_search_tables.invoke({"query": "tabelas de pagamentos"}))
+        second = json.loads(semantic_search_tables.invoke({"query": "tabelas que armazenam pagamentos"}))
+
+        self.mock_vector_kg.semantic_search.assert_called_once()
+        self.assertEqual(first["results"], second["results"])
+        self.assertEqual(second["query"], "tabelas que armazenam pagamentos")
+
+    def test_different_query_searches_again(self):
+        """Test a dissimilar query is not served from the cache"""
+        semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+        semantic_search_tables.invoke({"query": "tabelas de pacientes"})
+
+        self.assertEqual(self.mock_vector_kg.semantic_search.call_count, 2)
+
+    def test_cache_key_includes_tool_and_parameters(self):
+        """Test results are not shared across tools or top_k values"""
+        semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+        semantic_search_tables.invoke({"query": "tabelas de pagamentos", "top_k": 10})
+        hybrid_search.invoke({"query": "tabelas de pagamentos"})
+
+        self.assertEqual(self.mock_vector_kg.semantic_search.call_count, 2)
+        self.mock_vector_kg.hybrid_search.assert_called_once()
+
+    def test_hybrid_cache_invalidated_by_graph_changes(self):
+        """Test hybrid results are searched again after the graph changes"""
+        self.mock_vector_kg.kg.revision = 1
+        hybrid_search.invoke({"query": "tabelas de pagamentos"})
+        hybrid_search.invoke({"query": "tabelas de pagamentos"})
+        self.mock_vector_kg.kg.revision = 2
+        hybrid_search.invoke({"query": "tabelas de pagamentos"})
+
+        self.assertEqual(self.mock_vector_kg.hybrid_search.call_count, 2)
+
+    def test_expired_entries_are_ignored(self):
+        """Test entries older than the TTL are not reused"""
+        with patch("app.tools.vector_tools.time.monotonic", side_effect=[0.0, vt._semantic_cache_ttl + 1, 0.0]):
+            semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+            semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+
+        self.assertEqual(self.mock_vector_kg.semantic_search.call_count, 2)
+
+    def test_init_tools_clears_cache(self):
+        """Test a new vector graph does not see the previous results"""
+        semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+        init_tools(Mock(), vector_kg=self.mock_vector_kg)
+        semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+
+        self.assertEqual(self.mock_vector_kg.semantic_search.call_count, 2)
+
+    def test_init_tools_warmup(self):
+        """Test warmup is opt-in"""
+        self.mock_vector_kg.warmup.assert_not_called()
+
+        init_tools(Mock(), vector_kg=self.mock_vector_kg, warmup=True)
+
+        self.mock_vector_kg.warmup.assert_called_once()
+
+    def test_init_tools_applies_config(self):
+        """Test tau and TTL come from the application config"""
+        self.addCleanup(setattr, vt, "_semantic_cache_tau", vt._semantic_cache_tau)
+        self.addCleanup(setattr, vt, "_semantic_cache_ttl", vt._semantic_cache_ttl)
+        config = Mock(semantic_cache_tau=0.5, semantic_cache_ttl=0)
+        init_tools(Mock(), config=config, vector_kg=self.mock_vector_kg)
+
+        self.assertEqual(vt._semantic_cache_tau, 0.5)
+        semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+        semantic_search_tables.invoke({"query": "tabelas de pagamentos"})
+        # TTL=0 disables the cache
+        self.assertEqual(self.mock_vector_kg.semantic_search.call_count, 2)
+
+
+class TestVectorToolsOutput(unittest.TestCase):
+    """Test vector tool responses"""
+
+    def tearDown(self):
+        """Clean up after tests"""
+        init_tools(None)
+
+    def test_unavailable_vector_kg(self):
+        """Test tools report a missing vector graph"""
+        init_tools(Mock())
+
+        result = json.loads(hybrid_search.invoke({"query": "pagamentos"}))
+
+        self.assertFalse(result["success"])
+        self.assertIn("Vector knowledge graph", result["error"])
+
+    def test_success_is_compact_utf8(self):
+        """Test results are serialized compactly without ASCII escapes"""
+        mock_vector_kg = Mock()
+        mock_vector_kg.encode_query.return_value = np.array([1.0, 0.0], dtype=np.float32)
+        mock_vector_kg.semantic_search.return_value = [_search_result("public.cobrança")]
+        init_tools(Mock(), vector_kg=mock_vector_kg)
+
+        output = semantic_search_tables.invoke({"query": "cobranças"})
+
+        self.assertNotIn("\n", output)
+        self.assertIn("cobrança", output)
+        self.assertTrue(json.loads(output)["success"])
+        self.assertEqual(list(json.loads(output)["results"][0]), [
+            "table_name", "schema", "full_name", "similarity",
+            "business_purpose", "columns_count", "complexity_score"
+        ])
+
+    def test_business_logic_truncated(self):
+        """Test long procedure logic is cut to 200 chars in both tools"""
+        mock_vector_kg = Mock()
+        mock_vector_kg.encode_query.return_value = np.array([1.0, 0.0], dtype=np.float32)
+        procedure = Mock(
+            node_id="public.proc_pay",
+            similarity=0.8,
+            context={"name": "proc_pay", "node_type": "procedure", "business_logic": "x" * 250}
+        )
+        mock_vector_kg.semantic_search.return_value = [procedure]
+        mock_vector_kg.hybrid_search.return_value = [procedure]
+        init_tools(Mock(), vector_kg=mock_vector_kg)
+
+        for tool_fn in (semantic_search_procedures, hybrid_search):
+            result = json.loads(tool_fn.invoke({"query": "pagamentos"}))
+            self.assertEqual(result["results"][0]["business_logic"], "x" * 200 + "...")
+
+    def test_arguments_clamped(self):
+        """Test top_k and similarity_threshold are clamped to their ranges"""
+        mock_vector_kg = Mock()
+        mock_vector_kg.encode_query.return_value = np.array([1.0, 0.0], dtype=np.float32)
+        mock_vector_kg.semantic_search.return_value = []
+        init_tools(Mock(), vector_kg=mock_vector_kg)
+
+        semantic_search_tables.invoke({"query": "a", "top_k": 50, "similarity_threshold": 1.5})
+        semantic_search_procedures.invoke({"query": "b", "top_k": -3, "similarity_threshold": -0.2})
+
+        first, second = mock_vector_kg.semantic_search.call_args_list
+        self.assertEqual((first.kwargs["top_k"], first.kwargs["similarity_threshold"]), (20, 1.0))
+        self.assertEqual((second.kwargs["top_k"], second.kwargs["similarity_threshold"]), (1, 0.0))
+
+
+class TestVectorToolInputs(unittest.TestCase):
+    """Test vector tool input schemas"""
+
+    def test_query_whitespace_stripped(self):
+        """Test surrounding whitespace does not reach the embedding model"""
+        self.assertEqual(SemanticSearchInput(query="  pagamentos \n").query, "pagamentos")
+
+    def test_unknown_arguments_rejected(self):
+        """Test misspelled arguments fail instead of being ignored"""
+        with self.assertRaises(ValidationError):
+            HybridSearchInput(query="pagamentos", node_typ="table")
+
+
+if __name__ == '__main__':
+    unittest.main()